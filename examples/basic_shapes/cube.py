@@ -24,14 +24,6 @@ from tpl.design import Cube, PathPlanner
 from tpl.core import ExposureEngine
 from tpl.utils import load_config, save_results
 
-# Optional: For visualization
-try:
-    import matplotlib.pyplot as plt
-    PLOT_AVAILABLE = True
-except ImportError:
-    PLOT_AVAILABLE = False
-    print("Matplotlib not available. Skipping visualizations.")
-
 
 def create_simple_cube(size=10.0, center=(0, 0, 10)):
     """
@@ -136,6 +128,63 @@ def generate_toolpath(geometry, output_dir="output"):
     return toolpath
 
 
+def projection_lines(coords, u, v, color_axis):
+    """
+    Build a single line artist for a 2D projection of the toolpath.
+    
+    Consecutive toolpath points are joined into segments, so the whole
+    path is drawn by one LineCollection instead of one marker per point.
+    
+    Parameters
+    ----------
+    coords : ndarray
+        N×3 toolpath coordinates
+    u, v : int
+        Coordinate axes to project onto (0=x, 1=y, 2=z)
+    color_axis : int
+        Coordinate axis used to color the segments
+        
+    Returns
+    -------
+    LineCollection
+        Segments colored by the chosen axis
+    """
+    from matplotlib.collections import LineCollection
+    
+    plane = coords[:, [u, v]]
+    segments = np.stack([plane[:-1], plane[1:]], axis=1)
+    return LineCollection(
+        segments,
+        array=coords[:-1, color_axis],
+        cmap='viridis',
+        linewidths=0.3
+    )
+
+
+# Projection figure reused across visualize_toolpath calls
+_projection_fig = None
+
+
+def _get_projection_figure():
+    """
+    Return the cached projection figure, creating it on first use.
+    
+    The figure is attached to an Agg canvas directly rather than going
+    through pyplot, so repeated renders skip GUI backend setup.
+    """
+    global _projection_fig
+    
+    if _projection_fig is None:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        
+        _projection_fig = Figure(figsize=(15, 5))
+        FigureCanvasAgg(_projection_fig)
+        _projection_fig.subplots(1, 3)
+    
+    return _projection_fig
+
+
 def visualize_toolpath(toolpath):
     """
     Create visualization of the toolpath.
@@ -145,7 +194,10 @@ def visualize_toolpath(toolpath):
     toolpath : Toolpath
         Toolpath to visualize
     """
-    if not PLOT_AVAILABLE:
+    # Imported here so runs that skip visualization don't pay for it
+    try:
+        import matplotlib  # noqa: F401
+    except ImportError:
         print("\nSkipping visualization (matplotlib not available)")
         return
     
@@ -158,41 +210,31 @@ def visualize_toolpath(toolpath):
     toolpath.visualize()
     
     # Create 2D projections for documentation
-    fig, axes = plt.subplots(1, 3, figsize=(15, 5))
+    fig = _get_projection_figure()
+    axes = fig.axes
     
     coords = toolpath.get_coordinates()
-    x = coords[:, 0]
-    y = coords[:, 1]
-    z = coords[:, 2]
-    
-    # XY projection (top view)
-    axes[0].scatter(x, y, c=z, cmap='viridis', s=1)
-    axes[0].set_xlabel('X (μm)')
-    axes[0].set_ylabel('Y (μm)')
-    axes[0].set_title('Top View (XY)')
-    axes[0].set_aspect('equal')
-    axes[0].grid(True, alpha=0.3)
-    
-    # XZ projection (side view)
-    axes[1].scatter(x, z, c=y, cmap='viridis', s=1)
-    axes[1].set_xlabel('X (μm)')
-    axes[1].set_ylabel('Z (μm)')
-    axes[1].set_title('Side View (XZ)')
-    axes[1].set_aspect('equal')
-    axes[1].grid(True, alpha=0.3)
-    
-    # YZ projection (front view)
-    axes[2].scatter(y, z, c=x, cmap='viridis', s=1)
-    axes[2].set_xlabel('Y (μm)')
-    axes[2].set_ylabel('Z (μm)')
-    axes[2].set_title('Front View (YZ)')
-    axes[2].set_aspect('equal')
-    axes[2].grid(True, alpha=0.3)
-    
-    plt.tight_layout()
-    plt.savefig('output/cube_projections.png', dpi=150)
+    
+    # (horizontal axis, vertical axis, color axis, labels, title)
+    views = [
+        (0, 1, 2, ('X (μm)', 'Y (μm)'), 'Top View (XY)'),
+        (0, 2, 1, ('X (μm)', 'Z (μm)'), 'Side View (XZ)'),
+        (1, 2, 0, ('Y (μm)', 'Z (μm)'), 'Front View (YZ)'),
+    ]
+    
+    for ax, (u, v, color_axis, (xlabel, ylabel), title) in zip(axes, views):
+        ax.cla()
+        ax.add_collection(projection_lines(coords, u, v, color_axis))
+        ax.autoscale()
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        ax.set_title(title)
+        ax.set_aspect('equal')
+        ax.grid(True, alpha=0.3)
+    
+    fig.tight_layout()
+    fig.savefig('output/cube_projections.png', dpi=150)
     print("Projection views saved to: output/cube_projections.png")
-    plt.show()
 
 
 def fabricate(toolpath, config_file="configs/default_config.yaml", dry_run=False):
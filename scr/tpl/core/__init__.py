@@ -11,6 +11,7 @@ BTU Cottbus-Senftenberg
 
 from .laser_control import LaserControl, LaserError, LaserState
 from .stage_control import StageControl, StageError, StageState
+from .stage_control_async import StageControlAsync
 from .exposure_engine import ExposureEngine, FabricationReport
 
 __all__ = [
@@ -20,6 +21,7 @@ __all__ = [
     'StageControl',
     'StageError',
     'StageState',
+    'StageControlAsync',
     'ExposureEngine',
     'FabricationReport',
 ]
@@ -9,15 +9,15 @@ Date: December 2024
 BTU Cottbus-Senftenberg
 """
 
-import serial
 import time
 import warnings
-from typing import Dict, Optional, Tuple
-from enum import Enum
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from enum import IntEnum
 
 
-class LaserState(Enum):
-    """Laser operational states."""
+class LaserState(IntEnum):
+    """Laser operational states (int-valued for cheap comparisons)."""
     OFF = 0
     STANDBY = 1
     READY = 2
@@ -49,6 +49,15 @@ class LaserControl:
         If True, run in simulation mode without hardware
     """
     
+    # Canned replies used in mock mode
+    _MOCK_RESPONSES = {
+        "*IDN?": "Coherent Chameleon Ultra II",
+        "SHUTTER OPEN": "OK",
+        "SHUTTER CLOSE": "OK",
+        "TEMP?": "25.0",
+        "MODELOCK?": "ON",
+    }
+    
     def __init__(self, 
                  port: str = "/dev/ttyUSB0",
                  baudrate: int = 9600,
@@ -67,6 +76,14 @@ class LaserControl:
         self._shutter_open = False
         self._state = LaserState.OFF
         
+        # Power calibration table (set, measured) and memoized setpoints
+        self._calibration = None
+        self._calibration_cache = {}
+        
+        # Last hardware status reply as (monotonic time, values)
+        self._status_cache = (float('-inf'), None)
+        self._status_ttl = 0.2  # s
+        
         # Laser specifications (update for your system)
         self.wavelength = 780  # nm
         self.pulse_duration = 100  # fs
@@ -92,6 +109,9 @@ class LaserControl:
             self._state = LaserState.STANDBY
             return True
         
+        # pyserial is only needed for real hardware
+        import serial
+        
         try:
             self._serial = serial.Serial(
                 port=self.port,
@@ -125,6 +145,7 @@ class LaserControl:
         
         self._connected = False
         self._state = LaserState.OFF
+        self._status_cache = (float('-inf'), None)
         
         if self.mock:
             print("MOCK MODE: Laser disconnected")
@@ -146,23 +167,93 @@ class LaserControl:
         if not self._connected:
             raise LaserError("Laser not connected")
         
-        if power < 0 or power > self._max_power:
-            raise LaserError(f"Power must be between 0 and {self._max_power} mW")
+        setpoint = self._setpoint_for(power)
         
         if self.mock:
-            print(f"MOCK MODE: Setting laser power to {power:.2f} mW")
+            print(f"MOCK MODE: Setting laser power to {setpoint:.2f} mW")
             self._current_power = power
             return
         
         # Send power command (adjust for your laser protocol)
-        command = f"POWER {power:.2f}"
+        command = f"POWER {setpoint:.2f}"
         response = self._send_command(command)
         
         if response and "OK" in response:
             self._current_power = power
+            self._status_cache = (float('-inf'), None)
         else:
             raise LaserError(f"Failed to set power: {response}")
     
+    def _setpoint_for(self, power: float) -> float:
+        """
+        Validate a requested power and map it to the laser setpoint.
+        
+        Raises
+        ------
+        LaserError
+            If the power or its calibrated setpoint is out of range
+        """
+        if power < 0 or power > self._max_power:
+            raise LaserError(f"Power must be between 0 and {self._max_power} mW")
+        
+        if self._calibration is None:
+            return power
+        
+        # Map requested power at the sample to the laser setpoint
+        setpoint = self._raw_from_requested(int(round(power * 100)))
+        if setpoint > self._max_power:
+            raise LaserError(f"Calibrated setpoint {setpoint:.2f} mW exceeds "
+                             f"maximum {self._max_power} mW")
+        return setpoint
+    
+    def ramp_power(self, values: List[float], dwell_ms: float = 0.0):
+        """
+        Step laser power through a sequence of values.
+        
+        Without dwell, all power commands are written in a single serial
+        transfer and acknowledged together, instead of one round trip per
+        step. With a dwell, each step is held for ``dwell_ms`` before the
+        next one is sent.
+        
+        Parameters
+        ----------
+        values : list of float
+            Power setpoints in milliwatts, in order
+        dwell_ms : float
+            Hold time per step in milliseconds
+            
+        Raises
+        ------
+        LaserError
+            If any power is out of range or a step is not acknowledged
+        """
+        if not self._connected:
+            raise LaserError("Laser not connected")
+        
+        if dwell_ms > 0:
+            for power in values:
+                self.set_power(power)
+                time.sleep(dwell_ms / 1000)
+            return
+        
+        setpoints = [self._setpoint_for(power) for power in values]
+        
+        if not setpoints:
+            return
+        
+        if self.mock:
+            print(f"MOCK MODE: Ramping laser power through {len(setpoints)} setpoints")
+            self._current_power = values[-1]
+            return
+        
+        responses = self._send_commands([f"POWER {p:.2f}" for p in setpoints])
+        self._status_cache = (float('-inf'), None)
+        
+        for power, response in zip(values, responses):
+            if "OK" not in response:
+                raise LaserError(f"Failed to set power {power:.2f} mW: {response}")
+            self._current_power = power
+    
     def get_power(self) -> float:
         """
         Get current laser power setting.
@@ -239,10 +330,20 @@ class LaserControl:
         else:
             raise LaserError(f"Failed to close shutter: {response}")
     
-    def get_status(self) -> Dict:
+    def get_status(self, fresh: bool = False) -> Dict:
         """
         Get comprehensive laser status.
         
+        The values queried from the laser (power, temperature, mode lock)
+        are reused for ``_status_ttl`` seconds, so frequent polling does not
+        cost three serial round trips each time. Changing the power
+        discards the cached reply.
+        
+        Parameters
+        ----------
+        fresh : bool
+            If True, always query the laser
+        
         Returns
         -------
         dict
@@ -267,23 +368,29 @@ class LaserControl:
         status = {
             'connected': self._connected,
             'state': self._state.name,
-            'power': self.get_power(),
             'shutter_open': self._shutter_open,
         }
         
-        # Query additional parameters (adjust commands for your laser)
-        try:
-            temp_response = self._send_command("TEMP?")
-            status['temperature'] = float(temp_response.strip())
-        except:
-            status['temperature'] = None
-        
-        try:
-            ml_response = self._send_command("MODELOCK?")
-            status['mode_lock'] = ("ON" in ml_response)
-        except:
-            status['mode_lock'] = None
+        timestamp, queried = self._status_cache
+        if fresh or queried is None or time.monotonic() - timestamp >= self._status_ttl:
+            queried = {'power': self.get_power()}
+            
+            # Query additional parameters (adjust commands for your laser)
+            try:
+                temp_response = self._send_command("TEMP?")
+                queried['temperature'] = float(temp_response.strip())
+            except:
+                queried['temperature'] = None
+            
+            try:
+                ml_response = self._send_command("MODELOCK?")
+                queried['mode_lock'] = ("ON" in ml_response)
+            except:
+                queried['mode_lock'] = None
+            
+            self._status_cache = (time.monotonic(), queried)
         
+        status.update(queried)
         return status
     
     def emergency_stop(self):
@@ -315,6 +422,10 @@ class LaserControl:
         if not self._connected:
             raise LaserError("Laser not connected")
         
+        # Measure against raw setpoints, not a previous calibration
+        self._calibration = None
+        self.clear_calibration_cache()
+        
         print("Starting power calibration...")
         print("NOTE: Place power meter at sample position")
         
@@ -339,8 +450,55 @@ class LaserControl:
             
             print(f"  {power:.1f} mW → {measured:.1f} mW measured")
         
+        # Store table sorted by measured power for interpolation, anchored
+        # at (0, 0) so low requests are not clamped up to the first point
+        if len(calibration_data['set_powers']) >= 2:
+            order = np.argsort(calibration_data['measured_powers'])
+            set_powers = np.asarray(calibration_data['set_powers'], dtype=float)[order]
+            measured_powers = np.asarray(calibration_data['measured_powers'], dtype=float)[order]
+            if measured_powers[0] > 0:
+                set_powers = np.concatenate(([0.0], set_powers))
+                measured_powers = np.concatenate(([0.0], measured_powers))
+            self._calibration = (set_powers, measured_powers)
+        
         return calibration_data
     
+    def clear_calibration_cache(self):
+        """Discard memoized calibrated setpoints."""
+        self._calibration_cache.clear()
+    
+    def _raw_from_requested(self, centi_mw: int) -> float:
+        """
+        Laser setpoint that delivers the requested power at the sample.
+        
+        Interpolates the calibrate_power table. Results are memoized per
+        0.01 mW step, since fabrication repeats the same few powers.
+        
+        Parameters
+        ----------
+        centi_mw : int
+            Requested power in units of 0.01 mW
+            
+        Returns
+        -------
+        float
+            Setpoint in milliwatts
+            
+        Raises
+        ------
+        LaserError
+            If the power is above the highest calibrated measurement
+        """
+        setpoint = self._calibration_cache.get(centi_mw)
+        if setpoint is None:
+            set_powers, measured_powers = self._calibration
+            if centi_mw / 100 > measured_powers[-1]:
+                raise LaserError(f"Power {centi_mw / 100:.2f} mW is above the "
+                                 f"calibrated range (max {measured_powers[-1]:.2f} mW)")
+            setpoint = float(np.interp(centi_mw / 100, measured_powers, set_powers))
+            self._calibration_cache[centi_mw] = setpoint
+        return setpoint
+    
     def _send_command(self, command: str) -> Optional[str]:
         """
         Send command to laser and return response.
@@ -356,25 +514,20 @@ class LaserControl:
             Response from laser
         """
         if self.mock:
-            # Simulate responses
-            if "IDN" in command:
-                return "Coherent Chameleon Ultra II"
-            elif "POWER" in command:
-                if "?" in command:
-                    return str(self._current_power)
-                else:
-                    return "OK"
-            elif "SHUTTER" in command:
-                return "OK"
-            elif "TEMP" in command:
-                return "25.0"
-            elif "MODELOCK" in command:
-                return "ON"
-            return "OK"
+            # Simulate responses with a table lookup on the full command,
+            # falling back to its first token
+            if command == "POWER?":
+                return str(self._current_power)
+            response = self._MOCK_RESPONSES.get(command)
+            if response is None:
+                response = self._MOCK_RESPONSES.get(command.split(" ", 1)[0], "OK")
+            return response
         
         if not self._serial or not self._serial.is_open:
             raise LaserError("Serial port not open")
         
+        import serial
+        
         try:
             # Send command
             self._serial.write((command + '\r\n').encode())
@@ -386,6 +539,48 @@ class LaserControl:
         except serial.SerialException as e:
             raise LaserError(f"Communication error: {e}")
     
+    def _send_commands(self, commands: List[str]) -> List[str]:
+        """
+        Send several commands in one write and collect their responses.
+        
+        Parameters
+        ----------
+        commands : list of str
+            Command strings, one response expected per command
+            
+        Returns
+        -------
+        list of str
+            Responses in command order
+        """
+        if self.mock:
+            return [self._send_command(command) for command in commands]
+        
+        if not self._serial or not self._serial.is_open:
+            raise LaserError("Serial port not open")
+        
+        import serial
+        
+        try:
+            # Pipeline: one transfer out, then drain one reply per command
+            self._serial.write(("\r\n".join(commands) + "\r\n").encode())
+            
+            responses = []
+            while len(responses) < len(commands):
+                line = self._serial.readline()
+                if not line:
+                    break  # Read timed out
+                responses.append(line.decode().strip())
+                
+        except serial.SerialException as e:
+            raise LaserError(f"Communication error: {e}")
+        
+        if len(responses) < len(commands):
+            raise LaserError(f"Expected {len(commands)} responses, "
+                             f"received {len(responses)}")
+        
+        return responses
+    
     @property
     def is_connected(self) -> bool:
         """Check if laser is connected."""
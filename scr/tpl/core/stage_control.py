@@ -9,10 +9,12 @@ Date: December 2024
 BTU Cottbus-Senftenberg
 """
 
+import math
+import re
 import serial
 import time
 import numpy as np
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional, Union
 from enum import Enum
 
 
@@ -30,22 +32,40 @@ class StageState(Enum):
     ERROR = 4
 
 
-class StageControl:
+class _StageBase:
     """
-    Control interface for XYZ positioning stage.
+    Transport-independent state and checks shared by the stage classes.
     
-    Parameters
-    ----------
-    port : str
-        Serial port for stage communication
-    baudrate : int
-        Serial baud rate
-    timeout : float
-        Communication timeout in seconds
-    mock : bool
-        If True, run in simulation mode
+    Holds the stage specifications, the cached position and the command
+    formats. StageControl and StageControlAsync add the serial transport
+    and the blocking or asyncio command methods on top.
     """
     
+    __slots__ = (
+        'port', 'baudrate', 'timeout', 'mock',
+        '_connected', '_state',
+        'range_x', 'range_y', 'range_z', 'resolution', 'max_speed',
+        '_position', '_home_position', '_position_dirty',
+        'default_speed', 'acceleration',
+    )
+    
+    # Preformatted commands; bytes %-formatting avoids str -> encode per move
+    _MOVE_FMT = b"MOVE ABS X%.4f Y%.4f Z%.4f F%.0f"
+    _WAIT = b"WAIT"
+    _SYNC = b"SYNC?"
+    
+    # Position reply, e.g. "X123.4567 Y234.5678 Z345.6789"
+    _POS_RE = re.compile(r'\s*X(\S+)\s+Y(\S+)\s+Z(\S+)')
+    
+    # Targets visited by calibrate(), in μm
+    _CALIBRATION_POSITIONS = (
+        (50, 50, 50),
+        (150, 50, 50),
+        (150, 150, 50),
+        (50, 150, 50),
+        (100, 100, 100),
+    )
+    
     def __init__(self,
                  port: str = "/dev/ttyUSB1",
                  baudrate: int = 115200,
@@ -57,7 +77,6 @@ class StageControl:
         self.timeout = timeout
         self.mock = mock
         
-        self._serial = None
         self._connected = False
         self._state = StageState.DISCONNECTED
         
@@ -69,13 +88,171 @@ class StageControl:
         self.resolution = 1  # nm
         self.max_speed = 100000  # μm/s
         
-        # Current position (in micrometers)
+        # Current position (in micrometers); updated in place, never rebound
         self._position = np.array([0.0, 0.0, 0.0])
         self._home_position = np.array([100.0, 100.0, 100.0])
         
+        # Set when the hardware position may differ from _position
+        # (after stop or a failed move); cleared once it is read or set
+        self._position_dirty = True
+        
         # Movement parameters
         self.default_speed = 50000  # μm/s
         self.acceleration = 50000   # μm/s²
+    
+    def _check_target(self, x: float, y: float, z: float):
+        """Raise StageError if a target lies outside the travel range."""
+        if not (0 <= x <= self.range_x):
+            raise StageError(f"X position {x} out of range [0, {self.range_x}]")
+        if not (0 <= y <= self.range_y):
+            raise StageError(f"Y position {y} out of range [0, {self.range_y}]")
+        if not (0 <= z <= self.range_z):
+            raise StageError(f"Z position {z} out of range [0, {self.range_z}]")
+    
+    def _check_speed(self, speed: Optional[float]) -> float:
+        """Return the speed to use, defaulting and checking the maximum."""
+        if speed is None:
+            speed = self.default_speed
+        
+        if speed > self.max_speed:
+            raise StageError(f"Speed {speed} exceeds maximum {self.max_speed}")
+        return speed
+    
+    def _check_points(self, points: np.ndarray) -> np.ndarray:
+        """Return batch targets as an N×3 array, checking all in one pass."""
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        
+        ok = (points >= 0).all(axis=1) & (points <= self._ranges).all(axis=1)
+        if not ok.all():
+            bad = np.flatnonzero(~ok)[0]
+            raise StageError(f"Position {bad} {tuple(points[bad].tolist())} out of range "
+                             f"X[0, {self.range_x}] Y[0, {self.range_y}] "
+                             f"Z[0, {self.range_z}]")
+        return points
+    
+    def _batch_commands(self, points: np.ndarray,
+                        speed: float) -> Tuple[List[bytes], float]:
+        """
+        Move commands for a batch, closed by ``SYNC?``.
+        
+        Also returns the path length from the current position through
+        all points, so callers can allow for the whole traversal.
+        """
+        path_length = np.linalg.norm(np.diff(points, axis=0), axis=1).sum()
+        path_length += np.linalg.norm(points[0] - self._position)
+        
+        rows = np.column_stack([points, np.full(len(points), speed)])
+        moves = ((self._MOVE_FMT + b"\n") * len(rows)) % tuple(rows.ravel().tolist())
+        return moves.splitlines() + [self._SYNC], path_length
+    
+    def _finish_batch(self, points: np.ndarray, responses: List[str]):
+        """Check the per-move replies of a batch and record the end position."""
+        for i, response in enumerate(responses[:-1]):
+            if "OK" not in response:
+                self._mark_failed()
+                raise StageError(f"Move {i} to {tuple(points[i])} failed: {response}")
+        
+        self._set_position(points[-1])
+    
+    def _set_position(self, position):
+        """Record an acknowledged position and return to IDLE."""
+        self._position[:] = position
+        self._position_dirty = False
+        self._state = StageState.IDLE
+    
+    def _mark_failed(self):
+        """Enter ERROR; the hardware position is unknown until read back."""
+        self._state = StageState.ERROR
+        self._position_dirty = True
+    
+    def _distance_to(self, x: float, y: float, z: float) -> float:
+        """Straight-line distance from the current position in μm."""
+        dx = x - self._position[0]
+        dy = y - self._position[1]
+        dz = z - self._position[2]
+        return math.sqrt(dx * dx + dy * dy + dz * dz)
+    
+    def _parse_position(self, response: Optional[str]) -> Tuple[float, float, float]:
+        """Parse a position reply such as ``X1.0000 Y2.0000 Z3.0000``."""
+        match = self._POS_RE.match(response or "")
+        try:
+            return tuple(float(v) for v in match.groups())
+        except (AttributeError, ValueError):
+            raise StageError(f"Invalid position response: {response}")
+    
+    @staticmethod
+    def _calibration_results(targets, measured) -> dict:
+        """Report and summarize the errors of a calibration run."""
+        errors = np.array([math.dist(target, position)
+                           for target, position in zip(targets, measured)])
+        for target, error in zip(targets, errors):
+            print(f"  {target}: error {error:.3f} μm")
+        
+        avg_error = errors.mean()
+        max_error = errors.max()
+        
+        print(f"\nCalibration complete:")
+        print(f"  Average error: {avg_error:.3f} μm")
+        print(f"  Maximum error: {max_error:.3f} μm")
+        
+        return {
+            'target_positions': list(targets),
+            'measured_positions': list(measured),
+            'errors': errors,
+            'average_error': avg_error,
+            'maximum_error': max_error,
+        }
+    
+    @property
+    def _ranges(self) -> np.ndarray:
+        """Travel range per axis as an array, for vectorized checks."""
+        return np.array([self.range_x, self.range_y, self.range_z], dtype=float)
+    
+    @property
+    def is_connected(self) -> bool:
+        """Check if stage is connected."""
+        return self._connected
+    
+    @property
+    def is_moving(self) -> bool:
+        """Check if stage is currently moving."""
+        return self._state == StageState.MOVING
+    
+    def __repr__(self) -> str:
+        """String representation."""
+        pos = tuple(self._position)
+        return (f"{type(self).__name__}(port='{self.port}', "
+                f"position=({pos[0]:.2f}, {pos[1]:.2f}, {pos[2]:.2f}), "
+                f"state={self._state.name})")
+
+
+class StageControl(_StageBase):
+    """
+    Control interface for XYZ positioning stage.
+    
+    Parameters
+    ----------
+    port : str
+        Serial port for stage communication
+    baudrate : int
+        Serial baud rate
+    timeout : float
+        Communication timeout in seconds
+    mock : bool
+        If True, run in simulation mode
+    """
+    
+    __slots__ = ('_serial', '_rx_buf')
+    
+    def __init__(self,
+                 port: str = "/dev/ttyUSB1",
+                 baudrate: int = 115200,
+                 timeout: float = 10.0,
+                 mock: bool = False):
+        super().__init__(port, baudrate, timeout, mock)
+        
+        self._serial = None
+        self._rx_buf = bytearray()  # Received bytes not yet returned as lines
         
     def connect(self) -> bool:
         """
@@ -90,7 +267,7 @@ class StageControl:
             print("MOCK MODE: Simulating stage connection")
             self._connected = True
             self._state = StageState.IDLE
-            self._position = self._home_position.copy()
+            self._position[:] = self._home_position
             return True
         
         try:
@@ -99,6 +276,7 @@ class StageControl:
                 baudrate=self.baudrate,
                 timeout=self.timeout
             )
+            self._rx_buf.clear()
             
             time.sleep(0.5)
             
@@ -122,6 +300,7 @@ class StageControl:
         """Disconnect from stage."""
         if self._serial and self._serial.is_open:
             self._serial.close()
+        self._rx_buf.clear()
         
         self._connected = False
         self._state = StageState.DISCONNECTED
@@ -147,7 +326,7 @@ class StageControl:
         if self.mock:
             print("MOCK MODE: Homing to reference position")
             time.sleep(2)  # Simulate homing time
-            self._position = self._home_position.copy()
+            self._position[:] = self._home_position
             self._state = StageState.IDLE
             print(f"  Homed to: {self._position}")
             return
@@ -180,45 +359,82 @@ class StageControl:
         if not self._connected:
             raise StageError("Stage not connected")
         
-        # Validate positions
-        if not (0 <= x <= self.range_x):
-            raise StageError(f"X position {x} out of range [0, {self.range_x}]")
-        if not (0 <= y <= self.range_y):
-            raise StageError(f"Y position {y} out of range [0, {self.range_y}]")
-        if not (0 <= z <= self.range_z):
-            raise StageError(f"Z position {z} out of range [0, {self.range_z}]")
-        
-        if speed is None:
-            speed = self.default_speed
-        
-        if speed > self.max_speed:
-            raise StageError(f"Speed {speed} exceeds maximum {self.max_speed}")
+        self._check_target(x, y, z)
+        speed = self._check_speed(speed)
         
         self._state = StageState.MOVING
+        distance = self._distance_to(x, y, z)
         
         if self.mock:
             # Simulate movement
-            distance = np.linalg.norm([x - self._position[0], 
-                                      y - self._position[1], 
-                                      z - self._position[2]])
-            move_time = distance / speed
-            time.sleep(min(move_time / 1000, 0.1))  # Scaled for simulation
-            
-            self._position = np.array([x, y, z])
+            time.sleep(min(distance / speed / 1000, 0.1))  # Scaled for simulation
+            self._position[:] = (x, y, z)
             self._state = StageState.IDLE
             return
         
-        # Send movement command
-        command = f"MOVE ABS X{x:.4f} Y{y:.4f} Z{z:.4f} F{speed:.0f}"
-        response = self._send_command(command)
+        # Send movement command; the WAIT reply marks completion, so the
+        # move needs no MOVING? polling
+        try:
+            response, _ = self._send_commands([self._MOVE_FMT % (x, y, z, speed), self._WAIT],
+                                              timeout=self.timeout + distance / speed)
+        except StageError:
+            self._mark_failed()
+            raise
+        
+        if "OK" not in response:
+            self._mark_failed()
+            raise StageError(f"Move failed: {response}")
         
-        if response and "OK" in response:
-            self._wait_for_move_complete()
-            self._update_position()
+        # The acknowledged target is the new position
+        self._set_position((x, y, z))
+    
+    def move_absolute_batch(self, points: np.ndarray,
+                            speed: Optional[float] = None):
+        """
+        Move through a sequence of absolute positions.
+        
+        All move commands are written in a single serial transfer followed
+        by a ``SYNC?`` query, which the controller answers once the queued
+        moves have finished. This replaces one command round trip plus
+        ``MOVING?`` polling per point with one transfer for the whole path.
+        
+        Parameters
+        ----------
+        points : ndarray
+            N×3 array of target positions in micrometers
+        speed : float, optional
+            Movement speed in μm/s
+            
+        Raises
+        ------
+        StageError
+            If any position or the speed is out of range, or a move is
+            not acknowledged
+        """
+        if not self._connected:
+            raise StageError("Stage not connected")
+        
+        points = self._check_points(points)
+        if len(points) == 0:
+            return
+        
+        speed = self._check_speed(speed)
+        self._state = StageState.MOVING
+        
+        if self.mock:
+            self._position[:] = points[-1]
             self._state = StageState.IDLE
-        else:
-            self._state = StageState.ERROR
-            raise StageError(f"Move failed: {response}")
+            return
+        
+        # Allow for the whole path to be traversed before SYNC? is answered
+        commands, path_length = self._batch_commands(points, speed)
+        try:
+            responses = self._send_commands(commands, timeout=self.timeout + path_length / speed)
+        except StageError:
+            self._mark_failed()
+            raise
+        
+        self._finish_batch(points, responses)
     
     def move_relative(self, dx: float, dy: float, dz: float,
                      speed: Optional[float] = None):
@@ -243,6 +459,10 @@ class StageControl:
         """
         Get current stage position.
         
+        The last commanded position is returned without a serial query
+        unless it may be stale (after ``stop()`` or a failed move). Use
+        ``refresh_position()`` to always read the hardware.
+        
         Returns
         -------
         tuple
@@ -254,6 +474,22 @@ class StageControl:
         if not self._connected:
             raise StageError("Stage not connected")
         
+        if self._position_dirty:
+            self._update_position()
+        return tuple(self._position)
+    
+    def refresh_position(self) -> Tuple[float, float, float]:
+        """
+        Read the current stage position from the controller.
+        
+        Returns
+        -------
+        tuple
+            (x, y, z) position in micrometers
+        """
+        if not self.mock and not self._connected:
+            raise StageError("Stage not connected")
+        
         self._update_position()
         return tuple(self._position)
     
@@ -286,6 +522,7 @@ class StageControl:
             return
         
         self._send_command("STOP")
+        self._position_dirty = True
         self._state = StageState.IDLE
     
     def calibrate(self) -> dict:
@@ -306,48 +543,19 @@ class StageControl:
         self.home()
         
         # Test grid of positions
-        test_positions = [
-            (50, 50, 50),
-            (150, 50, 50),
-            (150, 150, 50),
-            (50, 150, 50),
-            (100, 100, 100),
-        ]
-        
-        results = {
-            'target_positions': [],
-            'measured_positions': [],
-            'errors': []
-        }
+        test_positions = self._CALIBRATION_POSITIONS
+        measured = []
         
         for target in test_positions:
             print(f"  Moving to {target}")
             self.move_absolute(*target)
             time.sleep(0.5)
-            
-            measured = self.get_position()
-            error = np.linalg.norm(np.array(target) - np.array(measured))
-            
-            results['target_positions'].append(target)
-            results['measured_positions'].append(measured)
-            results['errors'].append(error)
-            
-            print(f"    Error: {error:.3f} μm")
+            measured.append(self.refresh_position())
         
         # Return to home
         self.home()
         
-        avg_error = np.mean(results['errors'])
-        max_error = np.max(results['errors'])
-        
-        print(f"\nCalibration complete:")
-        print(f"  Average error: {avg_error:.3f} μm")
-        print(f"  Maximum error: {max_error:.3f} μm")
-        
-        results['average_error'] = avg_error
-        results['maximum_error'] = max_error
-        
-        return results
+        return self._calibration_results(test_positions, measured)
     
     def _update_position(self):
         """Query and update current position from hardware."""
@@ -356,37 +564,32 @@ class StageControl:
         
         response = self._send_command("POS?")
         
-        try:
-            # Parse response (format: "X123.4567 Y234.5678 Z345.6789")
-            parts = response.strip().split()
-            x = float(parts[0][1:])  # Skip 'X' prefix
-            y = float(parts[1][1:])
-            z = float(parts[2][1:])
-            self._position = np.array([x, y, z])
-        except (ValueError, IndexError):
-            raise StageError(f"Invalid position response: {response}")
+        # Write into the existing array rather than allocating a new one
+        self._position[:] = self._parse_position(response)
+        self._position_dirty = False
     
     def _wait_for_move_complete(self, timeout: float = 30.0):
-        """Wait for stage movement to complete."""
+        """
+        Wait for stage movement to complete.
+        
+        The controller answers ``WAIT`` only once motion has stopped, so
+        this blocks on a single reply instead of polling ``MOVING?``.
+        """
         if self.mock:
             return
         
-        start_time = time.time()
-        
-        while True:
-            if time.time() - start_time > timeout:
-                raise StageError("Move timeout")
-            
-            response = self._send_command("MOVING?")
-            
-            if response and "NO" in response.upper():
-                break
-            
-            time.sleep(0.1)
+        try:
+            self._send_commands([self._WAIT], timeout=timeout)
+        except StageError as e:
+            raise StageError(f"Move timeout: {e}")
     
-    def _send_command(self, command: str) -> Optional[str]:
-        """Send command to stage and return response."""
+    def _send_command(self, command: Union[str, bytes]) -> Optional[str]:
+        """Send command (str or preformatted bytes) to stage and return response."""
+        if isinstance(command, str):
+            command = command.encode()
+        
         if self.mock:
+            command = command.decode()
             # Simulate responses
             if "IDN" in command:
                 return "PI E-545 3-Channel Piezo Controller"
@@ -400,21 +603,80 @@ class StageControl:
             raise StageError("Serial port not open")
         
         try:
-            self._serial.write((command + '\n').encode())
-            response = self._serial.readline().decode().strip()
+            self._serial.write(command + b'\n')
+            response = self._readline().decode().strip()
             return response
         except serial.SerialException as e:
             raise StageError(f"Communication error: {e}")
     
-    @property
-    def is_connected(self) -> bool:
-        """Check if stage is connected."""
-        return self._connected
+    def _send_commands(self, commands: List[Union[str, bytes]],
+                       timeout: Optional[float] = None) -> List[str]:
+        """
+        Send several commands in one write and collect their responses.
+        
+        Parameters
+        ----------
+        commands : list of str or bytes
+            Commands, one response expected per command
+        timeout : float, optional
+            Total time to wait for all responses in seconds. Defaults to
+            the serial read timeout.
+            
+        Returns
+        -------
+        list of str
+            Responses in command order
+        """
+        if self.mock:
+            return [self._send_command(command) for command in commands]
+        
+        if not self._serial or not self._serial.is_open:
+            raise StageError("Serial port not open")
+        
+        deadline = time.time() + (self.timeout if timeout is None else timeout)
+        
+        try:
+            # Pipeline: one transfer out, then drain one reply per command
+            payload = [c.encode() if isinstance(c, str) else c for c in commands]
+            self._serial.write(b"\n".join(payload) + b"\n")
+            
+            responses = []
+            while len(responses) < len(commands):
+                line = self._readline()
+                if line:
+                    responses.append(line.decode().strip())
+                elif time.time() > deadline:
+                    break  # Read timed out
+                    
+        except serial.SerialException as e:
+            raise StageError(f"Communication error: {e}")
+        
+        if len(responses) < len(commands):
+            raise StageError(f"Expected {len(commands)} responses, "
+                             f"received {len(responses)}")
+        
+        return responses
     
-    @property
-    def is_moving(self) -> bool:
-        """Check if stage is currently moving."""
-        return self._state == StageState.MOVING
+    def _readline(self) -> bytes:
+        """
+        Return the next received line, or b'' if the read timed out.
+        
+        Reads drain everything the port has buffered in one call, rather
+        than the byte-at-a-time reads of ``Serial.readline``; extra lines
+        stay in ``_rx_buf`` for the next call.
+        """
+        while True:
+            end = self._rx_buf.find(b'\n')
+            if end >= 0:
+                line = bytes(self._rx_buf[:end + 1])
+                del self._rx_buf[:end + 1]
+                return line
+            
+            # Block for at least one byte (up to the port timeout)
+            chunk = self._serial.read(self._serial.in_waiting or 1)
+            if not chunk:
+                return b''
+            self._rx_buf += chunk
     
     def __enter__(self):
         """Context manager entry."""
@@ -425,10 +687,3 @@ class StageControl:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
         self.disconnect()
-    
-    def __repr__(self) -> str:
-        """String representation."""
-        pos = tuple(self._position)
-        return (f"StageControl(port='{self.port}', "
-                f"position=({pos[0]:.2f}, {pos[1]:.2f}, {pos[2]:.2f}), "
-                f"state={self._state.name})")
\ No newline at end of file
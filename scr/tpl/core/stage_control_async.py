@@ -0,0 +1,494 @@
+"""
+Asynchronous stage control for two-photon lithography
+======================================================
+
+asyncio interface for XYZ positioning stages. Commands are written as soon
+as they are issued and one background task matches the controller's
+replies to them, so later moves can be queued while earlier ones run.
+
+Author: Zeyad Mustafa
+Date: December 2024
+BTU Cottbus-Senftenberg
+"""
+
+import asyncio
+from collections import deque
+from typing import Deque, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .stage_control import StageError, StageState, _StageBase
+
+try:
+    import serial_asyncio_fast
+    SERIAL_ASYNCIO_AVAILABLE = True
+except ImportError:
+    SERIAL_ASYNCIO_AVAILABLE = False
+
+
+class StageControlAsync(_StageBase):
+    """
+    asyncio control interface for XYZ positioning stage.
+    
+    Uses the same command set and limits as StageControl. Each command is
+    written immediately (no drain unless the transport is backed up) and
+    gets a future for its reply; a single reader task resolves the futures
+    in order as replies arrive.
+    
+    Parameters
+    ----------
+    port : str
+        Serial port for stage communication
+    baudrate : int
+        Serial baud rate
+    timeout : float
+        Communication timeout in seconds
+    mock : bool
+        If True, run in simulation mode
+    """
+    
+    __slots__ = ('_reader', '_writer', '_reader_task', '_pending')
+    
+    # Await drain() only once this many bytes are queued in the transport
+    _WRITE_HIGH_WATER = 64 * 1024
+    
+    def __init__(self,
+                 port: str = "/dev/ttyUSB1",
+                 baudrate: int = 115200,
+                 timeout: float = 10.0,
+                 mock: bool = False):
+        super().__init__(port, baudrate, timeout, mock)
+        
+        self._reader = None
+        self._writer = None
+        self._reader_task = None
+        self._pending: Deque[asyncio.Future] = deque()  # Awaiting replies, in order
+    
+    async def connect(self) -> bool:
+        """
+        Connect to stage controller.
+        
+        Returns
+        -------
+        bool
+            True if successful
+        """
+        if self.mock:
+            print("MOCK MODE: Simulating stage connection")
+            self._connected = True
+            self._state = StageState.IDLE
+            self._position[:] = self._home_position
+            return True
+        
+        if not SERIAL_ASYNCIO_AVAILABLE:
+            raise ImportError("pyserial-asyncio-fast is required for StageControlAsync. "
+                              "Install with: pip install pyserial-asyncio-fast")
+        
+        try:
+            self._reader, self._writer = await serial_asyncio_fast.open_serial_connection(
+                url=self.port,
+                baudrate=self.baudrate
+            )
+        except OSError as e:  # Includes serial.SerialException
+            raise StageError(f"Failed to connect to stage: {e}")
+        
+        self._reader_task = asyncio.get_running_loop().create_task(self._read_replies())
+        
+        await asyncio.sleep(0.5)
+        
+        # Verify connection
+        try:
+            response, = await self._exchange([b"*IDN?"])
+            if not response:
+                raise StageError("No response from stage")
+        except StageError:
+            await self.disconnect()
+            raise
+        
+        print(f"Stage connected: {response}")
+        self._connected = True
+        self._state = StageState.IDLE
+        
+        # Read current position
+        await self._update_position()
+        return True
+    
+    async def disconnect(self):
+        """Disconnect from stage."""
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+        
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+        
+        self._fail_pending(StageError("Stage disconnected"))
+        self._reader = self._writer = self._reader_task = None
+        
+        self._connected = False
+        self._state = StageState.DISCONNECTED
+        
+        if self.mock:
+            print("MOCK MODE: Stage disconnected")
+    
+    async def home(self):
+        """
+        Home all axes to reference position.
+        
+        Raises
+        ------
+        StageError
+            If homing fails
+        """
+        if not self._connected:
+            raise StageError("Stage not connected")
+        
+        print("Homing stage...")
+        self._state = StageState.HOMING
+        
+        if self.mock:
+            print("MOCK MODE: Homing to reference position")
+            await asyncio.sleep(2)  # Simulate homing time
+            self._position[:] = self._home_position
+            self._state = StageState.IDLE
+            print(f"  Homed to: {self._position}")
+            return
+        
+        # Homing, completion and position read-back in one exchange
+        response, _, position = await self._guarded_exchange(
+            [b"HOME", self._WAIT, b"POS?"], timeout=self.timeout + 30.0
+        )
+        
+        if "OK" not in response:
+            self._state = StageState.ERROR
+            raise StageError(f"Homing failed: {response}")
+        
+        self._set_position(self._parse_position(position))
+        print(f"  Homed to: {self._position}")
+    
+    async def move_absolute(self, x: float, y: float, z: float,
+                            speed: Optional[float] = None):
+        """
+        Move to absolute position.
+        
+        Parameters
+        ----------
+        x, y, z : float
+            Target position in micrometers
+        speed : float, optional
+            Movement speed in μm/s
+        """
+        if not self._connected:
+            raise StageError("Stage not connected")
+        
+        self._check_target(x, y, z)
+        speed = self._check_speed(speed)
+        
+        self._state = StageState.MOVING
+        distance = self._distance_to(x, y, z)
+        
+        if self.mock:
+            # Simulate movement
+            await asyncio.sleep(min(distance / speed / 1000, 0.1))  # Scaled for simulation
+            self._position[:] = (x, y, z)
+            self._state = StageState.IDLE
+            return
+        
+        response, _ = await self._guarded_exchange(
+            [self._MOVE_FMT % (x, y, z, speed), self._WAIT],
+            timeout=self.timeout + distance / speed
+        )
+        
+        if "OK" not in response:
+            self._mark_failed()
+            raise StageError(f"Move failed: {response}")
+        
+        # The acknowledged target is the new position
+        self._set_position((x, y, z))
+    
+    async def move_absolute_batch(self, points: np.ndarray,
+                                  speed: Optional[float] = None):
+        """
+        Move through a sequence of absolute positions.
+        
+        All moves are written at once and queued by the controller; a
+        final ``SYNC?`` resolves when the last one has finished.
+        
+        Parameters
+        ----------
+        points : ndarray
+            N×3 array of target positions in micrometers
+        speed : float, optional
+            Movement speed in μm/s
+        """
+        if not self._connected:
+            raise StageError("Stage not connected")
+        
+        points = self._check_points(points)
+        if len(points) == 0:
+            return
+        
+        speed = self._check_speed(speed)
+        self._state = StageState.MOVING
+        
+        if self.mock:
+            self._position[:] = points[-1]
+            self._state = StageState.IDLE
+            return
+        
+        commands, path_length = self._batch_commands(points, speed)
+        responses = await self._guarded_exchange(
+            commands, timeout=self.timeout + path_length / speed
+        )
+        self._finish_batch(points, responses)
+    
+    async def move_relative(self, dx: float, dy: float, dz: float,
+                            speed: Optional[float] = None):
+        """
+        Move relative to current position.
+        
+        Parameters
+        ----------
+        dx, dy, dz : float
+            Displacement in micrometers
+        speed : float, optional
+            Movement speed in μm/s
+        """
+        current = await self.get_position()
+        await self.move_absolute(current[0] + dx, current[1] + dy,
+                                 current[2] + dz, speed)
+    
+    async def get_position(self) -> Tuple[float, float, float]:
+        """
+        Get current stage position.
+        
+        The last commanded position is returned without a serial query
+        unless it may be stale (after ``stop()`` or a failed move).
+        
+        Returns
+        -------
+        tuple
+            (x, y, z) position in micrometers
+        """
+        if self.mock:
+            return tuple(self._position)
+        
+        if not self._connected:
+            raise StageError("Stage not connected")
+        
+        if self._position_dirty:
+            await self._update_position()
+        return tuple(self._position)
+    
+    async def refresh_position(self) -> Tuple[float, float, float]:
+        """
+        Read the current stage position from the controller.
+        
+        Returns
+        -------
+        tuple
+            (x, y, z) position in micrometers
+        """
+        if not self.mock and not self._connected:
+            raise StageError("Stage not connected")
+        
+        await self._update_position()
+        return tuple(self._position)
+    
+    async def set_speed(self, speed: float):
+        """
+        Set default movement speed.
+        
+        Parameters
+        ----------
+        speed : float
+            Speed in μm/s
+        """
+        if speed <= 0 or speed > self.max_speed:
+            raise StageError(f"Speed must be between 0 and {self.max_speed}")
+        
+        self.default_speed = speed
+        
+        if not self.mock:
+            await self._exchange([f"SPEED {speed:.0f}"])
+    
+    async def stop(self):
+        """Emergency stop - halt all movement immediately."""
+        if self.mock:
+            print("MOCK MODE: Emergency stop")
+            self._state = StageState.IDLE
+            return
+        
+        if not self._connected:
+            return
+        
+        # Written right away; its reply follows any still outstanding
+        self._position_dirty = True
+        await self._exchange([b"STOP"])
+        self._state = StageState.IDLE
+    
+    async def calibrate(self) -> dict:
+        """
+        Run stage calibration routine.
+        
+        The move, completion wait and position read-back for every test
+        position are written in one go, so the controller works through
+        them back to back without a round trip per target.
+        
+        Returns
+        -------
+        dict
+            Calibration results
+        """
+        print("Starting stage calibration...")
+        
+        if not self._connected:
+            raise StageError("Stage not connected")
+        
+        # Home first
+        await self.home()
+        
+        test_positions = self._CALIBRATION_POSITIONS
+        
+        if self.mock:
+            measured = [tuple(float(v) for v in target) for target in test_positions]
+            self._position[:] = measured[-1]
+        else:
+            commands = []
+            for target in test_positions:
+                self._check_target(*target)
+                commands += [self._MOVE_FMT % (*target, self.default_speed),
+                             self._WAIT, b"POS?"]
+            
+            path = np.vstack([self._position, test_positions])
+            path_length = np.linalg.norm(np.diff(path, axis=0), axis=1).sum()
+            
+            self._state = StageState.MOVING
+            replies = await self._guarded_exchange(
+                commands, timeout=self.timeout + path_length / self.default_speed
+            )
+            
+            measured = []
+            for i, target in enumerate(test_positions):
+                response, _, position = replies[3 * i:3 * i + 3]
+                if "OK" not in response:
+                    self._mark_failed()
+                    raise StageError(f"Move to {target} failed: {response}")
+                measured.append(self._parse_position(position))
+            
+            self._set_position(measured[-1])
+        
+        # Return to home
+        await self.home()
+        
+        return self._calibration_results(test_positions, measured)
+    
+    async def _update_position(self):
+        """Query and update current position from hardware."""
+        if self.mock:
+            return
+        
+        response, = await self._exchange([b"POS?"])
+        self._position[:] = self._parse_position(response)
+        self._position_dirty = False
+    
+    def _submit(self, command: Union[str, bytes]) -> asyncio.Future:
+        """Write one command and return the future for its reply."""
+        if self._writer is None or self._writer.is_closing():
+            raise StageError("Serial port not open")
+        
+        if isinstance(command, str):
+            command = command.encode()
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(future)
+        self._writer.write(command + b"\n")
+        return future
+    
+    async def _exchange(self, commands: List[Union[str, bytes]],
+                        timeout: Optional[float] = None) -> List[str]:
+        """
+        Write commands back to back and await their replies.
+        
+        Parameters
+        ----------
+        commands : list of str or bytes
+            Commands, one reply expected per command
+        timeout : float, optional
+            Total time to wait for all replies in seconds. Defaults to
+            the communication timeout.
+        
+        Returns
+        -------
+        list of str
+            Replies in command order
+        """
+        futures = [self._submit(command) for command in commands]
+        
+        # Eager writes; only wait on the transport when it is backed up
+        if self._writer.transport.get_write_buffer_size() > self._WRITE_HIGH_WATER:
+            await self._writer.drain()
+        
+        try:
+            return await asyncio.wait_for(
+                asyncio.gather(*futures),
+                self.timeout if timeout is None else timeout
+            )
+        except asyncio.TimeoutError:
+            received = sum(f.done() and not f.cancelled() for f in futures)
+            raise StageError(f"Expected {len(commands)} responses, "
+                             f"received {received}")
+    
+    async def _guarded_exchange(self, commands: List[Union[str, bytes]],
+                                timeout: Optional[float] = None) -> List[str]:
+        """Like ``_exchange``, but a failure leaves the stage in ERROR."""
+        try:
+            return await self._exchange(commands, timeout=timeout)
+        except StageError:
+            self._mark_failed()
+            raise
+    
+    async def _read_replies(self):
+        """Resolve pending futures with replies, in order, until the port closes."""
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                if not self._pending:
+                    continue  # Unsolicited line
+                
+                # A future cancelled by a timeout still consumes its reply,
+                # keeping later replies aligned with their commands
+                future = self._pending.popleft()
+                if not future.done():
+                    future.set_result(line.decode().strip())
+        except OSError as e:
+            self._fail_pending(StageError(f"Communication error: {e}"))
+            return
+        
+        self._fail_pending(StageError("Serial connection closed"))
+    
+    def _fail_pending(self, error: StageError):
+        """Fail every request still waiting for a reply."""
+        while self._pending:
+            future = self._pending.popleft()
+            if not future.done():
+                future.set_exception(error)
+    
+    async def __aenter__(self):
+        """Async context manager entry."""
+        if not self._connected:
+            await self.connect()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.disconnect()
@@ -0,0 +1,505 @@
+"""
+Compiled fill kernels for path planning
+=======================================
+
+Numba-compiled inner loops used by PathPlanner and Toolpath. When numba
+is not installed the kernels remain importable as plain Python functions,
+but the callers fall back to their NumPy implementations instead.
+
+Author: Zeyad Mustafa
+Date: December 2024
+BTU Cottbus-Senftenberg
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op replacement for numba.njit."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def fill_rectilinear(extents, z_positions, layer_indices, offsets,
+                     hatch, bidirectional, out):
+    """
+    Write rectilinear hatch endpoints for many layers into ``out``.
+
+    Parameters
+    ----------
+    extents : ndarray
+        L×4 array of (x_min, y_min, x_max, y_max) per layer
+    z_positions : ndarray
+        Z-height of each layer
+    layer_indices : ndarray
+        Layer index (selects X or Y scan direction)
+    offsets : ndarray
+        Row offsets into ``out``, length L+1 (two rows per hatch line)
+    hatch : float
+        Hatch distance in micrometers
+    bidirectional : bool
+        Reverse every other hatch line (serpentine scan)
+    out : ndarray
+        Preallocated N×3 output array
+    """
+    for i in prange(extents.shape[0]):
+        # Layers alternate between scanning along X and along Y
+        if layer_indices[i] % 2 == 0:
+            start = extents[i, 0]
+            stop = extents[i, 2]
+            base = extents[i, 1]
+            scan_axis = 0
+            line_axis = 1
+        else:
+            start = extents[i, 1]
+            stop = extents[i, 3]
+            base = extents[i, 0]
+            scan_axis = 1
+            line_axis = 0
+
+        z = z_positions[i]
+        row = offsets[i]
+        n_lines = (offsets[i + 1] - row) // 2
+
+        for k in range(n_lines):
+            line = base + k * hatch
+            a = start
+            b = stop
+            if bidirectional and k % 2 == 1:
+                a = stop
+                b = start
+
+            out[row, scan_axis] = a
+            out[row, line_axis] = line
+            out[row, 2] = z
+            out[row + 1, scan_axis] = b
+            out[row + 1, line_axis] = line
+            out[row + 1, 2] = z
+            row += 2
+
+
+@njit(parallel=True, cache=True)
+def order_strokes(starts, ends, layer_offsets, allow_flip, order, flipped):
+    """
+    Greedy nearest-neighbour stroke order within each layer.
+
+    Every layer keeps its first stroke, then repeatedly moves on to the
+    unvisited stroke with an endpoint closest (in x, y) to the end of the
+    current one, entering it from that endpoint (only from its start
+    unless ``allow_flip``). Ties go to the earlier
+    stroke without reversal, so an already-serpentine layer is unchanged.
+
+    Parameters
+    ----------
+    starts : ndarray
+        S×2 stroke start points
+    ends : ndarray
+        S×2 stroke end points
+    layer_offsets : ndarray
+        Stroke offsets of each layer, length L+1
+    allow_flip : bool
+        Allow strokes to be traversed in reverse
+    order : ndarray
+        Output: stroke index at each position
+    flipped : ndarray
+        Output: True where the stroke at that position is reversed
+    """
+    for layer in prange(layer_offsets.shape[0] - 1):
+        lo = layer_offsets[layer]
+        hi = layer_offsets[layer + 1]
+        if hi == lo:
+            continue
+
+        visited = np.zeros(hi - lo, dtype=np.bool_)
+        visited[0] = True
+        order[lo] = lo
+        flipped[lo] = False
+        cx = ends[lo, 0]
+        cy = ends[lo, 1]
+
+        for pos in range(lo + 1, hi):
+            best = lo
+            best_dist = np.inf
+            best_flip = False
+            for j in range(lo, hi):
+                if visited[j - lo]:
+                    continue
+                dx = starts[j, 0] - cx
+                dy = starts[j, 1] - cy
+                dist = dx * dx + dy * dy
+                if dist < best_dist:
+                    best = j
+                    best_dist = dist
+                    best_flip = False
+                if not allow_flip:
+                    continue
+                dx = ends[j, 0] - cx
+                dy = ends[j, 1] - cy
+                dist = dx * dx + dy * dy
+                if dist < best_dist:
+                    best = j
+                    best_dist = dist
+                    best_flip = True
+
+            visited[best - lo] = True
+            order[pos] = best
+            flipped[pos] = best_flip
+            if best_flip:
+                cx = starts[best, 0]
+                cy = starts[best, 1]
+            else:
+                cx = ends[best, 0]
+                cy = ends[best, 1]
+
+
+@njit(cache=True, fastmath=True)
+def toolpath_stats(x, y, z, powers, speeds):
+    """
+    Path length, time estimate and power/speed ranges in one pass.
+
+    Parameters
+    ----------
+    x, y, z : ndarray
+        Coordinates along each axis (at least one point)
+    powers : ndarray
+        Laser power at each point
+    speeds : ndarray
+        Scan speed at each point
+
+    Returns
+    -------
+    tuple
+        (total_length, time_estimate, min_power, max_power, sum_power,
+        min_speed, max_speed), with time from the mean speed of each
+        segment's endpoints
+    """
+    length = 0.0
+    time = 0.0
+    min_power = max_power = sum_power = np.float64(powers[0])
+    min_speed = max_speed = np.float64(speeds[0])
+
+    for i in range(1, x.shape[0]):
+        dx = np.float64(x[i]) - x[i - 1]
+        dy = np.float64(y[i]) - y[i - 1]
+        dz = np.float64(z[i]) - z[i - 1]
+        segment = np.sqrt(dx * dx + dy * dy + dz * dz)
+        length += segment
+        time += 2.0 * segment / (np.float64(speeds[i - 1]) + speeds[i])
+
+        power = np.float64(powers[i])
+        speed = np.float64(speeds[i])
+        min_power = min(min_power, power)
+        max_power = max(max_power, power)
+        sum_power += power
+        min_speed = min(min_speed, speed)
+        max_speed = max(max_speed, speed)
+
+    return length, time, min_power, max_power, sum_power, min_speed, max_speed
+
+
+@njit(cache=True, nogil=True)
+def format_fixed_rows(values, negative, decimals, literals, literal_offsets, out):
+    """
+    Write rows of fixed-point numbers as ASCII text into ``out``.
+
+    Each row is ``literal[0] value[0] literal[1] ... value[C-1] literal[C]``
+    with value ``j`` printed like ``%.{decimals[j]}f``. Values arrive
+    already scaled by ``10**decimals`` and rounded, so only the digits
+    remain to be written.
+
+    Parameters
+    ----------
+    values : ndarray
+        N×C int64 values times ``10**decimals``, rounded
+    negative : ndarray
+        N×C bool, True where the original value has its sign bit set
+        (so -0.0 prints with a minus sign, as %-formatting does)
+    decimals : ndarray
+        Digits after the decimal point per column
+    literals : ndarray
+        uint8 text of the C+1 literal pieces, concatenated
+    literal_offsets : ndarray
+        Start of each literal piece in ``literals``, length C+2
+    out : ndarray
+        uint8 output buffer, large enough for all rows
+
+    Returns
+    -------
+    int
+        Number of bytes written
+    """
+    n_columns = decimals.shape[0]
+    digits = np.empty(20, dtype=np.uint8)
+    pos = 0
+
+    for i in range(values.shape[0]):
+        for j in range(n_columns + 1):
+            for k in range(literal_offsets[j], literal_offsets[j + 1]):
+                out[pos] = literals[k]
+                pos += 1
+            if j == n_columns:
+                break
+
+            if negative[i, j]:
+                out[pos] = 45  # '-'
+                pos += 1
+
+            # Digits of |value| least significant first, then padded so
+            # there is at least one digit before the decimal point
+            v = abs(values[i, j])
+            n_digits = 0
+            while v > 0 or n_digits <= decimals[j]:
+                digits[n_digits] = 48 + v % 10
+                v //= 10
+                n_digits += 1
+
+            for d in range(n_digits - 1, -1, -1):
+                if d == decimals[j] - 1:
+                    out[pos] = 46  # '.'
+                    pos += 1
+                out[pos] = digits[d]
+                pos += 1
+
+    return pos
+
+
+@njit(parallel=True, cache=True)
+def two_opt_strokes(starts, ends, layer_offsets, window, max_passes, order, flipped):
+    """
+    Windowed 2-opt refinement of a stroke order within each layer.
+
+    Reversing the run of strokes between positions ``i+1`` and ``j``
+    (``j - i <= window``) also reverses each stroke in it; the move is
+    applied when it shortens the travel from stroke ``i`` into the run
+    and out of it into stroke ``j+1``. Passes repeat until nothing
+    improves or ``max_passes`` is reached.
+
+    Parameters
+    ----------
+    starts : ndarray
+        S×2 stroke start points (in stroke index order)
+    ends : ndarray
+        S×2 stroke end points
+    layer_offsets : ndarray
+        Stroke offsets of each layer, length L+1
+    window : int
+        Longest run of strokes considered for reversal
+    max_passes : int
+        Maximum number of improvement passes per layer
+    order : ndarray
+        In/out: stroke index at each position
+    flipped : ndarray
+        In/out: True where the stroke at that position is reversed
+    """
+    for layer in prange(layer_offsets.shape[0] - 1):
+        lo = layer_offsets[layer]
+        hi = layer_offsets[layer + 1]
+        m = hi - lo
+        if m < 2:
+            continue
+
+        # Entry and exit point of the stroke at each position
+        entry = np.empty((m, 2))
+        leave = np.empty((m, 2))
+        for p in range(m):
+            s = order[lo + p]
+            if flipped[lo + p]:
+                entry[p, 0] = ends[s, 0]
+                entry[p, 1] = ends[s, 1]
+                leave[p, 0] = starts[s, 0]
+                leave[p, 1] = starts[s, 1]
+            else:
+                entry[p, 0] = starts[s, 0]
+                entry[p, 1] = starts[s, 1]
+                leave[p, 0] = ends[s, 0]
+                leave[p, 1] = ends[s, 1]
+
+        for _ in range(max_passes):
+            improved = False
+            for i in range(m - 1):
+                for j in range(i + 1, min(i + window, m - 1) + 1):
+                    before = (np.hypot(leave[i, 0] - entry[i + 1, 0],
+                                       leave[i, 1] - entry[i + 1, 1]))
+                    after = (np.hypot(leave[i, 0] - leave[j, 0],
+                                      leave[i, 1] - leave[j, 1]))
+                    if j + 1 < m:
+                        before += np.hypot(leave[j, 0] - entry[j + 1, 0],
+                                           leave[j, 1] - entry[j + 1, 1])
+                        after += np.hypot(entry[i + 1, 0] - entry[j + 1, 0],
+                                          entry[i + 1, 1] - entry[j + 1, 1])
+                    if after < before - 1e-12:
+                        # Reverse positions i+1..j, swapping entry and exit
+                        a = i + 1
+                        b = j
+                        while a < b:
+                            for c in range(2):
+                                t = entry[a, c]
+                                entry[a, c] = leave[b, c]
+                                leave[b, c] = t
+                                t = leave[a, c]
+                                leave[a, c] = entry[b, c]
+                                entry[b, c] = t
+                            t_order = order[lo + a]
+                            order[lo + a] = order[lo + b]
+                            order[lo + b] = t_order
+                            t_flip = flipped[lo + a]
+                            flipped[lo + a] = not flipped[lo + b]
+                            flipped[lo + b] = not t_flip
+                            a += 1
+                            b -= 1
+                        if a == b:
+                            for c in range(2):
+                                t = entry[a, c]
+                                entry[a, c] = leave[a, c]
+                                leave[a, c] = t
+                            flipped[lo + a] = not flipped[lo + a]
+                        improved = True
+            if not improved:
+                break
+
+
+@njit(parallel=True, cache=True)
+def fill_concentric(extents, z_positions, ring_counts, offsets, hatch, out):
+    """
+    Write concentric rectangle fills for many layers into ``out``.
+
+    Ring ``k`` of a layer is the extent inset by ``k * hatch``, written as
+    its four corners plus the first corner again to close the loop.
+
+    Parameters
+    ----------
+    extents : ndarray
+        L×4 array of (x_min, y_min, x_max, y_max) per layer
+    z_positions : ndarray
+        Z-position of each layer
+    ring_counts : ndarray
+        Number of rings per layer
+    offsets : ndarray
+        Start row of each layer in ``out``, length L+1
+    hatch : float
+        Ring spacing
+    out : ndarray
+        Preallocated N×3 output array
+    """
+    for layer in prange(extents.shape[0]):
+        x_min = extents[layer, 0]
+        y_min = extents[layer, 1]
+        x_max = extents[layer, 2]
+        y_max = extents[layer, 3]
+        z = z_positions[layer]
+        row = offsets[layer]
+
+        for k in range(ring_counts[layer]):
+            inset = k * hatch
+            x0 = x_min + inset
+            x1 = x_max - inset
+            y0 = y_min + inset
+            y1 = y_max - inset
+
+            out[row, 0] = x0
+            out[row, 1] = y0
+            out[row + 1, 0] = x1
+            out[row + 1, 1] = y0
+            out[row + 2, 0] = x1
+            out[row + 2, 1] = y1
+            out[row + 3, 0] = x0
+            out[row + 3, 1] = y1
+            out[row + 4, 0] = x0
+            out[row + 4, 1] = y0
+            for r in range(row, row + 5):
+                out[r, 2] = z
+            row += 5
+
+
+@njit(cache=True)
+def _spiral_side(start, stop, step, fixed, along_x, z, scale, out, row, write):
+    """Points ``start + i * step`` short of ``stop`` along one spiral side."""
+    n = int(np.ceil((stop - start) / step * scale))
+    if n < 0:
+        n = 0
+    if write:
+        for i in range(n):
+            value = start + i * step
+            if along_x:
+                out[row + i, 0] = value
+                out[row + i, 1] = fixed
+            else:
+                out[row + i, 0] = fixed
+                out[row + i, 1] = value
+            out[row + i, 2] = z
+    return n
+
+
+@njit(cache=True)
+def _spiral_layer(x_min, y_min, x_max, y_max, z, hatch, scale, out, row, write):
+    """Walk the spiral rings of one layer; returns the number of points."""
+    x0 = x_min
+    x1 = x_max
+    y0 = y_min
+    y1 = y_max
+    start = row
+
+    while x0 < x1 and y0 < y1:
+        row += _spiral_side(x0, x1, hatch, y0, True, z, scale, out, row, write)
+        row += _spiral_side(y0, y1, hatch, x1, False, z, scale, out, row, write)
+        row += _spiral_side(x1, x0, -hatch, y1, True, z, scale, out, row, write)
+        row += _spiral_side(y1, y0, -hatch, x0, False, z, scale, out, row, write)
+
+        x0 += hatch
+        y0 += hatch
+        x1 -= hatch
+        y1 -= hatch
+
+    return row - start
+
+
+@njit(parallel=True, cache=True)
+def fill_spiral(extents, has_section, z_positions, hatch, scale, write,
+                counts, offsets, out):
+    """
+    Count or write inward rectangular spiral fills for many layers.
+
+    Called twice: first with ``write=False`` to fill ``counts``, then,
+    once ``offsets`` has been computed from the counts, with
+    ``write=True`` to write the points.
+
+    Parameters
+    ----------
+    extents : ndarray
+        L×4 array of (x_min, y_min, x_max, y_max) per layer
+    has_section : ndarray
+        False for layers without a cross-section (no points)
+    z_positions : ndarray
+        Z-position of each layer
+    hatch : float
+        Spacing between points and between rings
+    scale : float
+        ``1 - rtol`` applied to the point counts of each side
+    write : bool
+        Write points into ``out`` rather than counting them
+    counts : ndarray
+        Output (first call): number of points per layer
+    offsets : ndarray
+        Start row of each layer in ``out``, length L+1
+    out : ndarray
+        N×3 output array (second call)
+    """
+    for layer in prange(extents.shape[0]):
+        if not has_section[layer]:
+            if not write:
+                counts[layer] = 0
+            continue
+        n = _spiral_layer(extents[layer, 0], extents[layer, 1],
+                          extents[layer, 2], extents[layer, 3],
+                          z_positions[layer], hatch, scale,
+                          out, offsets[layer], write)
+        if not write:
+            counts[layer] = n
@@ -0,0 +1,404 @@
+"""
+Compiled mesh kernels for geometry construction
+===============================================
+
+Numba-compiled inner loops used by Geometry and the primitives. When
+numba is not installed the kernels remain importable as plain Python
+functions, but callers fall back to their NumPy implementations instead.
+
+Author: Zeyad Mustafa
+Date: December 2024
+BTU Cottbus-Senftenberg
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op replacement for numba.njit."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def place_segments(template, directions, lengths, centers, out):
+    """
+    Place a unit-height template along many segments.
+
+    For each segment the template (aligned with z, height 1) is stretched
+    to the segment length, rotated onto its direction with Rodrigues'
+    formula and moved to its center, all in one pass.
+
+    Parameters
+    ----------
+    template : ndarray
+        V×3 template vertices
+    directions : ndarray
+        N×3 unit segment directions
+    lengths : ndarray
+        Segment lengths
+    centers : ndarray
+        N×3 segment midpoints
+    out : ndarray
+        Preallocated N×V×3 output array
+    """
+    n_vertices = template.shape[0]
+
+    for i in prange(directions.shape[0]):
+        dx = directions[i, 0]
+        dy = directions[i, 1]
+        dz = directions[i, 2]
+
+        # k = z × d; R = I + K + K² / (1 + cos θ), identity along ±z
+        kx = -dy
+        ky = dx
+        r00 = 1.0
+        r01 = 0.0
+        r02 = 0.0
+        r10 = 0.0
+        r11 = 1.0
+        r12 = 0.0
+        r20 = 0.0
+        r21 = 0.0
+        r22 = 1.0
+        if np.sqrt(kx * kx + ky * ky) > 1e-6:
+            f = 1.0 / (1.0 + dz)
+            r00 = 1.0 - ky * ky * f
+            r01 = kx * ky * f
+            r02 = ky
+            r10 = kx * ky * f
+            r11 = 1.0 - kx * kx * f
+            r12 = -kx
+            r20 = -ky
+            r21 = kx
+            r22 = 1.0 - (kx * kx + ky * ky) * f
+
+        length = lengths[i]
+        cx = centers[i, 0]
+        cy = centers[i, 1]
+        cz = centers[i, 2]
+
+        for v in range(n_vertices):
+            x = template[v, 0]
+            y = template[v, 1]
+            z = template[v, 2] * length
+            out[i, v, 0] = r00 * x + r01 * y + r02 * z + cx
+            out[i, v, 1] = r10 * x + r11 * y + r12 * z + cy
+            out[i, v, 2] = r20 * x + r21 * y + r22 * z + cz
+
+
+@njit(cache=True)
+def build_cone(radius_base, radius_top, height, cos_t, sin_t):
+    """
+    Build cone vertices and faces centered at the origin.
+
+    Vertex layout is base circle, top circle (a single apex for a pointed
+    cone), base center and, if truncated, top center. Faces are the side
+    triangles (two per section when truncated, interleaved), then the
+    base cap and the top cap.
+
+    Parameters
+    ----------
+    radius_base : float
+        Base radius
+    radius_top : float
+        Top radius (0 for a pointed cone)
+    height : float
+        Cone height
+    cos_t, sin_t : ndarray
+        Cosine and sine of the section angles around the axis
+
+    Returns
+    -------
+    vertices : ndarray
+        V×3 vertex array
+    faces : ndarray
+        F×3 face index array
+    """
+    truncated = radius_top > 0
+    n = cos_t.shape[0]
+    n_top = n if truncated else 1
+    vertices = np.empty((n + n_top + 1 + (1 if truncated else 0), 3))
+    faces = np.empty((4 * n if truncated else 2 * n, 3), dtype=np.int64)
+
+    for i in range(n):
+        c = cos_t[i]
+        s = sin_t[i]
+        vertices[i, 0] = radius_base * c
+        vertices[i, 1] = radius_base * s
+        vertices[i, 2] = -height / 2
+        if truncated:
+            vertices[n + i, 0] = radius_top * c
+            vertices[n + i, 1] = radius_top * s
+            vertices[n + i, 2] = height / 2
+
+    if not truncated:
+        vertices[n, 0] = 0.0
+        vertices[n, 1] = 0.0
+        vertices[n, 2] = height / 2
+
+    base_center = n + n_top
+    vertices[base_center, 0] = 0.0
+    vertices[base_center, 1] = 0.0
+    vertices[base_center, 2] = -height / 2
+    top_center = base_center + 1
+    if truncated:
+        vertices[top_center, 0] = 0.0
+        vertices[top_center, 1] = 0.0
+        vertices[top_center, 2] = height / 2
+
+    k = 0
+    for i in range(n):
+        j = (i + 1) % n
+        faces[k, 0] = i
+        faces[k, 1] = j
+        if truncated:
+            faces[k, 2] = n + i
+            faces[k + 1, 0] = j
+            faces[k + 1, 1] = n + j
+            faces[k + 1, 2] = n + i
+            k += 2
+        else:
+            faces[k, 2] = n
+            k += 1
+    for i in range(n):
+        faces[k, 0] = base_center
+        faces[k, 1] = (i + 1) % n
+        faces[k, 2] = i
+        k += 1
+    if truncated:
+        for i in range(n):
+            faces[k, 0] = top_center
+            faces[k, 1] = n + i
+            faces[k, 2] = n + (i + 1) % n
+            k += 1
+
+    return vertices, faces
+
+
+@njit(parallel=True, cache=True)
+def build_torus(major_radius, minor_radius, cos_t, sin_t):
+    """
+    Build torus vertices and faces centered at the origin.
+
+    Vertices form an m × m grid over the tube angle (rows) and the angle
+    around the axis (columns), both sampled at the same m angles over
+    [0, 2π). Each grid quad is split into two triangles, wrapping around
+    the seam.
+
+    Parameters
+    ----------
+    major_radius : float
+        Distance from the axis to the tube center
+    minor_radius : float
+        Tube radius
+    cos_t, sin_t : ndarray
+        Cosine and sine of the m sample angles
+
+    Returns
+    -------
+    vertices : ndarray
+        m²×3 vertex array
+    faces : ndarray
+        2·m²×3 face index array
+    """
+    m = cos_t.shape[0]
+    vertices = np.empty((m * m, 3))
+    faces = np.empty((2 * m * m, 3), dtype=np.int64)
+
+    for r in prange(m):
+        ring = major_radius + minor_radius * cos_t[r]
+        z = minor_radius * sin_t[r]
+        for c in range(m):
+            v = r * m + c
+            vertices[v, 0] = ring * cos_t[c]
+            vertices[v, 1] = ring * sin_t[c]
+            vertices[v, 2] = z
+
+    for i in prange(m):
+        i_next = (i + 1) % m
+        for j in range(m):
+            j_next = (j + 1) % m
+            k = 2 * (i * m + j)
+            faces[k, 0] = i * m + j
+            faces[k, 1] = i * m + j_next
+            faces[k, 2] = i_next * m + j
+            faces[k + 1, 0] = i * m + j_next
+            faces[k + 1, 1] = i_next * m + j_next
+            faces[k + 1, 2] = i_next * m + j
+
+    return vertices, faces
+
+
+@njit(cache=True)
+def _face_signs(vertices, faces, f, height, tol, signs):
+    """Sign (-1, 0, 1) of each vertex of face f relative to the plane."""
+    for j in range(3):
+        d = vertices[faces[f, j], 2] - height
+        if d < -tol:
+            signs[j] = -1
+        elif d > tol:
+            signs[j] = 1
+        else:
+            signs[j] = 0
+
+
+@njit(cache=True)
+def _segment_case(signs):
+    """Intersection case of a face: 0 cut, 1 through a vertex, 2 edge, -1 none."""
+    n_neg = 0
+    n_pos = 0
+    for j in range(3):
+        if signs[j] < 0:
+            n_neg += 1
+        elif signs[j] > 0:
+            n_pos += 1
+    if n_neg + n_pos == 3 and n_neg > 0 and n_pos > 0:
+        return 0
+    if n_neg == 1 and n_pos == 1:
+        return 1
+    if n_neg == 0 and n_pos == 1:
+        return 2
+    return -1
+
+
+@njit(cache=True)
+def _cut_edge(vertices, a, b, height, out):
+    """
+    Write the x, y crossing of edge a→b with the plane into out.
+
+    Uses the operation order of trimesh's plane_lines (unit direction,
+    then distance along it) so results match it exactly.
+    """
+    dx = vertices[b, 0] - vertices[a, 0]
+    dy = vertices[b, 1] - vertices[a, 1]
+    dz = vertices[b, 2] - vertices[a, 2]
+    scale = 1.0 / np.sqrt(dx * dx + dy * dy + dz * dz)
+    ux = dx * scale
+    uy = dy * scale
+    uz = dz * scale
+    distance = (height - vertices[a, 2]) / uz
+    out[0] = vertices[a, 0] + distance * ux
+    out[1] = vertices[a, 1] + distance * uy
+
+
+@njit(parallel=True, cache=True)
+def plane_segments(vertices, faces, order, z_min, z_max, heights, tol):
+    """
+    Intersect a mesh with many horizontal planes.
+
+    Each plane is handled independently: the faces whose z-range spans it
+    are gathered from the z_min-sorted face order, counted in a first pass
+    and written in a second, so every plane owns a fixed slice of the
+    output. Within a plane, cut faces come first, then faces cut through a
+    vertex, then faces with an edge on the plane, each in face order, as
+    in trimesh's mesh_plane.
+
+    Parameters
+    ----------
+    vertices : ndarray
+        V×3 mesh vertices
+    faces : ndarray
+        F×3 face indices
+    order : ndarray
+        Face indices sorted by minimum z
+    z_min, z_max : ndarray
+        Minimum and maximum z of each face, in ``order``
+    heights : ndarray
+        Z-heights of the planes
+    tol : float
+        Distance below which a vertex counts as on the plane
+
+    Returns
+    -------
+    lines : ndarray
+        S×2×2 segment endpoints in x, y, grouped by plane
+    face_index : ndarray
+        Face of each segment
+    counts : ndarray
+        Number of segments of each plane
+    """
+    n_planes = heights.shape[0]
+    margin = 2 * tol
+    stops = np.searchsorted(z_min, heights + margin, side='right')
+    counts = np.zeros(n_planes, dtype=np.int64)
+
+    for p in prange(n_planes):
+        signs = np.empty(3, dtype=np.int8)
+        height = heights[p]
+        for k in range(stops[p]):
+            if z_max[k] >= height - margin:
+                _face_signs(vertices, faces, order[k], height, tol, signs)
+                if _segment_case(signs) >= 0:
+                    counts[p] += 1
+
+    ends = np.cumsum(counts)
+    lines = np.empty((ends[-1] if n_planes else 0, 2, 2))
+    face_index = np.empty(lines.shape[0], dtype=np.int64)
+
+    for p in prange(n_planes):
+        if counts[p] == 0:
+            continue
+        signs = np.empty(3, dtype=np.int8)
+        height = heights[p]
+
+        # Candidate faces of this plane in face order
+        candidates = np.empty(stops[p], dtype=np.int64)
+        n = 0
+        for k in range(stops[p]):
+            if z_max[k] >= height - margin:
+                candidates[n] = order[k]
+                n += 1
+        candidates = np.sort(candidates[:n])
+
+        s = ends[p] - counts[p]
+        for case in range(3):
+            for f in candidates:
+                _face_signs(vertices, faces, f, height, tol, signs)
+                if _segment_case(signs) != case:
+                    continue
+                face_index[s] = f
+                if case == 0:
+                    # The vertex alone on its side starts both cut edges
+                    n_neg = 0
+                    for j in range(3):
+                        if signs[j] < 0:
+                            n_neg += 1
+                    lone = 0
+                    for j in range(3):
+                        if (signs[j] < 0) == (n_neg == 1):
+                            lone = j
+                            break
+                    a = faces[f, lone]
+                    _cut_edge(vertices, a, faces[f, (lone + 1) % 3], height, lines[s, 0])
+                    _cut_edge(vertices, a, faces[f, (lone + 2) % 3], height, lines[s, 1])
+                elif case == 1:
+                    # Keep the vertex on the plane, cut the opposite edge
+                    on = 0
+                    for j in range(3):
+                        if signs[j] == 0:
+                            on = j
+                            break
+                    a = faces[f, (on + 1) % 3] if on == 0 else faces[f, 0]
+                    b = faces[f, 2] if on != 2 else faces[f, 1]
+                    lines[s, 0, 0] = vertices[faces[f, on], 0]
+                    lines[s, 0, 1] = vertices[faces[f, on], 1]
+                    _cut_edge(vertices, a, b, height, lines[s, 1])
+                else:
+                    # Both vertices of the edge lying on the plane
+                    e = 0
+                    for j in range(3):
+                        if signs[j] == 0:
+                            lines[s, e, 0] = vertices[faces[f, j], 0]
+                            lines[s, e, 1] = vertices[faces[f, j], 1]
+                            e += 1
+                s += 1
+
+    return lines, face_index, counts
@@ -9,18 +9,216 @@ Date: December 2024
 BTU Cottbus-Senftenberg
 """
 
+import hashlib
+import io
+import os
 import numpy as np
 from pathlib import Path
 from typing import Tuple, List, Optional, Union
 import warnings
+from functools import lru_cache
+from itertools import product
+from importlib import import_module
+from importlib.util import find_spec
 
-try:
-    import trimesh
-    TRIMESH_AVAILABLE = True
-except ImportError:
-    TRIMESH_AVAILABLE = False
+from ._mesh_kernels import NUMBA_AVAILABLE, place_segments, plane_segments
+
+# trimesh (which pulls in scipy and friends), scikit-image and manifold3d
+# are imported on first use; only their presence is checked here
+TRIMESH_AVAILABLE = find_spec('trimesh') is not None
+if not TRIMESH_AVAILABLE:
     warnings.warn("trimesh not installed. Some geometry features will be limited.")
 
+MANIFOLD_AVAILABLE = find_spec('manifold3d') is not None
+
+# In-process manifold3d booleans when available, trimesh's default otherwise
+BOOLEAN_ENGINE = 'manifold' if MANIFOLD_AVAILABLE else None
+
+
+# Binary STL triangle record: normal, three vertices, attribute byte count
+STL_DTYPE = np.dtype([
+    ('normal', '<f4', (3,)),
+    ('vertices', '<f4', (3, 3)),
+    ('attributes', '<u2'),
+])
+STL_HEADER_SIZE = 80
+_STL_HEADER = b'Two-Photon Lithography binary STL'.ljust(STL_HEADER_SIZE, b' ')
+
+# Opt-in on-disk cache of loaded STL meshes (after vertex merging), keyed
+# on the file contents. Set TPL_STL_CACHE to a directory (e.g.
+# ~/.cache/tpl/stl) to enable it. Only meshes large enough that loading
+# beats parsing are written.
+STL_CACHE_DIR = os.environ.get('TPL_STL_CACHE', '')
+STL_CACHE_MIN_FACES = 10000
+# Bump whenever the loader's output changes so stale files are not reused
+_STL_CACHE_VERSION = 1
+
+
+def _save_npz_atomic(path: Path, **arrays) -> None:
+    """
+    Write arrays to ``path`` as ``.npz`` through a temporary file.
+    
+    Readers never see a partial file. Failures (read-only or full disk)
+    are ignored, since callers only use the file as a cache.
+    """
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(tmp, **arrays)
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def _load_npz(path: Path, *names) -> Optional[tuple]:
+    """
+    Read the arrays ``names`` from an ``.npz`` cache file.
+    
+    Returns None if the file is missing or unusable. Truncated or corrupt
+    files are deleted so the caller rebuilds and rewrites them.
+    """
+    try:
+        with np.load(path) as data:
+            return tuple(data[name] for name in names)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        return None
+
+
+@lru_cache(maxsize=None)
+def _import(name: str):
+    """Import a module on first use; later calls return the cached module."""
+    return import_module(name)
+
+
+def _trimesh():
+    """The trimesh module, imported on first use."""
+    return _import('trimesh')
+
+
+@lru_cache(maxsize=8)
+def _cylinder_template(radius: float, sections: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vertices and faces of a unit-height cylinder along z (cached).
+    
+    The arrays are shared between calls and marked read-only.
+    """
+    cylinder = _trimesh().creation.cylinder(radius=radius, height=1.0, sections=sections)
+    vertices = np.array(cylinder.vertices, dtype=float)
+    faces = np.array(cylinder.faces)
+    vertices.flags.writeable = False
+    faces.flags.writeable = False
+    return vertices, faces
+
+
+def _rodrigues(directions: np.ndarray) -> np.ndarray:
+    """
+    Rotation matrices taking the z-axis onto each unit direction.
+    
+    Uses Rodrigues' formula R = I + K + K² / (1 + cos θ), where K is the
+    cross-product matrix of z × d. Undefined for d = -z.
+    
+    Parameters
+    ----------
+    directions : ndarray
+        N×3 array of unit vectors
+        
+    Returns
+    -------
+    ndarray
+        N×3×3 array of rotation matrices
+    """
+    n = len(directions)
+    
+    # k = z × d and cos θ = z · d
+    kx, ky = -directions[:, 1], directions[:, 0]
+    cos_theta = directions[:, 2]
+    
+    skew = np.zeros((n, 3, 3))
+    skew[:, 0, 2] = ky
+    skew[:, 1, 2] = -kx
+    skew[:, 2, 0] = -ky
+    skew[:, 2, 1] = kx
+    
+    return np.eye(3) + skew + (skew @ skew) / (1.0 + cos_theta)[:, None, None]
+
+
+# Rotations for +x, -x, +y, -y, +z, -z (a cylinder is symmetric along z,
+# so both z directions keep the identity)
+_AXIS_ROTATIONS = np.concatenate([
+    _rodrigues(np.array([[1, 0, 0], [-1, 0, 0], [0, 1, 0], [0, -1, 0]], dtype=float)),
+    np.broadcast_to(np.eye(3), (2, 3, 3)),
+])
+
+
+def _rotations_from_z(directions: np.ndarray) -> np.ndarray:
+    """
+    Rotation matrices taking the z-axis onto each unit direction.
+    
+    Axis-aligned directions (typical for woodpile lattices) take their
+    rotation from a precomputed table; only the remaining directions go
+    through Rodrigues' formula. Directions along ±z get the identity.
+    
+    Parameters
+    ----------
+    directions : ndarray
+        N×3 array of unit vectors
+        
+    Returns
+    -------
+    ndarray
+        N×3×3 array of rotation matrices
+    """
+    n = len(directions)
+    rotations = np.broadcast_to(np.eye(3), (n, 3, 3)).copy()
+    
+    axis = np.argmax(np.abs(directions), axis=1)
+    component = directions[np.arange(n), axis]
+    aligned = np.abs(component) > 1 - 1e-9
+    rotations[aligned] = _AXIS_ROTATIONS[2 * axis[aligned] + (component[aligned] < 0)]
+    
+    general = ~aligned & (np.hypot(directions[:, 0], directions[:, 1]) > 1e-6)
+    rotations[general] = _rodrigues(directions[general])
+    
+    return rotations
+
+
+def _morton_order(points: np.ndarray, bits: int = 8) -> np.ndarray:
+    """
+    Indices sorting points along a z-order (Morton) curve.
+    
+    Coordinates are quantized to ``bits`` per axis over the points' own
+    bounding box and their bits interleaved, so points close in space end
+    up close in the order.
+    
+    Parameters
+    ----------
+    points : ndarray
+        N×3 array of points
+    bits : int
+        Quantization bits per axis
+        
+    Returns
+    -------
+    ndarray
+        Permutation of range(N)
+    """
+    low = points.min(axis=0)
+    span = points.max(axis=0) - low
+    span[span == 0] = 1
+    cells = ((points - low) / span * (2 ** bits - 1)).astype(np.int64)
+    
+    codes = np.zeros(len(points), dtype=np.int64)
+    for bit in range(bits):
+        for axis in range(3):
+            codes |= ((cells[:, axis] >> bit) & 1) << (3 * bit + axis)
+    return np.argsort(codes, kind='stable')
+
 
 class Geometry:
     """
@@ -35,6 +233,10 @@ class Geometry:
         Internal mesh representation
     """
     
+    # Fixed attribute layout; slicing creates one instance per layer
+    __slots__ = ('_mesh', '_derived', '_derived_key', '_section', '_area', 'z_height',
+                 '_dense_vertices')
+    
     def __init__(self, mesh=None):
         """
         Initialize geometry from mesh.
@@ -50,11 +252,53 @@ class Geometry:
         
         self.mesh = mesh
         
+        # Set on the cross-sections returned by slice()
+        self._section = None
+        self._area = None
+        self.z_height = None
+    
+    @property
+    def mesh(self):
+        """Internal trimesh.Trimesh (assigning a new mesh resets cached properties)."""
+        return self._mesh
+    
+    @mesh.setter
+    def mesh(self, mesh):
+        self._mesh = mesh
+        # Derived properties (bounds, volume, counts), see _cache
+        self._derived = {}
+        self._derived_key = None
+        # Set by primitives whose faces reference every vertex, so derived
+        # properties may use the vertex columns directly
+        self._dense_vertices = False
+    
+    @property
+    def _cache(self) -> dict:
+        """
+        Derived-property cache, valid for the current mesh content.
+        
+        Entries are keyed on trimesh's content hash (cheap while the mesh
+        is unchanged), so edits made directly on ``mesh`` also drop stale
+        bounds, volume and counts. The first access adopts the mesh state
+        as is, which lets constructors seed known values.
+        """
+        if self._mesh is not None:
+            key = hash(self._mesh)
+            if key != self._derived_key:
+                if self._derived_key is not None:
+                    self._derived.clear()
+                self._derived_key = key
+        return self._derived
+        
     @classmethod
     def from_stl(cls, filepath: str) -> 'Geometry':
         """
         Load geometry from STL file.
         
+        If STL_CACHE_DIR is set, large meshes are cached there under the
+        hash of the file contents, so reloading the same file skips parsing
+        and vertex merging.
+        
         Parameters
         ----------
         filepath : str
@@ -68,21 +312,69 @@ class Geometry:
         if not TRIMESH_AVAILABLE:
             raise ImportError("trimesh is required. Install with: pip install trimesh")
         
+        # Validate the name before touching the filesystem; the file is
+        # then opened once, and a missing file surfaces from that open
         filepath = Path(filepath)
-        if not filepath.exists():
-            raise FileNotFoundError(f"STL file not found: {filepath}")
-        
-        if filepath.suffix.lower() not in ['.stl', '.STL']:
+        if filepath.suffix.lower() != '.stl':
             raise ValueError(f"File must be STL format, got: {filepath.suffix}")
         
-        mesh = trimesh.load(str(filepath))
+        try:
+            data = filepath.read_bytes()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"STL file not found: {filepath}") from None
+        
+        # Reuse the merged mesh from an earlier load of identical contents
+        cache_path = None
+        if STL_CACHE_DIR:
+            key = hashlib.sha1(data)
+            key.update(repr(_STL_CACHE_VERSION).encode())
+            cache_path = Path(STL_CACHE_DIR) / f"{key.hexdigest()}.npz"
+            cached = _load_npz(cache_path, 'vertices', 'faces', 'face_normals')
+            if cached is not None:
+                vertices, faces, face_normals = cached
+                return cls(_trimesh().Trimesh(vertices=vertices, faces=faces,
+                                              face_normals=face_normals,
+                                              process=False))
+        
+        mesh = cls._load_stl_binary(data)
+        if mesh is None:
+            mesh = _trimesh().load(io.BytesIO(data), file_type='stl')
+        
+        if cache_path is not None and len(mesh.faces) >= STL_CACHE_MIN_FACES:
+            _save_npz_atomic(cache_path, vertices=mesh.vertices, faces=mesh.faces,
+                             face_normals=mesh.face_normals)
         return cls(mesh)
     
+    @staticmethod
+    def _load_stl_binary(data: bytes):
+        """
+        View binary STL contents as triangle records and build the mesh.
+        
+        Returns None when the size does not match the triangle count in the
+        header (ASCII STL), so the caller can fall back to trimesh.
+        """
+        data_start = STL_HEADER_SIZE + 4
+        if len(data) < data_start:
+            return None
+        count = int(np.frombuffer(data, dtype='<u4', count=1, offset=STL_HEADER_SIZE)[0])
+        if count == 0 or len(data) != data_start + count * STL_DTYPE.itemsize:
+            return None
+        triangles = np.frombuffer(data, dtype=STL_DTYPE, offset=data_start)
+        
+        return _trimesh().Trimesh(
+            vertices=triangles['vertices'].reshape(-1, 3),
+            faces=np.arange(3 * len(triangles)).reshape(-1, 3),
+            face_normals=triangles['normal']
+        )
+    
     @classmethod
     def from_primitives(cls, primitives: List['Geometry']) -> 'Geometry':
         """
         Combine multiple primitive geometries.
         
+        The meshes are concatenated in one pass (no boolean union, so
+        overlapping parts stay as separate shells).
+        
         Parameters
         ----------
         primitives : list of Geometry
@@ -99,19 +391,62 @@ class Geometry:
         if not TRIMESH_AVAILABLE:
             raise ImportError("trimesh is required")
         
-        # Extract meshes
+        # Stack all vertex and face arrays in one pass, offsetting each
+        # primitive's face indices by the vertices that precede it
         meshes = [p.mesh for p in primitives]
+        counts = np.array([len(m.vertices) for m in meshes])
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        vertices = np.concatenate([m.vertices for m in meshes])
+        faces = np.concatenate([m.faces + offset for m, offset in zip(meshes, offsets)])
+        
+        combined = cls(_trimesh().Trimesh(vertices=vertices, faces=faces, process=False))
+        combined._dense_vertices = all(p._dense_vertices for p in primitives)
+        return combined
+    
+    @classmethod
+    def union_all(cls, geometries: List['Geometry']) -> 'Geometry':
+        """
+        Boolean union of many geometries.
         
-        # Combine using trimesh
-        combined = trimesh.util.concatenate(meshes)
+        The geometries are sorted along a z-order curve by their bounding
+        box centers and merged pairwise in a balanced tree, so each union
+        combines neighbours in space. Disjoint pairs skip the boolean
+        engine, and no mesh is re-merged more than log2(n) times.
         
-        return cls(combined)
+        Parameters
+        ----------
+        geometries : list of Geometry
+            Geometries to unite
+            
+        Returns
+        -------
+        Geometry
+            Union result
+        """
+        if not geometries:
+            raise ValueError("Cannot unite an empty geometry list")
+        
+        if len(geometries) == 1:
+            return cls(geometries[0].mesh.copy())
+        
+        centers = np.array([np.mean(g.get_bounds(), axis=1) for g in geometries])
+        level = [geometries[i] for i in _morton_order(centers)]
+        while len(level) > 1:
+            merged = [a.union(b) for a, b in zip(level[::2], level[1::2])]
+            if len(level) % 2:
+                merged.append(level[-1])
+            level = merged
+        return level[0]
     
     @classmethod
-    def from_function(cls, func, bounds, resolution=0.5):
+    def from_function(cls, func, bounds, resolution=0.5, block_size=64):
         """
         Create geometry from implicit function.
         
+        The grid is processed in cubic blocks so that only one block of
+        function values is held in memory at a time; neighbouring blocks
+        share their boundary plane and the seams are merged afterwards.
+        
         Parameters
         ----------
         func : callable
@@ -120,6 +455,8 @@ class Geometry:
             ((x_min, x_max), (y_min, y_max), (z_min, z_max))
         resolution : float
             Grid resolution in micrometers
+        block_size : int
+            Number of grid cells per block edge
             
         Returns
         -------
@@ -129,32 +466,65 @@ class Geometry:
         if not TRIMESH_AVAILABLE:
             raise ImportError("trimesh is required")
         
-        # Create grid
+        # Create mesh using marching cubes (requires scikit-image)
+        try:
+            measure = _import('skimage.measure')
+        except ImportError:
+            raise ImportError("scikit-image required for implicit functions. "
+                            "Install with: pip install scikit-image")
+        
+        # Create grid axes
         x = np.arange(bounds[0][0], bounds[0][1], resolution)
         y = np.arange(bounds[1][0], bounds[1][1], resolution)
         z = np.arange(bounds[2][0], bounds[2][1], resolution)
         
-        X, Y, Z = np.meshgrid(x, y, z, indexing='ij')
+        vert_blocks = []
+        face_blocks = []
+        n_verts = 0
         
-        # Evaluate function
-        values = func(X, Y, Z)
+        for i0 in range(0, max(len(x) - 1, 1), block_size):
+            for j0 in range(0, max(len(y) - 1, 1), block_size):
+                for k0 in range(0, max(len(z) - 1, 1), block_size):
+                    # Each block includes the first grid plane of the next
+                    X, Y, Z = np.meshgrid(
+                        x[i0:i0 + block_size + 1],
+                        y[j0:j0 + block_size + 1],
+                        z[k0:k0 + block_size + 1],
+                        indexing='ij'
+                    )
+                    
+                    # Evaluate function; float32 halves the marching cubes input
+                    values = np.asarray(func(X, Y, Z), dtype=np.float32)
+                    
+                    # Skip blocks the surface does not pass through
+                    if min(values.shape) < 2 or values.min() > 0 or values.max() < 0:
+                        continue
+                    
+                    # Normals and values are computed by scikit-image but unused
+                    verts, faces, *_ = measure.marching_cubes(
+                        values, level=0.0, method='lewiner', allow_degenerate=False
+                    )
+                    verts += (i0, j0, k0)
+                    
+                    vert_blocks.append(verts)
+                    face_blocks.append(faces + n_verts)
+                    n_verts += len(verts)
         
-        # Create mesh using marching cubes (requires scikit-image)
-        try:
-            from skimage import measure
-            verts, faces, normals, _ = measure.marching_cubes(values, level=0)
-            
-            # Scale vertices to actual coordinates
-            verts[:, 0] = verts[:, 0] * resolution + bounds[0][0]
-            verts[:, 1] = verts[:, 1] * resolution + bounds[1][0]
-            verts[:, 2] = verts[:, 2] * resolution + bounds[2][0]
-            
-            mesh = trimesh.Trimesh(vertices=verts, faces=faces)
-            return cls(mesh)
-            
-        except ImportError:
-            raise ImportError("scikit-image required for implicit functions. "
-                            "Install with: pip install scikit-image")
+        if not vert_blocks:
+            raise ValueError("Function has no zero level set within bounds")
+        
+        verts = np.concatenate(vert_blocks)
+        faces = np.concatenate(face_blocks)
+        
+        # Scale vertices to actual coordinates in place, in two passes
+        # instead of three per-axis read-modify-writes
+        offsets = np.array([bounds[0][0], bounds[1][0], bounds[2][0]], dtype=verts.dtype)
+        np.multiply(verts, resolution, out=verts)
+        np.add(verts, offsets, out=verts)
+        
+        # Vertices duplicated along block seams are merged here
+        mesh = _trimesh().Trimesh(vertices=verts, faces=faces)
+        return cls(mesh)
     
     @classmethod
     def from_line_segments(cls, segments: List[Tuple], width: float = 0.5):
@@ -176,51 +546,103 @@ class Geometry:
         if not TRIMESH_AVAILABLE:
             raise ImportError("trimesh is required")
         
-        cylinders = []
-        for start, end in segments:
-            # Create cylinder for each line segment
-            start = np.array(start)
-            end = np.array(end)
-            
-            direction = end - start
-            length = np.linalg.norm(direction)
-            
-            if length < 1e-6:
-                continue
-            
-            # Create cylinder along z-axis
-            cyl = trimesh.creation.cylinder(
-                radius=width / 2,
-                height=length,
-                sections=16
-            )
-            
-            # Rotate to align with direction
-            z_axis = np.array([0, 0, 1])
-            direction_norm = direction / length
-            
-            rotation_axis = np.cross(z_axis, direction_norm)
-            rotation_angle = np.arccos(np.dot(z_axis, direction_norm))
-            
-            if np.linalg.norm(rotation_axis) > 1e-6:
-                rotation_axis = rotation_axis / np.linalg.norm(rotation_axis)
-                rotation_matrix = trimesh.transformations.rotation_matrix(
-                    rotation_angle, rotation_axis
-                )
-                cyl.apply_transform(rotation_matrix)
-            
-            # Translate to position
-            center = (start + end) / 2
-            cyl.apply_translation(center)
-            
-            cylinders.append(cyl)
+        segments = np.asarray(segments, dtype=float).reshape(-1, 2, 3)
+        starts, ends = segments[:, 0], segments[:, 1]
         
-        if not cylinders:
+        direction = ends - starts
+        length = np.linalg.norm(direction, axis=1)
+        
+        # Skip degenerate segments
+        valid = length >= 1e-6
+        if not np.any(valid):
             raise ValueError("No valid line segments provided")
         
-        combined = trimesh.util.concatenate(cylinders)
+        direction = direction[valid] / length[valid, None]
+        length = length[valid]
+        centers = (starts[valid] + ends[valid]) / 2
+        
+        # Every segment is the same unit cylinder along z, stretched to its
+        # length, rotated onto its direction and moved to its center
+        template_vertices, template_faces = _cylinder_template(width / 2, 16)
+        
+        if NUMBA_AVAILABLE:
+            vertices = np.empty((len(length), len(template_vertices), 3))
+            place_segments(template_vertices, direction, length, centers, vertices)
+        else:
+            rotations = _rotations_from_z(direction)
+            scaled = template_vertices[None, :, :] * np.column_stack(
+                [np.ones_like(length), np.ones_like(length), length]
+            )[:, None, :]
+            vertices = np.einsum('nij,nvj->nvi', rotations, scaled) + centers[:, None, :]
+        
+        n_vertices = len(template_vertices)
+        faces = template_faces[None, :, :] + (np.arange(len(length)) * n_vertices)[:, None, None]
+        
+        combined = _trimesh().Trimesh(
+            vertices=vertices.reshape(-1, 3),
+            faces=faces.reshape(-1, 3),
+            process=False
+        )
         return cls(combined)
     
+    @classmethod
+    def from_line_segments_fast(cls, endpoints: np.ndarray, width: float = 0.5):
+        """
+        Create a single merged mesh from line segments.
+        
+        With manifold3d installed, each segment becomes a manifold cylinder
+        and all of them are unioned in one batched call in compiled code,
+        giving a watertight lattice without trimesh's boolean round trips.
+        Otherwise this falls back to from_line_segments, whose cylinders
+        overlap but are not merged.
+        
+        Parameters
+        ----------
+        endpoints : ndarray
+            N×2×3 array of segment start and end points
+        width : float
+            Line width in micrometers
+        
+        Returns
+        -------
+        Geometry
+            Geometry created from lines
+        """
+        if not MANIFOLD_AVAILABLE:
+            return cls.from_line_segments(endpoints, width)
+        
+        endpoints = np.asarray(endpoints, dtype=float).reshape(-1, 2, 3)
+        direction = endpoints[:, 1] - endpoints[:, 0]
+        length = np.linalg.norm(direction, axis=1)
+        
+        valid = length >= 1e-6
+        if not np.any(valid):
+            raise ValueError("No valid line segments provided")
+        
+        direction = direction[valid] / length[valid, None]
+        length = length[valid]
+        centers = endpoints[valid].mean(axis=1)
+        
+        # 3×4 affine per segment: rotate, stretch z to length, translate
+        affines = np.empty((len(length), 3, 4))
+        affines[:, :, :3] = _rotations_from_z(direction)
+        affines[:, :, 2] *= length[:, None]
+        affines[:, :, 3] = centers
+        
+        manifold3d = _import('manifold3d')
+        template = manifold3d.Manifold.cylinder(
+            1.0, width / 2, width / 2, 16, True
+        )
+        parts = [template.transform(affine) for affine in affines]
+        merged = manifold3d.Manifold.batch_boolean(parts, manifold3d.OpType.Add)
+        
+        mesh = merged.to_mesh()
+        return cls(_trimesh().Trimesh(
+            vertices=np.asarray(mesh.vert_properties)[:, :3],
+            faces=np.asarray(mesh.tri_verts),
+            process=False
+        ))
+    
     def get_bounds(self) -> Tuple[Tuple[float, float], ...]:
         """
         Get bounding box of geometry.
@@ -233,12 +655,23 @@ class Geometry:
         if self.mesh is None:
             raise ValueError("Geometry is empty")
         
-        bounds = self.mesh.bounds
-        return (
-            (bounds[0, 0], bounds[1, 0]),
-            (bounds[0, 1], bounds[1, 1]),
-            (bounds[0, 2], bounds[1, 2])
-        )
+        if 'bounds' not in self._cache:
+            if self._dense_vertices:
+                # Every vertex is on the surface: reduce the contiguous
+                # x, y, z columns instead of masking referenced vertices
+                columns = self._vertex_columns()
+                bounds = np.stack([columns.min(axis=1), columns.max(axis=1)])
+            else:
+                bounds = self.mesh.bounds
+            if bounds is None:
+                # Mesh without vertices, e.g. an empty intersection
+                bounds = np.zeros((2, 3))
+            self._cache['bounds'] = (
+                (bounds[0, 0], bounds[1, 0]),
+                (bounds[0, 1], bounds[1, 1]),
+                (bounds[0, 2], bounds[1, 2])
+            )
+        return self._cache['bounds']
     
     def get_volume(self) -> float:
         """
@@ -252,7 +685,9 @@ class Geometry:
         if self.mesh is None:
             raise ValueError("Geometry is empty")
         
-        return self.mesh.volume
+        if 'volume' not in self._cache:
+            self._cache['volume'] = self.mesh.volume
+        return self._cache['volume']
     
     def save(self, filepath: str, format: str = None):
         """
@@ -274,12 +709,42 @@ class Geometry:
         if format is None:
             format = filepath.suffix[1:]  # Remove leading dot
         
-        self.mesh.export(str(filepath), file_type=format)
+        if format.lower() == 'stl':
+            self._save_stl_binary(filepath)
+        else:
+            self.mesh.export(str(filepath), file_type=format)
+    
+    def _save_stl_binary(self, filepath: Path):
+        """
+        Save as binary STL.
+        
+        Header, triangle count and records are filled into one buffer and
+        written with a single unbuffered call, without intermediate copies.
+        """
+        n_faces = len(self.mesh.faces)
+        data_start = STL_HEADER_SIZE + 4
+        
+        data = np.zeros(data_start + n_faces * STL_DTYPE.itemsize, dtype=np.uint8)
+        data[:STL_HEADER_SIZE] = np.frombuffer(_STL_HEADER, dtype=np.uint8)
+        data[STL_HEADER_SIZE:data_start].view('<u4')[0] = n_faces
+        triangles = data[data_start:].view(STL_DTYPE)
+        triangles['normal'] = self.mesh.face_normals
+        triangles['vertices'] = self.mesh.triangles
+        
+        with open(filepath, 'wb', buffering=0) as f:
+            f.write(data)
     
     def transform(self, matrix: np.ndarray):
         """
         Apply transformation matrix to geometry.
         
+        Affine matrices are applied without building homogeneous
+        coordinates: pure translations as one add, diagonal (scaling)
+        matrices as an in-place multiply, anything else as one N×3 by 3×3
+        product, and a zero translation is skipped. Reflections reverse
+        the face winding so normals keep pointing outward. Cached bounds
+        are mapped through scalings, axis swaps and translations.
+        
         Parameters
         ----------
         matrix : ndarray
@@ -288,7 +753,46 @@ class Geometry:
         if self.mesh is None:
             raise ValueError("Cannot transform empty geometry")
         
-        self.mesh.apply_transform(matrix)
+        matrix = np.asarray(matrix, dtype=float)
+        if matrix.shape != (4, 4):
+            raise ValueError("Transformation matrix must be 4x4")
+        
+        bounds = None
+        if np.array_equal(matrix[3], (0, 0, 0, 1)):
+            rotation = matrix[:3, :3]
+            if (np.count_nonzero(rotation, axis=1) <= 1).all():
+                # Axes map onto axes: the box corners land exactly on the
+                # new box, so cached bounds carry over in O(8)
+                bounds = self._cache.get('bounds')
+            translation = matrix[:3, 3]
+            diagonal = rotation.diagonal()
+            
+            # Specialized paths give the same values as the full product,
+            # whose zero terms add nothing
+            vertices = self.mesh.vertices
+            if not np.any(rotation - np.diag(diagonal)):
+                if (diagonal != 1).any():
+                    vertices *= diagonal
+                mirrored = np.prod(diagonal) < 0
+            else:
+                vertices = np.dot(vertices, rotation.T)
+                mirrored = np.linalg.det(rotation) < 0
+            if translation.any():
+                vertices += translation
+            
+            if mirrored:
+                self.mesh.faces = np.ascontiguousarray(self.mesh.faces[:, ::-1])
+            if vertices is not self.mesh.vertices:
+                self.mesh.vertices = vertices
+        else:
+            self.mesh.apply_transform(matrix)
+        self._cache.clear()
+        
+        if bounds is not None:
+            corners = np.dot(np.array(list(product(*bounds))), rotation.T)
+            corners += matrix[:3, 3]
+            self._cache['bounds'] = tuple(zip(corners.min(axis=0),
+                                              corners.max(axis=0)))
     
     def scale(self, factor_x: float, factor_y: float, factor_z: float):
         """
@@ -302,14 +806,19 @@ class Geometry:
         if self.mesh is None:
             raise ValueError("Cannot scale empty geometry")
         
-        scale_matrix = np.array([
-            [factor_x, 0, 0, 0],
-            [0, factor_y, 0, 0],
-            [0, 0, factor_z, 0],
-            [0, 0, 0, 1]
-        ])
+        # One in-place broadcast multiply instead of a 4x4 transform
+        factors = np.array([factor_x, factor_y, factor_z], dtype=float)
+        bounds = self._cache.get('bounds')
         
-        self.mesh.apply_transform(scale_matrix)
+        self.mesh.vertices *= factors
+        if np.prod(factors) < 0:
+            # Odd number of mirrored axes: keep normals pointing outward
+            self.mesh.faces = np.ascontiguousarray(self.mesh.faces[:, ::-1])
+        self._cache.clear()
+        
+        if bounds is not None:
+            scaled = np.sort(np.array(bounds) * factors[:, None], axis=1)
+            self._cache['bounds'] = tuple(map(tuple, scaled))
     
     def slice(self, z_positions: List[float]) -> List['Geometry']:
         """
@@ -328,28 +837,229 @@ class Geometry:
         if self.mesh is None:
             raise ValueError("Cannot slice empty geometry")
         
+        heights = np.asarray(z_positions, dtype=float)
+        
+        try:
+            sections = self._sweep_sections(heights)
+        except Exception as e:
+            warnings.warn(f"Failed to slice geometry: {e}")
+            return []
+        
         slices = []
-        for z in z_positions:
-            try:
-                # Get cross-section at this height
-                section = self.mesh.section(
-                    plane_origin=[0, 0, z],
-                    plane_normal=[0, 0, 1]
-                )
-                
-                if section is not None:
-                    # Convert Path2D to 3D mesh for consistency
-                    slice_geom = Geometry()
-                    slice_geom._section = section  # Store 2D section
-                    slice_geom.z_height = z
-                    slices.append(slice_geom)
-                    
-            except Exception as e:
-                warnings.warn(f"Failed to slice at z={z}: {e}")
-                continue
+        for z, section in zip(heights, sections):
+            if section is not None:
+                slice_geom = Geometry()
+                slice_geom._section = section  # Store 2D section
+                slice_geom._area = self._profile_area(z)
+                slice_geom.z_height = z
+                slices.append(slice_geom)
         
         return slices
     
+    def _profile_area(self, z: float) -> Optional[float]:
+        """
+        Closed-form cross-section area at height z, if the shape has one.
+        
+        Primitives whose horizontal sections are one polygon scaled
+        linearly along z (boxes, cylinders, cones) store a
+        ``section_profile`` (z_low, z_high, scale, r_low, r_high); the area
+        is then scale · r(z)². The profile is dropped with the rest of the
+        cache once the mesh changes.
+        """
+        profile = self._cache.get('section_profile')
+        if profile is None:
+            return None
+        z_low, z_high, scale, r_low, r_high = profile
+        t = min(max((z - z_low) / (z_high - z_low), 0.0), 1.0)
+        return float(scale * (r_low + (r_high - r_low) * t) ** 2)
+    
+    def get_area(self) -> float:
+        """
+        Area of a cross-section returned by slice().
+        
+        Uses the sliced primitive's closed form when it has one, and the
+        area of the section polygons otherwise.
+        
+        Returns
+        -------
+        float
+            Section area in μm²
+        """
+        if self._section is None:
+            raise ValueError("Area is only defined for slices")
+        
+        if self._area is None:
+            self._area = float(self._section.area)
+        return self._area
+    
+    def _face_z_ranges(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Per-face z extents, with face indices sorted by their minimum (cached).
+        
+        Returns
+        -------
+        order : ndarray
+            Face indices sorted by minimum z
+        z_min : ndarray
+            Minimum z of each face, in ``order``
+        z_max : ndarray
+            Maximum z of each face, in ``order``
+        """
+        if 'face_z_ranges' not in self._cache:
+            face_z = self.zs[self.mesh.faces]
+            z_min = face_z.min(axis=1)
+            order = np.argsort(z_min, kind='stable')
+            self._cache['face_z_ranges'] = (
+                order, z_min[order], face_z.max(axis=1)[order]
+            )
+        return self._cache['face_z_ranges']
+    
+    def _sweep_sections(self, heights: np.ndarray) -> List:
+        """
+        Horizontal cross-sections at the given heights.
+        
+        All planes are cut in one vectorized pass: each face is paired with
+        the sorted heights its z-range spans, every (face, plane) pair is
+        classified and intersected at once, and the segments are then split
+        per plane. Segments follow trimesh's plane intersector and match
+        ``section_multiplane``.
+        
+        Parameters
+        ----------
+        heights : ndarray
+            Z-heights to section at, in any order
+            
+        Returns
+        -------
+        list
+            Path2D in world x, y (or None) for each height, in input order
+        """
+        from trimesh.exchange.load import load_path
+        
+        lines, face_index, counts = self._plane_segments(heights)
+        
+        sections = [None] * len(heights)
+        ends = np.cumsum(counts)
+        for i in np.flatnonzero(counts):
+            span = slice(ends[i] - counts[i], ends[i])
+            to_3D = np.eye(4)
+            to_3D[2, 3] = heights[i]
+            sections[i] = load_path(
+                lines[span],
+                metadata={'to_3D': to_3D, 'face_index': face_index[span]}
+            )
+        
+        return sections
+    
+    def _plane_segments(self, heights: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Intersection segments of the mesh with horizontal planes.
+        
+        Reproduces ``trimesh.intersections.mesh_plane`` for every plane at
+        once: per plane, faces cut with one vertex apart come first, then
+        faces cut through a vertex, then faces with an edge on the plane,
+        each group in face order.
+        
+        Parameters
+        ----------
+        heights : ndarray
+            Z-heights of the planes
+            
+        Returns
+        -------
+        lines : ndarray
+            S×2×2 segment endpoints in x, y, grouped by plane in input order
+        face_index : ndarray
+            Face of each segment
+        counts : ndarray
+            Number of segments of each plane
+        """
+        from trimesh import tol, util
+        
+        order, z_min, z_max = self._face_z_ranges()
+        faces = self.mesh.faces
+        vertices = self.mesh.vertices
+        
+        if NUMBA_AVAILABLE:
+            return plane_segments(vertices, faces, order, z_min, z_max,
+                                  heights, tol.merge)
+        
+        # Pair each face with the planes its z-range spans; the margin keeps
+        # rounding from dropping a face that the sign test would accept
+        rank = np.argsort(heights, kind='stable')
+        sorted_heights = heights[rank]
+        margin = 2 * tol.merge
+        lo = np.searchsorted(sorted_heights, z_min - margin, side='left')
+        hi = np.searchsorted(sorted_heights, z_max + margin, side='right')
+        spans = np.maximum(hi - lo, 0)
+        pair_face = np.repeat(order, spans)
+        pair_plane = rank[np.repeat(lo - np.cumsum(spans) + spans, spans)
+                          + np.arange(spans.sum())]
+        
+        # Signed vertex distances to each pair's plane, as in mesh_plane
+        pair_faces = faces[pair_face]
+        dots = self.zs[pair_faces] - heights[pair_plane][:, None]
+        signs = np.zeros(dots.shape, dtype=np.int8)
+        signs[dots < -tol.merge] = -1
+        signs[dots > tol.merge] = 1
+        n_neg = (signs < 0).sum(axis=1)
+        n_pos = (signs > 0).sum(axis=1)
+        basic = (n_neg + n_pos == 3) & (n_neg > 0) & (n_pos > 0)
+        on_vertex = (n_neg == 1) & (n_pos == 1)
+        on_edge = (n_neg == 0) & (n_pos == 1)
+        case = np.select([basic, on_vertex, on_edge], [0, 1, 2], default=-1)
+        
+        keep = np.flatnonzero(case >= 0)
+        keep = keep[np.lexsort((pair_face[keep], case[keep], pair_plane[keep]))]
+        pair_faces = pair_faces[keep]
+        signs = signs[keep]
+        case = case[keep]
+        heights_kept = heights[pair_plane[keep]]
+        
+        starts = np.empty((len(keep), 2), dtype=np.int64)
+        stops = np.empty((len(keep), 2), dtype=np.int64)
+        rows = np.arange(len(keep))
+        
+        # One vertex alone on its side: cut both edges leaving it
+        sel = case == 0
+        alone = np.where((signs[sel] < 0).sum(axis=1, keepdims=True) == 1,
+                         signs[sel] < 0, signs[sel] > 0).argmax(axis=1)
+        tri = pair_faces[sel]
+        r = rows[sel][:, None]
+        starts[r, [0, 1]] = tri[np.arange(len(tri)), alone][:, None]
+        stops[r, [0, 1]] = np.column_stack((tri[np.arange(len(tri)), (alone + 1) % 3],
+                                            tri[np.arange(len(tri)), (alone + 2) % 3]))
+        
+        # Vertex on the plane: keep it and cut the opposite edge
+        sel = case == 1
+        tri = pair_faces[sel]
+        on = signs[sel] == 0
+        edge = tri[~on].reshape(-1, 2)
+        r = rows[sel]
+        starts[r, 0] = tri[on]
+        stops[r, 0] = tri[on]
+        starts[r, 1] = edge[:, 0]
+        stops[r, 1] = edge[:, 1]
+        
+        # Edge on the plane: both of its vertices, no cut
+        sel = case == 2
+        edge = pair_faces[sel][signs[sel] == 0].reshape(-1, 2)
+        r = rows[sel]
+        starts[r] = edge
+        stops[r] = edge
+        
+        # Edge-plane intersection with plane_lines' arithmetic
+        origin = vertices[starts]
+        cut = starts != stops
+        p0 = origin[cut]
+        direction = util.unitize(vertices[stops[cut]] - p0)
+        distance = (np.broadcast_to(heights_kept[:, None], cut.shape)[cut]
+                    - p0[:, 2]) / direction[:, 2]
+        origin[cut] = p0 + distance[:, None] * direction
+        
+        counts = np.bincount(pair_plane[keep], minlength=len(heights))
+        return origin[:, :, :2], pair_face[keep], counts
+    
     def union(self, other: 'Geometry') -> 'Geometry':
         """
         Boolean union with another geometry.
@@ -367,7 +1077,11 @@ class Geometry:
         if self.mesh is None or other.mesh is None:
             raise ValueError("Cannot perform union on empty geometry")
         
-        result = self.mesh.union(other.mesh)
+        # Disjoint solids: the union is just both meshes
+        if not self._bounds_overlap(other):
+            return Geometry(_trimesh().util.concatenate([self.mesh, other.mesh]))
+        
+        result = self.mesh.union(other.mesh, engine=BOOLEAN_ENGINE)
         return Geometry(result)
     
     def intersection(self, other: 'Geometry') -> 'Geometry':
@@ -387,7 +1101,13 @@ class Geometry:
         if self.mesh is None or other.mesh is None:
             raise ValueError("Cannot perform intersection on empty geometry")
         
-        result = self.mesh.intersection(other.mesh)
+        # Disjoint solids have an empty intersection
+        if not self._bounds_overlap(other):
+            empty = Geometry(_trimesh().Trimesh())
+            empty._cache['volume'] = 0.0
+            return empty
+        
+        result = self.mesh.intersection(other.mesh, engine=BOOLEAN_ENGINE)
         return Geometry(result)
     
     def difference(self, other: 'Geometry') -> 'Geometry':
@@ -407,22 +1127,72 @@ class Geometry:
         if self.mesh is None or other.mesh is None:
             raise ValueError("Cannot perform difference on empty geometry")
         
-        result = self.mesh.difference(other.mesh)
+        # Nothing to subtract from a disjoint solid
+        if not self._bounds_overlap(other):
+            return Geometry(self.mesh.copy())
+        
+        result = self.mesh.difference(other.mesh, engine=BOOLEAN_ENGINE)
         return Geometry(result)
     
+    def _bounds_overlap(self, other: 'Geometry') -> bool:
+        """
+        Check whether two bounding boxes overlap or touch.
+        
+        Used to skip the boolean engine for solids that are certainly
+        disjoint; touching boxes still go through the engine.
+        """
+        for (a_min, a_max), (b_min, b_max) in zip(self.get_bounds(),
+                                                  other.get_bounds()):
+            if a_max < b_min or b_max < a_min:
+                return False
+        return True
+    
+    def _vertex_columns(self) -> np.ndarray:
+        """
+        Vertex coordinates in structure-of-arrays layout (cached).
+        
+        Returns
+        -------
+        ndarray
+            C-contiguous 3×N array whose rows are the x, y and z columns
+            of the mesh vertices
+        """
+        if 'vertex_columns' not in self._cache:
+            self._cache['vertex_columns'] = np.ascontiguousarray(self.mesh.vertices.T)
+        return self._cache['vertex_columns']
+    
+    @property
+    def xs(self) -> np.ndarray:
+        """Contiguous x coordinates of all vertices (read-only use)."""
+        return self._vertex_columns()[0]
+    
+    @property
+    def ys(self) -> np.ndarray:
+        """Contiguous y coordinates of all vertices (read-only use)."""
+        return self._vertex_columns()[1]
+    
+    @property
+    def zs(self) -> np.ndarray:
+        """Contiguous z coordinates of all vertices (read-only use)."""
+        return self._vertex_columns()[2]
+    
     @property
     def num_vertices(self) -> int:
         """Get number of vertices in mesh."""
         if self.mesh is None:
             return 0
-        return len(self.mesh.vertices)
+        if 'num_vertices' not in self._cache:
+            self._cache['num_vertices'] = len(self.mesh.vertices)
+        return self._cache['num_vertices']
     
     @property
     def num_faces(self) -> int:
         """Get number of faces in mesh."""
         if self.mesh is None:
             return 0
-        return len(self.mesh.faces)
+        if 'num_faces' not in self._cache:
+            self._cache['num_faces'] = len(self.mesh.faces)
+        return self._cache['num_faces']
     
     def __repr__(self) -> str:
         """String representation."""
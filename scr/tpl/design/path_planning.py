@@ -10,12 +10,32 @@ BTU Cottbus-Senftenberg
 """
 
 import numpy as np
+from numpy.lib.recfunctions import structured_to_unstructured
 from pathlib import Path
 from typing import List, Tuple, Optional, Dict, Union
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import io
 import json
+import math
+import multiprocessing
+import os
+import re
+import struct
 import warnings
 
 from .geometry import Geometry
+from .primitives import Cube
+from ._fill_kernels import (
+    NUMBA_AVAILABLE, fill_concentric, fill_rectilinear, fill_spiral,
+    format_fixed_rows, order_strokes, toolpath_stats, two_opt_strokes,
+)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 class PathPlanner:
@@ -38,8 +58,23 @@ class PathPlanner:
         Minimize travel moves between features
     bidirectional_scan : bool
         Scan both forward and backward (faster)
+    n_jobs : int
+        Worker processes for the per-layer concentric and spiral fills
+        when numba is not installed; -1 uses all cores. The compiled and
+        rectilinear fills handle all layers at once and ignore this.
     """
     
+    # Relative tolerance when counting grid lines in a span
+    _LINE_COUNT_RTOL = 1e-9
+    
+    # Points per stroke for travel optimization; spiral layers are a
+    # single polyline and are left as generated
+    _STROKE_POINTS = {'rectilinear': 2, 'concentric': 5}
+    
+    # Fewer layers than this are filled in-process even when n_jobs != 1,
+    # since starting the worker pool would cost more than it saves
+    PARALLEL_MIN_LAYERS = 64
+    
     def __init__(self,
                  layer_height: float = 0.3,
                  hatch_distance: float = 0.5,
@@ -47,7 +82,8 @@ class PathPlanner:
                  power: float = 20,
                  fill_pattern: str = "rectilinear",
                  optimize_travel: bool = True,
-                 bidirectional_scan: bool = True):
+                 bidirectional_scan: bool = True,
+                 n_jobs: int = 1):
         
         # Validation
         if layer_height <= 0:
@@ -58,6 +94,8 @@ class PathPlanner:
             raise ValueError("Scan speed must be positive")
         if power < 0:
             raise ValueError("Power cannot be negative")
+        if n_jobs < 1 and n_jobs != -1:
+            raise ValueError("n_jobs must be positive or -1")
         
         valid_patterns = ['rectilinear', 'concentric', 'spiral']
         if fill_pattern not in valid_patterns:
@@ -70,6 +108,7 @@ class PathPlanner:
         self.fill_pattern = fill_pattern
         self.optimize_travel = optimize_travel
         self.bidirectional_scan = bidirectional_scan
+        self.n_jobs = n_jobs
         
         # First layer settings (can be overridden)
         self.first_layer_power = power
@@ -158,66 +197,83 @@ class PathPlanner:
         bounds = geometry.get_bounds()
         z_min, z_max = bounds[2]
         
-        # Calculate layer positions
-        num_layers = int(np.ceil((z_max - z_min) / self.layer_height))
-        z_positions = np.linspace(z_min, z_max, num_layers)
+        # Calculate layer positions: a fixed layer_height stride from z_min
+        num_layers = math.ceil((z_max - z_min) / self.layer_height)
+        z_positions = z_min + np.arange(num_layers) * self.layer_height
         
         print(f"  Geometry height: {z_max - z_min:.2f} μm")
         print(f"  Number of layers: {num_layers}")
         print(f"  Layer height: {self.layer_height} μm")
         
-        # Slice geometry
-        print(f"  Slicing geometry...")
-        slices = geometry.slice(z_positions)
+        if (self.fill_pattern == 'rectilinear' and isinstance(geometry, Cube)
+                and geometry.is_axis_aligned()):
+            # Every layer of a box has the same rectangular cross-section,
+            # so the hatch can be laid out without slicing the mesh
+            print(f"  Filling axis-aligned box...")
+            slices = None
+            n_layers = self._box_layer_count(bounds, z_positions)
+        else:
+            # Slice geometry
+            print(f"  Slicing geometry...")
+            slices = geometry.slice(z_positions)
+            n_layers = min(len(z_positions), len(slices))
+        
+        # Per-layer parameters (first layer may differ for adhesion)
+        layer_powers = np.full(n_layers, float(self.power))
+        layer_speeds = np.full(n_layers, float(self.scan_speed))
+        layer_powers[:1] = self.first_layer_power
+        layer_speeds[:1] = self.first_layer_speed
         
         # Generate paths for each layer
-        all_points = []
-        all_powers = []
-        all_speeds = []
-        
-        for layer_idx, (z_pos, slice_geom) in enumerate(zip(z_positions, slices)):
-            # Determine parameters for this layer
-            is_first_layer = (layer_idx == 0)
-            
-            if is_first_layer:
-                power = self.first_layer_power
-                speed = self.first_layer_speed
-            else:
-                power = self.power
-                speed = self.scan_speed
-            
-            # Generate fill pattern for this slice
-            layer_points = self._generate_layer_fill(
-                slice_geom, 
-                z_pos, 
-                layer_idx
+        if slices is None:
+            points, counts = self._generate_cube(bounds, z_positions[:n_layers])
+        elif self.fill_pattern == 'rectilinear' and NUMBA_AVAILABLE:
+            points, counts = self._compiled_rectilinear_fill(
+                slices[:n_layers], z_positions[:n_layers]
             )
-            
-            if len(layer_points) > 0:
-                all_points.extend(layer_points)
-                all_powers.extend([power] * len(layer_points))
-                all_speeds.extend([speed] * len(layer_points))
+        elif self.fill_pattern == 'rectilinear':
+            points, counts = self._vectorized_rectilinear_fill(
+                slices[:n_layers], z_positions[:n_layers]
+            )
+        elif NUMBA_AVAILABLE:
+            points, counts = self._compiled_contour_fill(
+                slices[:n_layers], z_positions[:n_layers]
+            )
+        else:
+            layer_chunks = self._fill_layers(
+                [self._layer_extent(s) for s in slices[:n_layers]],
+                z_positions[:n_layers],
+            )
+            counts = np.array([len(c) for c in layer_chunks], dtype=np.int64)
+            if layer_chunks:
+                points = np.concatenate(layer_chunks)
+            else:
+                points = np.empty((0, 3))
+        
+        powers = np.repeat(layer_powers, counts)
+        speeds = np.repeat(layer_speeds, counts)
         
-        print(f"  Total points: {len(all_points)}")
+        print(f"  Total points: {len(points)}")
         
         # Create toolpath
         toolpath = Toolpath(
-            points=np.array(all_points),
-            powers=np.array(all_powers),
-            speeds=np.array(all_speeds),
+            points=points,
+            powers=powers,
+            speeds=speeds,
             num_layers=num_layers
         )
         
         # Optimize if requested
-        if self.optimize_travel:
-            toolpath.optimize()
+        if self.optimize_travel and self.fill_pattern in self._STROKE_POINTS:
+            toolpath.optimize(self._STROKE_POINTS[self.fill_pattern],
+                              allow_reverse=self.bidirectional_scan)
         
         return toolpath
         
     def _generate_layer_fill(self, 
                             slice_geom: Geometry, 
                             z_pos: float,
-                            layer_idx: int) -> List[Tuple[float, float, float]]:
+                            layer_idx: int) -> np.ndarray:
         """
         Generate fill pattern for a single layer.
         
@@ -232,114 +288,369 @@ class PathPlanner:
             
         Returns
         -------
-        list
-            List of (x, y, z) points
+        ndarray
+            N×3 array of (x, y, z) points
         """
-        if not hasattr(slice_geom, '_section') or slice_geom._section is None:
-            return []
-        
-        section = slice_geom._section
+        return self._fill_extent(self._layer_extent(slice_geom), z_pos, layer_idx)
+    
+    def _layer_extent(self, slice_geom: Geometry) -> Optional[Tuple[float, float, float, float]]:
+        """Section extent of a slice, or None when the layer has no section."""
+        section = getattr(slice_geom, '_section', None)
+        if section is None:
+            return None
+        return tuple(float(v) for v in self._section_extent(section))
+    
+    def _fill_extent(self, extent: Optional[Tuple[float, float, float, float]],
+                     z_pos: float, layer_idx: int) -> np.ndarray:
+        """Fill pattern for one layer given its (x_min, y_min, x_max, y_max) extent."""
+        if extent is None:
+            return np.empty((0, 3))
         
         if self.fill_pattern == 'rectilinear':
-            return self._rectilinear_fill(section, z_pos, layer_idx)
+            return self._rectilinear_layer(extent, z_pos, layer_idx)
         elif self.fill_pattern == 'concentric':
-            return self._concentric_fill(section, z_pos)
+            return self._concentric_fill(extent, z_pos)
         elif self.fill_pattern == 'spiral':
-            return self._spiral_fill(section, z_pos)
+            return self._spiral_fill(extent, z_pos)
         else:
             raise ValueError(f"Unknown fill pattern: {self.fill_pattern}")
     
-    def _rectilinear_fill(self, section, z_pos: float, layer_idx: int) -> List:
-        """Generate rectilinear (straight line) fill."""
-        points = []
+    def _fill_layers(self, extents: List[Optional[Tuple[float, float, float, float]]],
+                     z_positions: np.ndarray) -> List[np.ndarray]:
+        """
+        Fill every layer, in worker processes when n_jobs allows.
         
-        # Get bounding box
-        bounds = section.bounds
-        x_min, y_min = bounds[0]
-        x_max, y_max = bounds[1]
+        Only the extents (plain tuples) and this planner are sent to the
+        workers, never the sliced geometry. Workers are not forked from
+        this process directly: forking after numba's threading layer has
+        started can deadlock the children.
         
-        # Alternate scan direction based on layer (for better adhesion)
-        if layer_idx % 2 == 0:
-            # Scan along X
-            y_lines = np.arange(y_min, y_max, self.hatch_distance)
-            for i, y in enumerate(y_lines):
-                if self.bidirectional_scan and i % 2 == 1:
-                    # Scan backward
-                    points.append((x_max, y, z_pos))
-                    points.append((x_min, y, z_pos))
-                else:
-                    # Scan forward
-                    points.append((x_min, y, z_pos))
-                    points.append((x_max, y, z_pos))
+        Returns
+        -------
+        list
+            N×3 point array per layer
+        """
+        n_layers = len(extents)
+        if self.n_jobs == 1 or n_layers < self.PARALLEL_MIN_LAYERS:
+            return [self._fill_extent(extent, z_pos, layer_idx)
+                    for layer_idx, (extent, z_pos) in enumerate(zip(extents, z_positions))]
+        
+        workers = (os.cpu_count() or 1) if self.n_jobs == -1 else self.n_jobs
+        start_method = ('forkserver' if 'forkserver' in multiprocessing.get_all_start_methods()
+                        else 'spawn')
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context(start_method)) as pool:
+            return list(pool.map(
+                self._fill_extent, extents, np.asarray(z_positions).tolist(),
+                range(n_layers), chunksize=max(1, n_layers // (4 * workers)),
+            ))
+    
+    def _compiled_rectilinear_fill(self, slices: List[Geometry],
+                                   z_positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rectilinear fill for all layers using the compiled kernel.
+        
+        Returns
+        -------
+        tuple
+            (N×3 points array, number of points per layer)
+        """
+        n_layers = len(slices)
+        extents, n_lines = self._hatch_layout(slices)
+        layer_indices = np.arange(n_layers)
+        counts = 2 * n_lines
+        
+        offsets = np.zeros(n_layers + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        
+        points = np.empty((offsets[-1], 3), dtype=np.float32)
+        fill_rectilinear(
+            extents,
+            np.asarray(z_positions, dtype=float),
+            layer_indices,
+            offsets,
+            float(self.hatch_distance),
+            bool(self.bidirectional_scan),
+            points
+        )
+        
+        return points, counts
+    
+    def _compiled_contour_fill(self, slices: List[Geometry],
+                               z_positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Concentric or spiral fill for all layers using the compiled kernels.
+        
+        Point counts are worked out first, so every layer is written
+        straight into its slice of one preallocated output array. Produces
+        the same points as calling _generate_layer_fill per layer.
+        
+        Returns
+        -------
+        tuple
+            (N×3 points array, number of points per layer)
+        """
+        extents, has_section = self._section_extents(slices)
+        z_positions = np.asarray(z_positions, dtype=float)
+        hatch = float(self.hatch_distance)
+        offsets = np.zeros(len(slices) + 1, dtype=np.int64)
+        
+        if self.fill_pattern == 'concentric':
+            half_widths = np.minimum(extents[:, 2] - extents[:, 0],
+                                     extents[:, 3] - extents[:, 1]) / 2
+            rings = np.where(has_section, self._line_count(half_widths, hatch), 0)
+            counts = 5 * rings
+            np.cumsum(counts, out=offsets[1:])
+            points = np.empty((offsets[-1], 3), dtype=np.float32)
+            fill_concentric(extents, z_positions, rings, offsets, hatch, points)
         else:
-            # Scan along Y
-            x_lines = np.arange(x_min, x_max, self.hatch_distance)
-            for i, x in enumerate(x_lines):
-                if self.bidirectional_scan and i % 2 == 1:
-                    points.append((x, y_max, z_pos))
-                    points.append((x, y_min, z_pos))
-                else:
-                    points.append((x, y_min, z_pos))
-                    points.append((x, y_max, z_pos))
+            scale = 1 - self._LINE_COUNT_RTOL
+            counts = np.zeros(len(slices), dtype=np.int64)
+            points = np.empty((0, 3), dtype=np.float32)
+            fill_spiral(extents, has_section, z_positions, hatch, scale, False,
+                        counts, offsets, points)
+            np.cumsum(counts, out=offsets[1:])
+            points = np.empty((offsets[-1], 3), dtype=np.float32)
+            fill_spiral(extents, has_section, z_positions, hatch, scale, True,
+                        counts, offsets, points)
+        
+        return points, counts
+    
+    def _vectorized_rectilinear_fill(self, slices: List[Geometry],
+                                     z_positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rectilinear fill for all layers in one set of NumPy operations.
         
-        return points
+        Produces the same points as calling _generate_layer_fill per layer,
+        without a Python loop over layers or hatch lines.
+        
+        Returns
+        -------
+        tuple
+            (N×3 points array, number of points per layer)
+        """
+        n_layers = len(slices)
+        extents, n_lines = self._hatch_layout(slices)
+        
+        # Layer and in-layer index k of every hatch line
+        layer = np.repeat(np.arange(n_layers), n_lines)
+        first_line = np.cumsum(n_lines) - n_lines
+        k = np.arange(len(layer)) - first_line[layer]
+        
+        # Even layers scan along X (lines at constant y), odd along Y
+        x_scan = layer % 2 == 0
+        ext = extents[layer]
+        start = np.where(x_scan, ext[:, 0], ext[:, 1])
+        stop = np.where(x_scan, ext[:, 2], ext[:, 3])
+        line = np.where(x_scan, ext[:, 1], ext[:, 0]) + k * self.hatch_distance
+        
+        if self.bidirectional_scan:
+            # Scan every other line backward (serpentine)
+            backward = k % 2 == 1
+            start, stop = np.where(backward, stop, start), np.where(backward, start, stop)
+        
+        points = np.empty((2 * len(layer), 3))
+        points[0::2, 0] = np.where(x_scan, start, line)
+        points[1::2, 0] = np.where(x_scan, stop, line)
+        points[0::2, 1] = np.where(x_scan, line, start)
+        points[1::2, 1] = np.where(x_scan, line, stop)
+        points[:, 2] = np.repeat(np.asarray(z_positions, dtype=float)[layer], 2)
+        
+        return points, 2 * n_lines
     
-    def _concentric_fill(self, section, z_pos: float) -> List:
-        """Generate concentric fill (follows contour)."""
-        points = []
+    def _hatch_layout(self, slices: List[Geometry]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Section extents and rectilinear hatch line count for each layer.
         
-        # Simplified: use bounding box contours
-        bounds = section.bounds
-        x_min, y_min = bounds[0]
-        x_max, y_max = bounds[1]
-        
-        # Generate concentric rectangles
-        offset = 0
-        while offset < min(x_max - x_min, y_max - y_min) / 2:
-            # Rectangle at this offset
-            x0 = x_min + offset
-            x1 = x_max - offset
-            y0 = y_min + offset
-            y1 = y_max - offset
-            
-            # Draw rectangle
-            points.extend([
-                (x0, y0, z_pos),
-                (x1, y0, z_pos),
-                (x1, y1, z_pos),
-                (x0, y1, z_pos),
-                (x0, y0, z_pos),  # Close loop
-            ])
+        Returns
+        -------
+        tuple
+            (L×4 array of (x_min, y_min, x_max, y_max), lines per layer);
+            layers without a section get no lines
+        """
+        n_layers = len(slices)
+        extents, has_section = self._section_extents(slices)
+        
+        spans = np.where(
+            np.arange(n_layers) % 2 == 0,
+            extents[:, 3] - extents[:, 1],
+            extents[:, 2] - extents[:, 0]
+        )
+        n_lines = self._line_count(spans, self.hatch_distance)
+        return extents, np.where(has_section, n_lines, 0)
+    
+    def _section_extents(self, slices: List[Geometry]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Section extent of each layer.
+        
+        Returns
+        -------
+        tuple
+            (L×4 array of (x_min, y_min, x_max, y_max), bool mask of the
+            layers that have a section; other rows are zero)
+        """
+        extents = np.zeros((len(slices), 4))
+        has_section = np.zeros(len(slices), dtype=bool)
+        
+        for i, slice_geom in enumerate(slices):
+            section = getattr(slice_geom, '_section', None)
+            if section is not None:
+                extents[i] = self._section_extent(section)
+                has_section[i] = True
+        
+        return extents, has_section
+    
+    @classmethod
+    def _line_count(cls, span, step):
+        """
+        Number of grid lines ``k * step`` (k = 0, 1, ...) strictly below ``span``.
+        
+        Counted from the integer ratio with a small relative tolerance, so
+        a span that is a multiple of the step up to rounding (e.g. 1.0 with
+        step 0.1) gets no extra line, unlike float-step ``np.arange``.
+        Works elementwise on arrays.
+        """
+        n = np.ceil(np.asarray(span, dtype=float) / step * (1 - cls._LINE_COUNT_RTOL))
+        return n.clip(min=0).astype(np.int64)
+    
+    @classmethod
+    def _axis_lines(cls, start: float, stop: float, step: float) -> np.ndarray:
+        """Grid ``start + k * step`` up to (excluding) ``stop``; step may be negative."""
+        return start + np.arange(cls._line_count((stop - start) / step, 1.0)) * step
+    
+    @staticmethod
+    def _box_layer_count(bounds, z_positions: np.ndarray) -> int:
+        """
+        Number of layers that intersect an axis-aligned box.
+        
+        A slicing plane coplanar with the top face yields no section, so
+        (matching Geometry.slice) only layers below the top face count.
+        """
+        z_max = bounds[2][1]
+        return int(np.count_nonzero(np.asarray(z_positions) < z_max))
+    
+    def _generate_cube(self, bounds,
+                       z_positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rectilinear fill for an axis-aligned box.
+        
+        Only the two hatch patterns (X-scan and Y-scan) are generated;
+        layers repeat them with their own z-height.
+        
+        Parameters
+        ----------
+        bounds : tuple
+            ((x_min, x_max), (y_min, y_max), (z_min, z_max)) of the box
+        z_positions : ndarray
+            Z-height of each layer
             
-            offset += self.hatch_distance
+        Returns
+        -------
+        tuple
+            (N×3 points array, number of points per layer)
+        """
+        (x_min, x_max), (y_min, y_max), _ = bounds
+        extent = (x_min, y_min, x_max, y_max)
+        
+        # Hatch pattern for even (X-scan) and odd (Y-scan) layers
+        patterns = [self._rectilinear_layer(extent, 0.0, parity) for parity in (0, 1)]
+        n_layers = len(z_positions)
+        
+        counts = np.array([len(patterns[i % 2]) for i in range(n_layers)], dtype=np.int64)
+        if n_layers == 0:
+            return np.empty((0, 3)), counts
+        
+        points = np.concatenate([patterns[i % 2] for i in range(n_layers)])
+        points[:, 2] = np.repeat(z_positions, counts)
+        
+        return points, counts
+    
+    @staticmethod
+    def _section_extent(section) -> Tuple[float, float, float, float]:
+        """Return (x_min, y_min, x_max, y_max) of a 2D or 3D section."""
+        bounds = np.asarray(section.bounds)
+        return bounds[0, 0], bounds[0, 1], bounds[1, 0], bounds[1, 1]
+    
+    def _rectilinear_layer(self, extent: Tuple[float, float, float, float],
+                           z_pos: float, layer_idx: int) -> np.ndarray:
+        """Rectilinear hatch over an (x_min, y_min, x_max, y_max) rectangle."""
+        x_min, y_min, x_max, y_max = extent
+        
+        # Alternate scan direction based on layer (for better adhesion)
+        if layer_idx % 2 == 0:
+            # Scan along X: hatch lines at constant y
+            lines = self._axis_lines(y_min, y_max, self.hatch_distance)
+            start, stop = x_min, x_max
+            scan_axis, line_axis = 0, 1
+        else:
+            # Scan along Y: hatch lines at constant x
+            lines = self._axis_lines(x_min, x_max, self.hatch_distance)
+            start, stop = y_min, y_max
+            scan_axis, line_axis = 1, 0
+        
+        # Each line contributes a (start, stop) pair of endpoints
+        ends = np.tile([start, stop], (len(lines), 1))
+        if self.bidirectional_scan:
+            # Scan every other line backward (serpentine)
+            ends[1::2] = ends[1::2, ::-1]
+        
+        points = np.empty((2 * len(lines), 3))
+        points[:, scan_axis] = ends.ravel()
+        points[:, line_axis] = np.repeat(lines, 2)
+        points[:, 2] = z_pos
         
         return points
     
-    def _spiral_fill(self, section, z_pos: float) -> List:
-        """Generate spiral fill."""
-        points = []
+    def _concentric_fill(self, extent: Tuple[float, float, float, float],
+                         z_pos: float) -> np.ndarray:
+        """Generate concentric fill (follows contour) as an N×3 array."""
+        # Simplified: use bounding box contours
+        x_min, y_min, x_max, y_max = extent
+        
+        # Concentric rectangles, one per offset
+        half_width = min(x_max - x_min, y_max - y_min) / 2
+        offsets = self._axis_lines(0.0, half_width, self.hatch_distance)
+        x0 = x_min + offsets
+        x1 = x_max - offsets
+        y0 = y_min + offsets
+        y1 = y_max - offsets
+        
+        # Corners of each rectangle, back to the first to close the loop;
+        # broadcast straight into the output without stacking temporaries
+        points = np.empty((len(offsets), 5, 3))
+        points[:, [0, 3, 4], 0] = x0[:, None]
+        points[:, [1, 2], 0] = x1[:, None]
+        points[:, [0, 1, 4], 1] = y0[:, None]
+        points[:, [2, 3], 1] = y1[:, None]
+        points[:, :, 2] = z_pos
+        
+        return points.reshape(-1, 3)
+    
+    def _spiral_fill(self, extent: Tuple[float, float, float, float],
+                     z_pos: float) -> np.ndarray:
+        """Generate spiral fill as an N×3 array."""
+        rings = []
         
-        bounds = section.bounds
-        x_min, y_min = bounds[0]
-        x_max, y_max = bounds[1]
+        x_min, y_min, x_max, y_max = extent
         
         # Spiral from outside to inside
         x0, x1 = x_min, x_max
         y0, y1 = y_min, y_max
         
         while x0 < x1 and y0 < y1:
-            # Right
-            for x in np.arange(x0, x1, self.hatch_distance):
-                points.append((x, y0, z_pos))
-            # Down
-            for y in np.arange(y0, y1, self.hatch_distance):
-                points.append((x1, y, z_pos))
-            # Left
-            for x in np.arange(x1, x0, -self.hatch_distance):
-                points.append((x, y1, z_pos))
-            # Up
-            for y in np.arange(y1, y0, -self.hatch_distance):
-                points.append((x0, y, z_pos))
+            # Right, down, left, up: one coordinate steps, the other is fixed
+            right = self._axis_lines(x0, x1, self.hatch_distance)
+            down = self._axis_lines(y0, y1, self.hatch_distance)
+            left = self._axis_lines(x1, x0, -self.hatch_distance)
+            up = self._axis_lines(y1, y0, -self.hatch_distance)
+            
+            ring = np.empty((len(right) + len(down) + len(left) + len(up), 3))
+            ring[:, 0] = np.concatenate([right, np.full(len(down), x1),
+                                         left, np.full(len(up), x0)])
+            ring[:, 1] = np.concatenate([np.full(len(right), y0), down,
+                                         np.full(len(left), y1), up])
+            ring[:, 2] = z_pos
+            rings.append(ring)
             
             # Move inward
             x0 += self.hatch_distance
@@ -347,77 +658,258 @@ class PathPlanner:
             x1 -= self.hatch_distance
             y1 -= self.hatch_distance
         
-        return points
+        if not rings:
+            return np.empty((0, 3))
+        return np.concatenate(rings)
 
 
 class Toolpath:
     """
     Container for fabrication toolpath.
     
+    Coordinates are stored per axis (structure of arrays) so passes that
+    only read some fields don't pull the others through the cache.
+    
     Attributes
     ----------
     points : ndarray
-        Array of (x, y, z) positions in micrometers
+        N×3 view of the (x, y, z) positions in micrometers
     powers : ndarray
         Laser power at each point in mW
     speeds : ndarray
         Scan speed at each point in μm/s
     num_layers : int
         Number of layers in toolpath
+    dtype : numpy.dtype
+        Storage dtype of points, powers and speeds (float32 by default)
     """
     
+    # G-code move format: X, Y, Z in μm, F speed in μm/s, P power in mW
+    GCODE_LINE = "G1 X%.4f Y%.4f Z%.4f F%.0f P%.2f\n"
+    CSV_LINE = "%.4f,%.4f,%.4f,%.2f,%.0f\n"
+    
+    # Parsing: moves exactly as written by GCODE_LINE, any G1 line, and
+    # single words of a G1 line in arbitrary order
+    _GCODE_MOVE = re.compile(
+        r"^[ \t]*G1 X([-+.\deE]+) Y([-+.\deE]+) Z([-+.\deE]+) "
+        r"F([-+.\deE]+) P([-+.\deE]+)",
+        re.MULTILINE,
+    )
+    _GCODE_G1 = re.compile(r"^[ \t]*G1.*$", re.MULTILINE)
+    _GCODE_WORD = re.compile(r"(?<!\S)([XYZFP])([-+]?[.\d]+(?:[eE][-+]?\d+)?)")
+    _GCODE_LAYERS = re.compile(r"^[ \t]*; Layers:\s*(\d+)", re.MULTILINE)
+    
+    # Fields the compiled text writer can format (%.Nf)
+    _FIXED_FIELD = re.compile(r"%\.(\d+)f")
+    
+    # Points formatted per block when writing text formats
+    GCODE_CHUNK_ROWS = 65536
+    
+    # Text exports with at least this many points format blocks in worker
+    # threads while the calling thread writes finished ones; at most
+    # WRITE_QUEUE_BLOCKS formatted blocks are held in memory
+    THREADED_WRITE_MIN_POINTS = 100000
+    WRITE_QUEUE_BLOCKS = 4
+    
+    # Layers with more strokes than this are ordered with a KD-tree
+    # instead of the quadratic compiled scan
+    NN_DENSE_MAX_STROKES = 20000
+    
+    # Hilbert ordering: grid resolution (bits per axis) and the 2-opt
+    # refinement window (strokes) and pass limit
+    HILBERT_BITS = 16
+    TWO_OPT_WINDOW = 32
+    TWO_OPT_MAX_PASSES = 8
+    
+    # Largest coordinate magnitude (μm) accepted in float32 storage; float32
+    # spacing reaches 1 μm at 1.6e7, so beyond this use dtype=np.float64
+    FLOAT32_MAX_COORD = 1e7
+    
+    # Binary toolpath (.tpb) header: magic, version, point count, layer count
+    BINARY_MAGIC = b"TPLB"
+    BINARY_VERSION = 1
+    _BINARY_HEADER = struct.Struct("<4sHxxQI")
+    
     def __init__(self,
                  points: np.ndarray,
                  powers: np.ndarray,
                  speeds: np.ndarray,
-                 num_layers: int):
+                 num_layers: int,
+                 dtype=np.float32):
+        
+        # float32 keeps sub-nm precision over the stage range at half the size
+        self.dtype = np.dtype(dtype)
+        
+        # Bumped whenever points, powers or speeds are replaced; derived
+        # results such as get_statistics are cached against it
+        self._revision = 0
+        self._stats_cache = None
+        self._stats_key = None
+        self._segments_plot = None
+        self._segments_plot_key = None
+        self._records = None
+        self._records_key = None
         
         self.points = points
         self.powers = powers
         self.speeds = speeds
         self.num_layers = num_layers
+    
+    @classmethod
+    def from_axes(cls,
+                  x: np.ndarray,
+                  y: np.ndarray,
+                  z: np.ndarray,
+                  powers: np.ndarray,
+                  speeds: np.ndarray,
+                  num_layers: int,
+                  dtype=np.float32) -> 'Toolpath':
+        """
+        Create a toolpath from separate x, y and z arrays.
+        
+        The axes are copied straight into the per-axis storage, without
+        interleaving them into an N×3 array first.
+        
+        Parameters
+        ----------
+        x, y, z : ndarray
+            Coordinates along each axis in micrometers
+        powers : ndarray
+            Laser power at each point in mW
+        speeds : ndarray
+            Scan speed at each point in μm/s
+        num_layers : int
+            Number of layers in toolpath
+        dtype : data-type, optional
+            Storage dtype (default float32)
+            
+        Returns
+        -------
+        Toolpath
+            New toolpath
+        """
+        # Transposed view of the stacked axes; the points setter keeps it
+        # without another copy
+        xyz = np.stack([np.asarray(x), np.asarray(y), np.asarray(z)]).astype(dtype, copy=False)
+        return cls(xyz.T, powers, speeds, num_layers, dtype=dtype)
+        
+    @property
+    def points(self) -> np.ndarray:
+        """N×3 view of the per-axis coordinate arrays (no copy)."""
+        return self._xyz.T
+    
+    @points.setter
+    def points(self, points: np.ndarray):
+        points = np.asarray(points).reshape(-1, 3)
+        if (self.dtype == np.float32 and points.size
+                and np.abs(points).max() > self.FLOAT32_MAX_COORD):
+            raise ValueError(
+                f"Coordinates exceed {self.FLOAT32_MAX_COORD:g} um, beyond "
+                f"float32 precision; use dtype=np.float64"
+            )
+        points = points.astype(self.dtype, copy=False)
+        self._xyz = np.ascontiguousarray(points.T)
+        self._x, self._y, self._z = self._xyz
+        self._revision += 1
+        
+        # Segment lengths are derived from the coordinates; computed lazily
+        self._segments = None
+        
+        # Cached level-of-detail ordering (see lod_permutation)
+        self._lod_perm = None
+        self._lod_depth = None
+    
+    @property
+    def powers(self) -> np.ndarray:
+        """Laser power at each point in mW."""
+        return self._powers
+    
+    @powers.setter
+    def powers(self, powers: np.ndarray):
+        self._powers = np.asarray(powers, dtype=self.dtype)
+        self._revision += 1
+    
+    @property
+    def speeds(self) -> np.ndarray:
+        """Scan speed at each point in μm/s."""
+        return self._speeds
+    
+    @speeds.setter
+    def speeds(self, speeds: np.ndarray):
+        self._speeds = np.asarray(speeds, dtype=self.dtype)
+        self._revision += 1
         
     @property
     def num_points(self) -> int:
         """Number of points in toolpath."""
-        return len(self.points)
+        return len(self._x)
+    
+    def _segment_lengths(self) -> np.ndarray:
+        """Length of each segment between consecutive points (cached)."""
+        if self._segments is None:
+            deltas = np.diff(self._xyz, axis=1)
+            # Row-wise dot product without materializing the squared deltas
+            self._segments = np.sqrt(np.einsum('ij,ij->j', deltas, deltas))
+        return self._segments
     
     @property
     def total_length(self) -> float:
         """Total path length in micrometers."""
-        if len(self.points) < 2:
+        if self.num_points < 2:
             return 0.0
         
-        # Calculate distances between consecutive points
-        deltas = np.diff(self.points, axis=0)
-        distances = np.sqrt(np.sum(deltas**2, axis=1))
-        return np.sum(distances)
+        return float(self._segment_lengths().sum())
     
     @property
     def time_estimate(self) -> float:
         """Estimated fabrication time in seconds."""
-        if len(self.points) < 2:
+        if self.num_points < 2:
             return 0.0
         
-        # Calculate time for each segment
-        deltas = np.diff(self.points, axis=0)
-        distances = np.sqrt(np.sum(deltas**2, axis=1))
-        
-        # Time = distance / speed (use average speed for segment)
-        avg_speeds = (self.speeds[:-1] + self.speeds[1:]) / 2
-        times = distances / avg_speeds
-        
-        return np.sum(times)
+        # Time = distance / speed (use average speed for segment), summed
+        # pairwise in float64 so float32 storage doesn't lose accuracy
+        speed_sums = self.speeds[:-1] + self.speeds[1:]
+        times = self._segment_lengths() / speed_sums
+        return 2.0 * float(times.sum(dtype=np.float64))
     
     def get_statistics(self) -> Dict:
         """
         Get toolpath statistics.
         
+        The result is computed once and reused until points, powers or
+        speeds are replaced (in-place edits of those arrays are not
+        tracked).
+        
         Returns
         -------
         dict
             Dictionary with statistics
         """
+        key = (self._revision, self.num_layers)
+        if self._stats_cache is None or self._stats_key != key:
+            self._stats_cache = self._compute_statistics()
+            self._stats_key = key
+        return dict(self._stats_cache)
+    
+    def _compute_statistics(self) -> Dict:
+        """Compute the statistics returned by get_statistics."""
+        if NUMBA_AVAILABLE and self.num_points > 0:
+            # All reductions fused into a single compiled pass
+            (length, time, min_power, max_power, sum_power,
+             min_speed, max_speed) = toolpath_stats(
+                self._x, self._y, self._z, self.powers, self.speeds)
+            return {
+                'num_points': self.num_points,
+                'num_layers': self.num_layers,
+                'total_length': length,
+                'time_estimate': time,
+                'min_power': min_power,
+                'max_power': max_power,
+                'avg_power': sum_power / self.num_points,
+                'min_speed': min_speed,
+                'max_speed': max_speed,
+            }
+        
         return {
             'num_points': self.num_points,
             'num_layers': self.num_layers,
@@ -430,16 +922,37 @@ class Toolpath:
             'max_speed': np.max(self.speeds),
         }
     
-    def get_coordinates(self) -> np.ndarray:
+    def get_coordinates(self, dtype=None) -> np.ndarray:
         """
         Get coordinate array.
         
+        Parameters
+        ----------
+        dtype : data-type, optional
+            Coordinate dtype (e.g. np.float64). Defaults to the storage
+            dtype.
+        
         Returns
         -------
         ndarray
-            N×3 array of (x, y, z) coordinates
+            N×3 array of (x, y, z) coordinates in micrometers, assembled
+            from the per-axis arrays on demand
         """
-        return self.points
+        coords = np.column_stack((self._x, self._y, self._z))
+        if dtype is None:
+            return coords
+        return coords.astype(dtype, copy=False)
+    
+    def get_coordinates_nm(self) -> np.ndarray:
+        """
+        Get coordinates as integer nanometers.
+        
+        Returns
+        -------
+        ndarray
+            N×3 int32 array of (x, y, z) coordinates in nanometers
+        """
+        return np.rint(self.get_coordinates(np.float64) * 1000).astype(np.int32)
     
     def get_local_doses(self) -> np.ndarray:
         """
@@ -463,7 +976,7 @@ class Toolpath:
         filepath : str
             Output file path
         format : str, optional
-            File format ('gcode' or 'json')
+            File format ('gcode', 'json' or 'tpb')
         """
         filepath = Path(filepath)
         filepath.parent.mkdir(parents=True, exist_ok=True)
@@ -475,56 +988,135 @@ class Toolpath:
             self._save_gcode(filepath)
         elif format == 'json':
             self._save_json(filepath)
+        elif format == 'tpb':
+            self.save_binary(filepath)
         else:
             raise ValueError(f"Unsupported format: {format}")
     
     def _save_gcode(self, filepath: Path):
         """Save as G-code format."""
-        with open(filepath, 'w') as f:
-            # Header
-            f.write("; Two-Photon Lithography Toolpath\n")
-            f.write(f"; Points: {self.num_points}\n")
-            f.write(f"; Layers: {self.num_layers}\n")
-            f.write(f"; Total length: {self.total_length:.2f} um\n")
-            f.write(f"; Estimated time: {self.time_estimate:.1f} s\n")
-            f.write("\n")
-            
+        # Header
+        header = (
+            "; Two-Photon Lithography Toolpath\n"
+            f"; Points: {self.num_points}\n"
+            f"; Layers: {self.num_layers}\n"
+            f"; Total length: {self.total_length:.2f} um\n"
+            f"; Estimated time: {self.time_estimate:.1f} s\n"
+            "\n"
             # Initialize
-            f.write("G21 ; Set units to micrometers\n")
-            f.write("G90 ; Absolute positioning\n")
-            f.write("\n")
-            
-            # Write points
-            for i, (point, power, speed) in enumerate(zip(self.points, self.powers, self.speeds)):
-                x, y, z = point
-                f.write(f"G1 X{x:.4f} Y{y:.4f} Z{z:.4f} F{speed:.0f} P{power:.2f}\n")
+            "G21 ; Set units to micrometers\n"
+            "G90 ; Absolute positioning\n"
+            "\n"
+        )
+        
+        with open(filepath, 'w', buffering=1 << 20) as f:
+            f.write(header)
+            self._write_rows(f, self.GCODE_LINE, ['x', 'y', 'z', 'speed', 'power'])
             
             # Footer
             f.write("\n; End of toolpath\n")
     
     def _save_json(self, filepath: Path):
-        """Save as JSON format."""
-        data = {
-            'metadata': {
-                'num_points': self.num_points,
-                'num_layers': self.num_layers,
-                'total_length': float(self.total_length),
-                'time_estimate': float(self.time_estimate),
-            },
-            'toolpath': [
-                {
-                    'x': float(p[0]),
-                    'y': float(p[1]),
-                    'z': float(p[2]),
-                    'power': float(power),
-                    'speed': float(speed),
-                }
-                for p, power, speed in zip(self.points, self.powers, self.speeds)
-            ]
+        """
+        Save as JSON format.
+        
+        The toolpath is stored column-wise (one array per field) rather
+        than as one object per point. orjson, when installed, serializes
+        the NumPy arrays directly.
+        """
+        metadata = {
+            'num_points': self.num_points,
+            'num_layers': self.num_layers,
+            'total_length': float(self.total_length),
+            'time_estimate': float(self.time_estimate),
+        }
+        columns = {
+            'x': self._x,
+            'y': self._y,
+            'z': self._z,
+            'power': np.ascontiguousarray(self.powers),
+            'speed': np.ascontiguousarray(self.speeds),
         }
         
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        if ORJSON_AVAILABLE:
+            data = {'metadata': metadata, 'toolpath': columns}
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            data = {
+                'metadata': metadata,
+                'toolpath': {key: column.tolist() for key, column in columns.items()},
+            }
+            with open(filepath, 'w') as f:
+                json.dump(data, f)
+    
+    def save_binary(self, filepath: str):
+        """
+        Save toolpath in compact binary format (.tpb).
+        
+        The file holds a fixed header followed by little-endian float32
+        coordinates (N×3), powers (N) and speeds (N) - 20 bytes per point.
+        
+        Parameters
+        ----------
+        filepath : str
+            Output file path
+        """
+        filepath = Path(filepath)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        
+        header = self._BINARY_HEADER.pack(
+            self.BINARY_MAGIC, self.BINARY_VERSION, self.num_points, self.num_layers
+        )
+        
+        with open(filepath, 'wb') as f:
+            f.write(header)
+            self.get_coordinates(np.dtype('<f4')).tofile(f)
+            np.asarray(self.powers, dtype='<f4').tofile(f)
+            np.asarray(self.speeds, dtype='<f4').tofile(f)
+    
+    @classmethod
+    def load_binary(cls, filepath: str) -> 'Toolpath':
+        """
+        Load toolpath saved with save_binary.
+        
+        Parameters
+        ----------
+        filepath : str
+            Input file path
+            
+        Returns
+        -------
+        Toolpath
+            Loaded toolpath
+        """
+        filepath = Path(filepath)
+        
+        if not filepath.exists():
+            raise FileNotFoundError(f"Toolpath file not found: {filepath}")
+        
+        with open(filepath, 'rb') as f:
+            header = f.read(cls._BINARY_HEADER.size)
+            if len(header) < cls._BINARY_HEADER.size:
+                raise ValueError(f"Truncated binary toolpath: {filepath}")
+            
+            magic, version, n, num_layers = cls._BINARY_HEADER.unpack(header)
+            if magic != cls.BINARY_MAGIC:
+                raise ValueError(f"Not a binary toolpath file: {filepath}")
+            if version != cls.BINARY_VERSION:
+                raise ValueError(f"Unsupported binary toolpath version: {version}")
+            
+            data = np.fromfile(f, dtype='<f4', count=5 * n)
+        
+        if len(data) != 5 * n:
+            raise ValueError(f"Truncated binary toolpath: {filepath}")
+        
+        return cls(
+            points=data[:3 * n].reshape(n, 3),
+            powers=data[3 * n:4 * n],
+            speeds=data[4 * n:],
+            num_layers=num_layers
+        )
     
     @classmethod
     def load(cls, filepath: str) -> 'Toolpath':
@@ -552,71 +1144,67 @@ class Toolpath:
             return cls._load_gcode(filepath)
         elif format == 'json':
             return cls._load_json(filepath)
+        elif format == 'tpb':
+            return cls.load_binary(filepath)
         else:
             raise ValueError(f"Unsupported format: {format}")
     
     @classmethod
     def _load_gcode(cls, filepath: Path) -> 'Toolpath':
-        """Load from G-code format."""
-        points = []
-        powers = []
-        speeds = []
-        num_layers = 1
-        
-        with open(filepath, 'r') as f:
-            for line in f:
-                line = line.strip()
-                
-                if line.startswith('; Layers:'):
-                    num_layers = int(line.split(':')[1].strip())
-                
-                if line.startswith('G1'):
-                    # Parse G-code line
-                    parts = line.split()
-                    x = y = z = power = speed = 0
-                    
-                    for part in parts[1:]:
-                        if part.startswith('X'):
-                            x = float(part[1:])
-                        elif part.startswith('Y'):
-                            y = float(part[1:])
-                        elif part.startswith('Z'):
-                            z = float(part[1:])
-                        elif part.startswith('P'):
-                            power = float(part[1:])
-                        elif part.startswith('F'):
-                            speed = float(part[1:])
-                    
-                    points.append([x, y, z])
-                    powers.append(power)
-                    speeds.append(speed)
+        """
+        Load from G-code format.
         
-        return cls(
-            points=np.array(points),
-            powers=np.array(powers),
-            speeds=np.array(speeds),
-            num_layers=num_layers
+        Files in the layout written by `save` are parsed in a single
+        `np.fromregex` pass. If any G1 line deviates from that layout
+        (reordered or missing words), every G1 line is parsed word by word
+        instead, with missing words read as 0.
+        """
+        text = filepath.read_text()
+        
+        match = cls._GCODE_LAYERS.search(text)
+        num_layers = int(match.group(1)) if match else 1
+        
+        moves = np.fromregex(
+            io.StringIO(text), cls._GCODE_MOVE,
+            dtype=[('x', 'f8'), ('y', 'f8'), ('z', 'f8'), ('f', 'f8'), ('p', 'f8')],
         )
+        lines = cls._GCODE_G1.findall(text)
+        
+        if len(moves) == len(lines):
+            x, y, z = moves['x'], moves['y'], moves['z']
+            powers = moves['p']
+            speeds = moves['f']
+        else:
+            values = np.zeros((5, len(lines)))
+            rows = {'X': 0, 'Y': 1, 'Z': 2, 'P': 3, 'F': 4}
+            for i, line in enumerate(lines):
+                for word, value in cls._GCODE_WORD.findall(line.split(';', 1)[0]):
+                    values[rows[word], i] = float(value)
+            x, y, z, powers, speeds = values
+        
+        return cls.from_axes(x, y, z, powers, speeds, num_layers)
     
     @classmethod
     def _load_json(cls, filepath: Path) -> 'Toolpath':
-        """Load from JSON format."""
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-        
-        points = []
-        powers = []
-        speeds = []
-        
-        for point in data['toolpath']:
-            points.append([point['x'], point['y'], point['z']])
-            powers.append(point['power'])
-            speeds.append(point['speed'])
-        
-        return cls(
-            points=np.array(points),
-            powers=np.array(powers),
-            speeds=np.array(speeds),
+        """Load from JSON format (column-wise, or the older per-point list)."""
+        if ORJSON_AVAILABLE:
+            data = orjson.loads(filepath.read_bytes())
+        else:
+            with open(filepath, 'r') as f:
+                data = json.load(f)
+        
+        toolpath = data['toolpath']
+        if isinstance(toolpath, list):
+            # One object per point
+            toolpath = {
+                key: [point[key] for point in toolpath]
+                for key in ('x', 'y', 'z', 'power', 'speed')
+            }
+        
+        return cls.from_axes(
+            toolpath['x'], toolpath['y'], toolpath['z'],
+            powers=toolpath['power'],
+            speeds=toolpath['speed'],
             num_layers=data['metadata']['num_layers']
         )
     
@@ -632,54 +1220,434 @@ class Toolpath:
         filepath = Path(filepath)
         filepath.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(filepath, 'w') as f:
-            # Header
+        with open(filepath, 'w', buffering=1 << 20) as f:
             f.write("x,y,z,power,speed\n")
+            self._write_rows(f, self.CSV_LINE, ['x', 'y', 'z', 'power', 'speed'])
+    
+    def _as_records(self) -> np.ndarray:
+        """
+        Structured array with fields x, y, z, power and speed (cached).
+        
+        One interleaved record per point, in the storage dtype, so
+        writers read each point's fields from one place. Rebuilt when
+        points, powers or speeds are replaced.
+        """
+        if self._records_key != self._revision:
+            records = np.empty(self.num_points, dtype=[
+                (name, self.dtype) for name in ('x', 'y', 'z', 'power', 'speed')
+            ])
+            records['x'] = self._x
+            records['y'] = self._y
+            records['z'] = self._z
+            records['power'] = self.powers
+            records['speed'] = self.speeds
+            self._records = records
+            self._records_key = self._revision
+        return self._records
+    
+    def _write_rows(self, f, line_format: str, fields: List[str]):
+        """
+        Write one formatted line per point, streaming in blocks.
+        
+        Each block is formatted with a single C-level %-operation (rather
+        than a format call per row as in np.savetxt); streaming in blocks
+        keeps memory flat for large toolpaths. With numba and float32
+        storage, blocks are instead written by a compiled fixed-point
+        formatter that produces the same text. Large toolpaths format
+        blocks on two worker threads so formatting overlaps with the
+        file writes.
+        """
+        layout = self._fixed_layout(line_format) if NUMBA_AVAILABLE else None
+        columns = self._as_records()[fields]
+        block_starts = range(0, self.num_points, self.GCODE_CHUNK_ROWS)
+        
+        if self.num_points < self.THREADED_WRITE_MIN_POINTS:
+            for start in block_starts:
+                f.write(self._format_block(line_format, layout, columns, start))
+            return
+        
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            # Blocks are written in submission order as they complete
+            pending = deque()
+            for start in block_starts:
+                pending.append(pool.submit(self._format_block, line_format,
+                                           layout, columns, start))
+                if len(pending) > self.WRITE_QUEUE_BLOCKS:
+                    f.write(pending.popleft().result())
+            while pending:
+                f.write(pending.popleft().result())
+    
+    def _format_block(self, line_format: str, layout, columns: np.ndarray,
+                      start: int) -> str:
+        """Text for the block of records starting at ``start``, fields in format order."""
+        stop = start + self.GCODE_CHUNK_ROWS
+        rows = structured_to_unstructured(columns[start:stop])
+        text = self._format_fixed(rows, layout) if layout is not None else None
+        if text is None:
+            text = (line_format * len(rows)) % tuple(rows.ravel().tolist())
+        return text
+    
+    @classmethod
+    def _fixed_layout(cls, line_format: str):
+        """
+        Split a row format into literals and %.Nf fields for the compiled writer.
+        
+        Returns None if the format holds any other conversion.
+        """
+        pieces = cls._FIXED_FIELD.split(line_format)
+        literals, decimals = pieces[::2], [int(d) for d in pieces[1::2]]
+        if any('%' in literal for literal in literals) or max(decimals, default=13) > 12:
+            return None
+        
+        encoded = [literal.encode('ascii') for literal in literals]
+        offsets = np.cumsum([0] + [len(b) for b in encoded])
+        return (np.array(decimals, dtype=np.int64),
+                np.frombuffer(b''.join(encoded), dtype=np.uint8),
+                offsets.astype(np.int64))
+    
+    @staticmethod
+    def _format_fixed(rows: np.ndarray, layout) -> Optional[str]:
+        """
+        Format a block of float32 rows with the compiled writer.
+        
+        A float32 value times 10**N (N <= 12) is exact in float64, so
+        rounding it half-to-even gives the same digits as %-formatting.
+        Returns None (use %-formatting) for other dtypes and for values
+        that are not finite or too large for exact integer scaling.
+        """
+        if rows.dtype != np.float32:
+            return None
+        
+        decimals, literals, offsets = layout
+        scaled = rows.astype(np.float64) * 10.0 ** decimals
+        if not np.all(np.abs(scaled) < 2.0 ** 53):
+            return None
+        
+        values = np.rint(scaled).astype(np.int64)
+        # Sign, up to 16 digits and a decimal point per field
+        out = np.empty(len(rows) * (len(literals) + 18 * len(decimals)), dtype=np.uint8)
+        length = format_fixed_rows(values, np.signbit(rows), decimals, literals, offsets, out)
+        return out[:length].tobytes().decode('ascii')
+    
+    def lod_permutation(self, max_depth: int = 10) -> np.ndarray:
+        """
+        Level-of-detail ordering of the toolpath points.
+        
+        Points are ordered coarse-to-fine by an octree traversal (MidOc):
+        depth 0 contributes the point nearest the bounding-box center,
+        depth 1 the point nearest the center of each occupied octant, and
+        so on. Any prefix ``perm[:k]`` is a spatially even subsample.
+        The permutation is computed once and cached.
+        
+        Parameters
+        ----------
+        max_depth : int
+            Deepest octree level (at most 20); remaining points follow
+        
+        Returns
+        -------
+        ndarray
+            Permutation of point indices, coarse to fine
+        """
+        if self._lod_perm is not None and self._lod_depth == max_depth:
+            return self._lod_perm
+        
+        if not 0 <= max_depth <= 20:
+            raise ValueError("max_depth must be between 0 and 20")
+        
+        n = self.num_points
+        points = self.get_coordinates(np.float64)
+        
+        if n == 0:
+            perm = np.empty(0, dtype=np.int64)
+        else:
+            # Normalized position in the (cubic) bounding box, in [0, 1)
+            lo = points.min(axis=0)
+            extent = max(float((points.max(axis=0) - lo).max()), 1e-12)
+            unit = np.clip((points - lo) / extent, 0.0, np.nextafter(1.0, 0.0))
+            
+            remaining = np.arange(n)
+            levels = []
+            
+            for depth in range(max_depth + 1):
+                if len(remaining) == 0:
+                    break
+                
+                cells_per_axis = 1 << depth
+                cell = np.floor(unit[remaining] * cells_per_axis).astype(np.int64)
+                keys = (cell[:, 0] << (2 * depth)) | (cell[:, 1] << depth) | cell[:, 2]
+                
+                # Point nearest each occupied cell's center represents the cell
+                offset = unit[remaining] * cells_per_axis - (cell + 0.5)
+                dist = np.einsum('ij,ij->i', offset, offset)
+                order = np.lexsort((dist, keys))
+                first = np.ones(len(order), dtype=bool)
+                first[1:] = keys[order[1:]] != keys[order[:-1]]
+                
+                chosen = order[first]
+                levels.append(remaining[chosen])
+                
+                keep = np.ones(len(remaining), dtype=bool)
+                keep[chosen] = False
+                remaining = remaining[keep]
             
-            # Data
-            for point, power, speed in zip(self.points, self.powers, self.speeds):
-                f.write(f"{point[0]:.4f},{point[1]:.4f},{point[2]:.4f},"
-                       f"{power:.2f},{speed:.0f}\n")
+            levels.append(remaining)
+            perm = np.concatenate(levels)
+        
+        self._lod_perm = perm
+        self._lod_depth = max_depth
+        return perm
     
-    def visualize(self):
-        """Create 3D visualization of toolpath."""
+    def _plot_segments(self, max_segments: Optional[int]) -> np.ndarray:
+        """
+        S×2×3 array of the path segments to draw (cached).
+        
+        Beyond ``max_segments``, the segments starting at the first points
+        of lod_permutation are kept, in path order. The subsample thins
+        out evenly over the structure rather than aliasing with the hatch
+        spacing as a fixed stride can. Reused until points, powers or
+        speeds are replaced.
+        """
+        key = (self._revision, max_segments)
+        if self._segments_plot_key != key:
+            points = self.points
+            n_segments = len(points) - 1
+            if max_segments is None or n_segments <= max_segments:
+                self._segments_plot = np.stack([points[:-1], points[1:]], axis=1)
+            else:
+                perm = self.lod_permutation()
+                starts = np.sort(perm[perm < n_segments][:max_segments])
+                self._segments_plot = np.stack(
+                    [points[starts], points[starts + 1]], axis=1
+                )
+            self._segments_plot_key = key
+        return self._segments_plot
+    
+    def visualize(self, max_segments: Optional[int] = 50000):
+        """
+        Create 3D visualization of toolpath.
+        
+        The path is drawn as a single line collection of its consecutive
+        segments, colored by height.
+        
+        Parameters
+        ----------
+        max_segments : int, optional
+            Draw at most this many segments, chosen evenly over the
+            structure by lod_permutation. None draws every segment.
+        """
         try:
             import matplotlib.pyplot as plt
-            from mpl_toolkits.mplot3d import Axes3D
+            from mpl_toolkits.mplot3d.art3d import Line3DCollection
         except ImportError:
             warnings.warn("Matplotlib required for visualization")
             return
         
+        if self.num_points < 2:
+            warnings.warn("Toolpath has no segments to visualize")
+            return
+        
+        segments = self._plot_segments(max_segments)
+        
         fig = plt.figure(figsize=(12, 8))
         ax = fig.add_subplot(111, projection='3d')
         
-        # Plot points colored by layer height (z)
-        scatter = ax.scatter(
-            self.points[:, 0],
-            self.points[:, 1],
-            self.points[:, 2],
-            c=self.points[:, 2],
-            cmap='viridis',
-            s=1
-        )
+        # Segments colored by layer height (z of their start point)
+        lines = Line3DCollection(segments, cmap='viridis', linewidths=0.5)
+        lines.set_array(segments[:, 0, 2])
+        ax.add_collection3d(lines)
+        
+        # Collections don't update the axis limits
+        lower = self.points.min(axis=0)
+        upper = self.points.max(axis=0)
+        ax.set_xlim(lower[0], upper[0])
+        ax.set_ylim(lower[1], upper[1])
+        ax.set_zlim(lower[2], upper[2])
         
         ax.set_xlabel('X (μm)')
         ax.set_ylabel('Y (μm)')
         ax.set_zlabel('Z (μm)')
         ax.set_title(f'Toolpath: {self.num_points} points, {self.num_layers} layers')
         
-        plt.colorbar(scatter, label='Z height (μm)')
+        plt.colorbar(lines, ax=ax, label='Z height (μm)')
         plt.tight_layout()
         plt.show()
     
-    def optimize(self):
-        """Optimize toolpath to reduce travel moves."""
-        # Simple optimization: reorder points to minimize travel
-        # This is a simplified version - full TSP solver would be better
+    def optimize(self, stroke_length: int = 2, allow_reverse: bool = True,
+                 method: str = 'nearest'):
+        """
+        Optimize toolpath to reduce travel moves.
+        
+        The points are taken as consecutive strokes of ``stroke_length``
+        points (2 for rectilinear hatch lines). Within each layer (run of
+        equal z) the strokes are reordered; points within a stroke keep
+        their sequence. The original order is kept if it is already at
+        least as short, and a path whose point count is not a multiple of
+        ``stroke_length`` is left unchanged with a warning.
+        
+        With ``method='nearest'`` strokes are chained greedy
+        nearest-neighbour from the layer's first stroke, reversing a stroke
+        when its far end is closer (if allowed). With ``method='hilbert'``
+        strokes are sorted along a Hilbert curve over the layer, which is
+        O(S log S) and avoids the long jumps greedy chaining leaves behind;
+        when reversal is allowed (and numba is available) the order is then
+        refined with windowed 2-opt.
+        
+        Parameters
+        ----------
+        stroke_length : int
+            Number of consecutive points forming one stroke
+        allow_reverse : bool
+            Allow strokes to be scanned in the opposite direction (disable
+            to preserve a unidirectional scan)
+        method : str
+            Ordering strategy: 'nearest' or 'hilbert'
+        """
+        if method not in ('nearest', 'hilbert'):
+            raise ValueError(f"Unknown optimization method: {method}")
+        
         print("  Optimizing toolpath...")
-        # For now, just a placeholder
-        # Real implementation would use nearest neighbor or TSP algorithm
-        pass
+        
+        n = self.num_points
+        k = stroke_length
+        if k < 1:
+            raise ValueError(f"stroke_length must be at least 1, got {k}")
+        if n == 0:
+            return
+        if n % k:
+            warnings.warn(f"{n} points do not divide into strokes of {k}; "
+                          f"toolpath left unchanged")
+            return
+        
+        xy = np.column_stack([self._x, self._y]).astype(float)
+        starts = np.ascontiguousarray(xy[0::k])
+        ends = np.ascontiguousarray(xy[k - 1::k])
+        
+        # Layers are runs of strokes starting at the same z
+        breaks = np.flatnonzero(np.diff(self._z[0::k])) + 1
+        layer_offsets = np.concatenate([[0], breaks, [len(starts)]]).astype(np.int64)
+        
+        order = np.empty(len(starts), dtype=np.int64)
+        flipped = np.empty(len(starts), dtype=bool)
+        if method == 'hilbert':
+            order[:] = self._hilbert_stroke_order(starts, ends, layer_offsets)
+            flipped[:] = False
+            if allow_reverse and NUMBA_AVAILABLE:
+                two_opt_strokes(starts, ends, layer_offsets, self.TWO_OPT_WINDOW,
+                                self.TWO_OPT_MAX_PASSES, order, flipped)
+        elif NUMBA_AVAILABLE and np.diff(layer_offsets).max() <= self.NN_DENSE_MAX_STROKES:
+            order_strokes(starts, ends, layer_offsets, allow_reverse, order, flipped)
+        else:
+            for lo, hi in zip(layer_offsets[:-1], layer_offsets[1:]):
+                self._order_strokes_kdtree(starts, ends, lo, hi, allow_reverse,
+                                           order, flipped)
+        
+        within = np.arange(k)
+        perm = (order[:, None] * k
+                + np.where(flipped[:, None], within[::-1], within)).ravel()
+        if np.array_equal(perm, np.arange(n)):
+            return
+        
+        points = self.points[perm]
+        deltas = np.diff(points, axis=0)
+        segments = np.sqrt(np.einsum('ij,ij->i', deltas, deltas))
+        if segments.sum() >= self.total_length:
+            return
+        
+        self.points = points
+        # Reuse the candidate's segment lengths instead of recomputing them
+        self._segments = segments
+        self.powers = self.powers[perm]
+        self.speeds = self.speeds[perm]
+    
+    @classmethod
+    def _hilbert_stroke_order(cls, starts: np.ndarray, ends: np.ndarray,
+                              layer_offsets: np.ndarray) -> np.ndarray:
+        """
+        Stroke indices sorted by layer, then by the Hilbert index of the
+        stroke midpoint on a square grid over the layer's extent.
+        """
+        midpoints = (starts + ends) / 2
+        sizes = np.diff(layer_offsets)
+        layer = np.repeat(np.arange(len(sizes)), sizes)
+        
+        # Per-layer origin and a common scale for x and y (keeps cells square)
+        nonempty = sizes > 0
+        lo = np.zeros((len(sizes), 2))
+        hi = np.zeros((len(sizes), 2))
+        lo[nonempty] = np.minimum.reduceat(midpoints, layer_offsets[:-1][nonempty])
+        hi[nonempty] = np.maximum.reduceat(midpoints, layer_offsets[:-1][nonempty])
+        span = (hi - lo).max(axis=1)
+        side = (1 << cls.HILBERT_BITS) - 1
+        scale = np.divide(side, span, out=np.zeros_like(span), where=span > 0)
+        
+        cells = ((midpoints - lo[layer]) * scale[layer][:, None]).astype(np.int64)
+        keys = cls._hilbert_index(cells[:, 0], cells[:, 1], cls.HILBERT_BITS)
+        return np.lexsort((keys, layer))
+    
+    @staticmethod
+    def _hilbert_index(x: np.ndarray, y: np.ndarray, bits: int) -> np.ndarray:
+        """Distance along the Hilbert curve of integer cells on a 2^bits grid."""
+        x = x.copy()
+        y = y.copy()
+        n = 1 << bits
+        d = np.zeros(len(x), dtype=np.int64)
+        s = n >> 1
+        while s > 0:
+            rx = (x & s) > 0
+            ry = (y & s) > 0
+            d += s * s * ((3 * rx) ^ ry)
+            
+            # Rotate the quadrant so the curve stays continuous
+            flip = ~ry & rx
+            x[flip] = n - 1 - x[flip]
+            y[flip] = n - 1 - y[flip]
+            swap = ~ry
+            x[swap], y[swap] = y[swap], x[swap].copy()
+            s >>= 1
+        return d
+    
+    @staticmethod
+    def _order_strokes_kdtree(starts: np.ndarray, ends: np.ndarray, lo: int, hi: int,
+                              allow_reverse: bool, order: np.ndarray, flipped: np.ndarray):
+        """
+        Greedy nearest-neighbour stroke order for one layer using a KD-tree.
+        
+        Same result as the compiled order_strokes kernel up to ties, in
+        O(S log S) rather than O(S²) for layers with many strokes.
+        """
+        from scipy.spatial import cKDTree
+        
+        m = hi - lo
+        if m == 0:
+            return
+        
+        # Tree entry i < m is the start of stroke lo + i, i >= m its end
+        entries = [starts[lo:hi], ends[lo:hi]] if allow_reverse else [starts[lo:hi]]
+        tree = cKDTree(np.concatenate(entries))
+        visited = np.zeros(m, dtype=bool)
+        visited[0] = True
+        order[lo] = lo
+        flipped[lo] = False
+        current = ends[lo]
+        
+        for pos in range(lo + 1, hi):
+            n_query = 8
+            while True:
+                # Widen the query until it reaches an unvisited stroke
+                _, idx = tree.query(current, k=min(n_query, tree.n))
+                idx = np.atleast_1d(idx)
+                free = ~visited[idx % m]
+                if free.any():
+                    hit = idx[np.argmax(free)]
+                    break
+                n_query *= 4
+            
+            stroke = hit % m
+            visited[stroke] = True
+            order[pos] = lo + stroke
+            flipped[pos] = hit >= m
+            current = starts[lo + stroke] if hit >= m else ends[lo + stroke]
 
 
 # Fill pattern implementations
@@ -9,15 +9,398 @@ Date: December 2024
 BTU Cottbus-Senftenberg
 """
 
+import hashlib
+import math
+import os
 import numpy as np
+from pathlib import Path
 from typing import Union, Tuple
-from .geometry import Geometry
+from functools import lru_cache, wraps
+from .geometry import Geometry, TRIMESH_AVAILABLE, _load_npz, _save_npz_atomic, _trimesh
+from ._mesh_kernels import NUMBA_AVAILABLE, build_cone, build_torus
 
-try:
-    import trimesh
-    TRIMESH_AVAILABLE = True
-except ImportError:
-    TRIMESH_AVAILABLE = False
+
+# trimesh stores vertices as float64 and faces as int64 and upcasts
+# anything narrower, so builders emit these dtypes directly to avoid a
+# conversion copy on every Trimesh construction
+_VERTEX_DTYPE = np.float64
+_FACE_DTYPE = np.int64
+
+# Unit box centered at the origin, same layout and outward winding as
+# trimesh.creation.box
+_CUBE_UNIT_VERTS = np.array([[-1, -1, -1], [-1, -1, 1], [-1, 1, -1], [-1, 1, 1],
+                             [1, -1, -1], [1, -1, 1], [1, 1, -1], [1, 1, 1]],
+                            dtype=_VERTEX_DTYPE) * 0.5
+_CUBE_FACES = np.array([[1, 3, 0], [4, 1, 0], [0, 3, 2], [2, 4, 0],
+                        [1, 7, 3], [5, 1, 4], [5, 7, 1], [3, 7, 2],
+                        [6, 4, 2], [2, 7, 6], [6, 5, 4], [7, 5, 6]],
+                       dtype=_FACE_DTYPE)
+
+
+# Opt-in on-disk cache of generated primitive arrays, shared across
+# sessions. Set TPL_PRIMITIVE_CACHE to a directory (e.g.
+# ~/.cache/tpl/primitives) to enable it. Only meshes large enough that
+# loading beats rebuilding are written.
+MESH_CACHE_DIR = os.environ.get('TPL_PRIMITIVE_CACHE', '')
+MESH_CACHE_MIN_VERTICES = 10000
+# Bump whenever a builder's output changes so stale files are not reused
+_MESH_CACHE_VERSION = 1
+
+
+def _disk_cached(name: str):
+    """
+    Persist a ``(vertices, faces)`` builder's results as ``.npz`` files.
+    
+    Files are keyed on the builder name and its positional arguments.
+    Unreadable files are deleted and rebuilt; unwritable directories fall
+    back to building.
+    """
+    def decorator(build):
+        @wraps(build)
+        def wrapper(*args):
+            if not MESH_CACHE_DIR:
+                return build(*args)
+            
+            key = repr((_MESH_CACHE_VERSION, name, args)).encode()
+            path = Path(MESH_CACHE_DIR) / f"{name}-{hashlib.sha1(key).hexdigest()[:16]}.npz"
+            cached = _load_npz(path, 'vertices', 'faces')
+            if cached is not None:
+                return cached
+            
+            vertices, faces = build(*args)
+            if len(vertices) >= MESH_CACHE_MIN_VERTICES:
+                _save_npz_atomic(path, vertices=vertices, faces=faces)
+            return vertices, faces
+        return wrapper
+    return decorator
+
+
+def _check_positive(value, name: str) -> None:
+    """
+    Raise ValueError unless ``value`` (a scalar or array) is all positive.
+    
+    Written as ``not all(value > 0)`` so NaN sizes are rejected as well.
+    """
+    if not np.all(np.greater(value, 0)):
+        raise ValueError(f"{name} must be positive")
+
+
+def _move_to_center(mesh, offset: np.ndarray) -> None:
+    """
+    Translate an origin-centered mesh by ``offset``; no-op at the origin.
+    
+    Adds the offset to the vertex array in place rather than going through
+    apply_translation's homogeneous 4×4 transform. The in-place add goes
+    through trimesh's tracked array, so cached mesh properties are still
+    invalidated.
+    """
+    if offset.any():
+        mesh.vertices += offset
+
+
+@lru_cache(maxsize=32)
+def _ring_trig(resolution: int):
+    """
+    Read-only cos/sin of ``resolution`` angles evenly spaced over [0, 2π).
+    
+    Shared by all primitives built around the z-axis; callers must not
+    write to the returned arrays.
+    """
+    theta = np.linspace(0, 2 * np.pi, resolution, endpoint=False)
+    cos_t = np.cos(theta)
+    sin_t = np.sin(theta)
+    cos_t.setflags(write=False)
+    sin_t.setflags(write=False)
+    return cos_t, sin_t
+
+
+# Primitive meshes are built once per parameter set, centered at the
+# origin; constructors copy the template and translate it. Templates must
+# never be modified in place.
+
+@lru_cache(maxsize=None)
+def _subdivided_face(freq: int):
+    """
+    Triangular lattice of one icosahedron face split ``freq`` times per edge.
+    
+    Parameters
+    ----------
+    freq : int
+        Number of segments per face edge
+    
+    Returns
+    -------
+    lattice : ndarray
+        K×2 (i, j) lattice coordinates, i + j <= freq; the point lies i
+        steps from corner a towards b and j steps towards c
+    upside_tris : ndarray
+        Local triangles oriented like the face (a, b, c)
+    downside_tris : ndarray
+        Local triangles pointing the other way
+    """
+    i, j = np.divmod(np.arange((freq + 1) ** 2, dtype=_FACE_DTYPE), freq + 1)
+    valid = i + j <= freq
+    lattice = np.column_stack([i[valid], j[valid]])
+    local = np.full((freq + 1, freq + 1), -1, dtype=_FACE_DTYPE)
+    local[lattice[:, 0], lattice[:, 1]] = np.arange(len(lattice))
+    
+    i, j = lattice.T
+    up = i + j < freq
+    upside_tris = np.column_stack([local[i[up], j[up]],
+                                   local[i[up] + 1, j[up]],
+                                   local[i[up], j[up] + 1]])
+    down = i + j < freq - 1
+    downside_tris = np.column_stack([local[i[down] + 1, j[down]],
+                                     local[i[down] + 1, j[down] + 1],
+                                     local[i[down], j[down] + 1]])
+    return lattice, upside_tris, downside_tris
+
+
+@lru_cache(maxsize=None)
+def _unit_icosphere(subdivisions: int):
+    """Unit-radius icosphere centered at the origin; scaled per Sphere."""
+    vertices, faces = _icosphere_arrays(subdivisions)
+    return _trimesh().Trimesh(vertices=vertices, faces=faces, process=False)
+
+
+@_disk_cached('icosphere')
+def _icosphere_arrays(subdivisions: int):
+    """
+    Unit icosphere vertices and faces.
+    
+    Only the first icosahedron face is subdivided (midpoint split and
+    projection onto the sphere at every level, as trimesh's icosphere).
+    The other 19 faces are copies rotated onto their corners, which
+    share corner and edge vertices through a global numbering: 12
+    corners, then freq - 1 points per edge, then each face's interior.
+    """
+    ico = _trimesh().creation.icosahedron()
+    corners = ico.vertices / np.linalg.norm(ico.vertices, axis=1)[:, None]
+    ico_faces = ico.faces
+    freq = 2 ** subdivisions
+    lattice, upside_tris, downside_tris = _subdivided_face(freq)
+    
+    # Recursive midpoint subdivision of face 0, carried on the full
+    # parallelogram grid so every entry stays away from the origin
+    a, b, c = corners[ico_faces[0]]
+    grid = np.array([[a, c], [b, b + c - a]])
+    for _ in range(subdivisions):
+        n = len(grid) - 1
+        finer = np.empty((2 * n + 1, 2 * n + 1, 3), dtype=_VERTEX_DTYPE)
+        finer[::2, ::2] = grid
+        finer[1::2, ::2] = (grid[:-1] + grid[1:]) / 2
+        finer[::2, 1::2] = (grid[:, :-1] + grid[:, 1:]) / 2
+        finer[1::2, 1::2] = (grid[1:, :-1] + grid[:-1, 1:]) / 2
+        grid = finer / np.linalg.norm(finer, axis=2)[..., None]
+    local_points = grid[lattice[:, 0], lattice[:, 1]]
+    
+    # Rotations taking face 0's corners onto every face's corners
+    frames = corners[ico_faces].transpose(0, 2, 1)
+    rotations = frames @ np.linalg.inv(frames[0])
+    points = np.einsum('fxy,ky->fkx', rotations, local_points)
+    
+    # Global vertex index of every local lattice point of every face
+    edges = np.sort(ico_faces[:, [[0, 1], [0, 2], [1, 2]]], axis=2).reshape(-1, 2)
+    edge_keys, edge_ids = np.unique(edges, axis=0, return_inverse=True)
+    edge_ids = edge_ids.reshape(-1, 3)
+    n_edge = freq - 1
+    n_interior = (freq - 1) * (freq - 2) // 2
+    
+    i, j = lattice.T
+    index = np.empty((len(ico_faces), len(lattice)), dtype=_FACE_DTYPE)
+    interior = (i > 0) & (j > 0) & (i + j < freq)
+    index[:, interior] = (12 + len(edge_keys) * n_edge
+                          + np.arange(len(ico_faces))[:, None] * n_interior
+                          + np.arange(n_interior))
+    
+    # Corners and edges: (lattice mask, start corner, end corner, steps)
+    for mask, start, end, t in (
+            ((i == 0) & (j == 0), 0, 0, None),
+            ((i == freq) & (j == 0), 1, 1, None),
+            ((i == 0) & (j == freq), 2, 2, None),
+            ((j == 0) & (i > 0) & (i < freq), 0, 1, i),
+            ((i == 0) & (j > 0) & (j < freq), 0, 2, j),
+            ((i + j == freq) & (i > 0) & (j > 0), 1, 2, j)):
+        first = ico_faces[:, start][:, None]
+        if t is None:
+            index[:, mask] = first
+            continue
+        edge = edge_ids[:, {(0, 1): 0, (0, 2): 1, (1, 2): 2}[(start, end)]]
+        steps = np.where(first < ico_faces[:, end][:, None],
+                         t[mask], freq - t[mask])
+        index[:, mask] = 12 + edge[:, None] * n_edge + steps - 1
+    
+    vertices = np.empty((10 * freq ** 2 + 2, 3), dtype=_VERTEX_DTYPE)
+    vertices[index.ravel()] = points.reshape(-1, 3)
+    local_tris = np.vstack([upside_tris, downside_tris])
+    faces = index[:, local_tris].reshape(-1, 3)
+    return vertices, faces
+
+
+def _cone_arrays(radius_base: float, radius_top: float, height: float,
+                 resolution: int):
+    """NumPy cone vertices and faces; same layout as ``build_cone``."""
+    # Vertex layout: base circle, top circle (or a single apex), base
+    # center, then top center if truncated; filled in place
+    truncated = radius_top > 0
+    n_top = resolution if truncated else 1
+    nv = resolution + n_top + 1 + (1 if truncated else 0)
+    vertices = np.empty((nv, 3), dtype=_VERTEX_DTYPE)
+    base = vertices[:resolution]
+    top = vertices[resolution:resolution + n_top]
+    
+    cos_t, sin_t = _ring_trig(resolution)
+    
+    # Base circle
+    np.multiply(radius_base, cos_t, out=base[:, 0])
+    np.multiply(radius_base, sin_t, out=base[:, 1])
+    base[:, 2] = -height / 2
+    
+    # Top circle (or point)
+    if truncated:
+        np.multiply(radius_top, cos_t, out=top[:, 0])
+        np.multiply(radius_top, sin_t, out=top[:, 1])
+    else:
+        top[:, :2] = 0.0
+    top[:, 2] = height / 2
+    
+    # Cap centers
+    base_center_idx = resolution + n_top
+    vertices[base_center_idx] = (0.0, 0.0, -height / 2)
+    if truncated:
+        top_center_idx = base_center_idx + 1
+        vertices[top_center_idx] = (0.0, 0.0, height / 2)
+    
+    # Generate faces (index arrays for all sections at once), written
+    # slab by slab into one preallocated array
+    i = np.arange(resolution, dtype=_FACE_DTYPE)
+    next_i = (i + 1) % resolution
+    n_faces = 4 * resolution if truncated else 2 * resolution
+    faces = np.empty((n_faces, 3), dtype=_FACE_DTYPE)
+    
+    # Side faces: one triangle per section, plus a second (interleaved)
+    # if not pointed cone
+    if truncated:
+        side = faces[:2 * resolution:2]
+        side_top = faces[1:2 * resolution:2]
+        side_top[:, 0] = next_i
+        side_top[:, 1] = resolution + next_i
+        side_top[:, 2] = resolution + i
+        side[:, 2] = resolution + i
+        offset = 2 * resolution
+    else:
+        side = faces[:resolution]
+        side[:, 2] = resolution
+        offset = resolution
+    side[:, 0] = i
+    side[:, 1] = next_i
+    
+    # Base cap
+    base_cap = faces[offset:offset + resolution]
+    base_cap[:, 0] = base_center_idx
+    base_cap[:, 1] = next_i
+    base_cap[:, 2] = i
+    offset += resolution
+    
+    # Top cap (if truncated)
+    if truncated:
+        top_cap = faces[offset:offset + resolution]
+        top_cap[:, 0] = top_center_idx
+        top_cap[:, 1] = resolution + i
+        top_cap[:, 2] = resolution + next_i
+    
+    return vertices, faces
+
+
+@_disk_cached('cone')
+def _cone_mesh_arrays(radius_base: float, radius_top: float, height: float,
+                      resolution: int):
+    """Cone vertices and faces from the compiled or the NumPy builder."""
+    if NUMBA_AVAILABLE:
+        return build_cone(float(radius_base), float(radius_top),
+                          float(height), *_ring_trig(int(resolution)))
+    return _cone_arrays(radius_base, radius_top, height, resolution)
+
+
+@lru_cache(maxsize=128)
+def _cone_template(radius_base: float, radius_top: float, height: float,
+                   resolution: int):
+    """Cone mesh centered at the origin."""
+    vertices, faces = _cone_mesh_arrays(radius_base, radius_top, height, resolution)
+    
+    # Generated topology is clean (no duplicate vertices to merge) and
+    # every triangle is emitted with outward winding, so no fix_normals
+    return _trimesh().Trimesh(vertices=vertices, faces=faces, process=False)
+
+
+def _polygon_area_factor(resolution: int) -> float:
+    """Area k of a regular polygon with circumradius 1; k·r² for radius r."""
+    return resolution / 2 * math.sin(2 * math.pi / resolution)
+
+
+def _frustum_volume(radius_base: float, radius_top: float, height: float,
+                    resolution: int) -> float:
+    """
+    Exact volume of a tessellated cone or cylinder.
+    
+    The caps are similar regular polygons with area k·r², so the solid is
+    a polygonal frustum: k·h/3·(r1² + r1·r2 + r2²).
+    """
+    k = _polygon_area_factor(resolution)
+    return k * height / 3 * (radius_base ** 2 + radius_base * radius_top
+                             + radius_top ** 2)
+
+
+def _torus_arrays(major_radius: float, minor_radius: float, resolution: int):
+    """NumPy torus vertices and faces; same layout as ``build_torus``."""
+    # Generate torus vertices; the 2π seam is closed by wrapping indices
+    # instead of repeating the first row and column
+    m = resolution - 1
+    cos_t, sin_t = _ring_trig(m)
+    
+    # Write coordinates straight into one (m², 3) buffer, broadcasting the
+    # per-row ring radius and height (tube angle) against the per-column
+    # direction (angle around the axis)
+    vertices = np.empty((m * m, 3), dtype=_VERTEX_DTYPE)
+    ring = (major_radius + minor_radius * cos_t)[:, None]
+    np.multiply(ring, cos_t, out=vertices[:, 0].reshape(m, m))
+    np.multiply(ring, sin_t, out=vertices[:, 1].reshape(m, m))
+    vertices[:, 2].reshape(m, m)[:] = (minor_radius * sin_t)[:, None]
+    
+    # Generate faces: two triangles per grid quad, interleaved. Quad
+    # corners are written straight into (m, m) views of the face columns
+    row = np.arange(m, dtype=_FACE_DTYPE) * m
+    col = np.arange(m, dtype=_FACE_DTYPE)
+    row_next = np.roll(row, -1)
+    col_next = np.roll(col, -1)
+    faces = np.empty((2 * m * m, 3), dtype=_FACE_DTYPE)
+    first = faces[0::2].reshape(m, m, 3)
+    second = faces[1::2].reshape(m, m, 3)
+    np.add(row[:, None], col, out=first[..., 0])
+    np.add(row[:, None], col_next, out=first[..., 1])
+    np.add(row_next[:, None], col, out=first[..., 2])
+    second[..., 0] = first[..., 1]
+    np.add(row_next[:, None], col_next, out=second[..., 1])
+    second[..., 2] = first[..., 2]
+    return vertices, faces
+
+
+@_disk_cached('torus')
+def _torus_mesh_arrays(major_radius: float, minor_radius: float, resolution: int):
+    """Torus vertices and faces from the compiled or the NumPy builder."""
+    if NUMBA_AVAILABLE:
+        return build_torus(float(major_radius), float(minor_radius),
+                           *_ring_trig(int(resolution) - 1))
+    return _torus_arrays(major_radius, minor_radius, resolution)
+
+
+@lru_cache(maxsize=128)
+def _torus_template(major_radius: float, minor_radius: float, resolution: int):
+    """Torus mesh centered at the origin."""
+    vertices, faces = _torus_mesh_arrays(major_radius, minor_radius, resolution)
+    
+    # Seamless grid with outward winding: nothing for trimesh to fix
+    return _trimesh().Trimesh(vertices=vertices, faces=faces, process=False)
 
 
 class Cube(Geometry):
@@ -34,6 +417,8 @@ class Cube(Geometry):
         (x, y, z) center position in micrometers
     """
     
+    __slots__ = ('size', 'center')
+    
     def __init__(self, 
                  size: Union[float, Tuple[float, float, float]],
                  center: Tuple[float, float, float] = (0, 0, 0)):
@@ -43,27 +428,99 @@ class Cube(Geometry):
         
         # Parse size
         if isinstance(size, (int, float)):
-            if size <= 0:
-                raise ValueError("Size must be positive")
-            extents = [size, size, size]
+            extents = np.full(3, size, dtype=_VERTEX_DTYPE)
+        elif len(size) != 3:
+            raise ValueError("Size tuple must have 3 elements (x, y, z)")
         else:
-            if len(size) != 3:
-                raise ValueError("Size tuple must have 3 elements (x, y, z)")
-            if any(s <= 0 for s in size):
-                raise ValueError("All size dimensions must be positive")
-            extents = list(size)
+            extents = np.asarray(size, dtype=_VERTEX_DTYPE)
+        _check_positive(extents, "Size")
         
         # Create box
-        mesh = trimesh.creation.box(extents=extents)
+        mesh = _trimesh().Trimesh(vertices=_CUBE_UNIT_VERTS * extents,
+                                  faces=_CUBE_FACES.copy(),
+                                  process=False)
         
         # Move to center position
-        mesh.apply_translation(center)
+        offset = np.asarray(center, dtype=_VERTEX_DTYPE)
+        _move_to_center(mesh, offset)
         
         super().__init__(mesh)
+        self._dense_vertices = True
         
         # Store parameters
         self.size = size
         self.center = center
+        
+        # Axis-aligned box: bounds follow directly from center and size
+        half = extents / 2
+        self._cache['bounds'] = tuple(zip(offset - half, offset + half))
+        self._cache['volume'] = float(np.prod(extents))
+        self._cache['section_profile'] = (offset[2] - half[2], offset[2] + half[2],
+                                          extents[0] * extents[1], 1.0, 1.0)
+    
+    @classmethod
+    def batch(cls, sizes, centers) -> Geometry:
+        """
+        Build many boxes as one geometry in a single mesh construction.
+        
+        Equivalent to ``Geometry.from_primitives`` over individual cubes,
+        but the unit box is tiled with broadcasting instead of creating
+        and concatenating one mesh per box.
+        
+        Parameters
+        ----------
+        sizes : float or array_like
+            Edge lengths in micrometers: a scalar for all boxes, one value
+            per box (N,) or per box and axis (N, 3)
+        centers : array_like
+            N×3 box centers in micrometers
+        
+        Returns
+        -------
+        Geometry
+            Combined geometry of all boxes
+        """
+        if not TRIMESH_AVAILABLE:
+            raise ImportError("trimesh is required. Install with: pip install trimesh")
+        
+        centers = np.asarray(centers, dtype=_VERTEX_DTYPE)
+        if centers.ndim != 2 or centers.shape[1] != 3 or len(centers) == 0:
+            raise ValueError("Centers must be a non-empty N×3 array")
+        n = len(centers)
+        
+        sizes = np.asarray(sizes, dtype=_VERTEX_DTYPE)
+        if sizes.ndim == 1:
+            sizes = sizes[:, None]
+        try:
+            extents = np.broadcast_to(sizes, (n, 3))
+        except ValueError:
+            raise ValueError("Sizes must be a scalar, (N,) or (N, 3) array") from None
+        _check_positive(extents, "All size dimensions")
+        
+        vertices = _CUBE_UNIT_VERTS[None, :, :] * extents[:, None, :] + centers[:, None, :]
+        faces = (_CUBE_FACES[None, :, :]
+                 + len(_CUBE_UNIT_VERTS) * np.arange(n, dtype=_FACE_DTYPE)[:, None, None])
+        
+        mesh = _trimesh().Trimesh(vertices=vertices.reshape(-1, 3),
+                                  faces=faces.reshape(-1, 3),
+                                  process=False)
+        geometry = Geometry(mesh)
+        geometry._dense_vertices = True
+        return geometry
+        
+    def is_axis_aligned(self) -> bool:
+        """
+        Check whether the box is still aligned with the coordinate axes.
+        
+        Returns
+        -------
+        bool
+            True if every vertex lies on a face of the bounding box, i.e.
+            the box has not been rotated or sheared since creation
+        """
+        lo, hi = np.asarray(self.get_bounds()).T
+        vertices = self.mesh.vertices
+        return bool(np.all(np.isclose(vertices, lo) | np.isclose(vertices, hi)))
 
 
 class Sphere(Geometry):
@@ -77,9 +534,13 @@ class Sphere(Geometry):
     center : tuple
         (x, y, z) center position in micrometers
     resolution : int
-        Tessellation resolution (subdivisions)
+        Tessellation resolution, at least 4. Powers of two map to icosphere
+        subdivision levels (4 -> 0, 8 -> 1, ...); other values use the next
+        lower level
     """
     
+    __slots__ = ('radius', 'center', 'resolution')
+    
     def __init__(self,
                  radius: float,
                  center: Tuple[float, float, float] = (0, 0, 0),
@@ -88,22 +549,38 @@ class Sphere(Geometry):
         if not TRIMESH_AVAILABLE:
             raise ImportError("trimesh is required")
         
-        if radius <= 0:
-            raise ValueError("Radius must be positive")
+        _check_positive(radius, "Radius")
         
         if resolution < 4:
             raise ValueError("Resolution must be at least 4")
         
-        # Create sphere using icosphere for better tessellation
-        mesh = trimesh.creation.icosphere(
-            subdivisions=int(np.log2(resolution / 4)),
-            radius=radius
-        )
+        # Each subdivision halves the edge arc length, as each doubling of
+        # the resolution halves the angular stride: 4 -> 0, 8 -> 1, ...
+        subdivisions = int(resolution).bit_length() - 3
+        
+        # Create sphere by scaling the shared unit icosphere; its topology
+        # is already clean, so trimesh's processing is skipped
+        unit = _unit_icosphere(subdivisions)
+        mesh = _trimesh().Trimesh(vertices=unit.vertices * radius,
+                                  faces=unit.faces.copy(),
+                                  process=False)
         
         # Move to center
-        mesh.apply_translation(center)
+        offset = np.asarray(center, dtype=_VERTEX_DTYPE)
+        _move_to_center(mesh, offset)
         
         super().__init__(mesh)
+        self._dense_vertices = True
+        
+        # Mesh size is known from the subdivision level
+        self._cache['num_vertices'] = 10 * 4 ** subdivisions + 2
+        self._cache['num_faces'] = 20 * 4 ** subdivisions
+        
+        # Scaling and translation are monotone per coordinate, so the
+        # template's bounds map exactly onto this sphere's
+        unit_bounds = unit.bounds * radius + offset
+        self._cache['bounds'] = tuple(zip(unit_bounds[0], unit_bounds[1]))
+        self._cache['volume'] = unit.volume * radius ** 3
         
         self.radius = radius
         self.center = center
@@ -126,6 +603,8 @@ class Cylinder(Geometry):
         Number of points around circumference
     """
     
+    __slots__ = ('radius', 'height', 'center', 'resolution')
+    
     def __init__(self,
                  radius: float,
                  height: float,
@@ -135,26 +614,29 @@ class Cylinder(Geometry):
         if not TRIMESH_AVAILABLE:
             raise ImportError("trimesh is required")
         
-        if radius <= 0:
-            raise ValueError("Radius must be positive")
+        _check_positive(radius, "Radius")
         
-        if height <= 0:
-            raise ValueError("Height must be positive")
+        _check_positive(height, "Height")
         
         if resolution < 3:
             raise ValueError("Resolution must be at least 3")
         
-        # Create cylinder (aligned along z-axis by default)
-        mesh = trimesh.creation.cylinder(
-            radius=radius,
-            height=height,
-            sections=resolution
-        )
+        # Create cylinder (aligned along z-axis by default) by stretching a
+        # unit cone with equal base and top radii, shared per resolution
+        unit = _cone_template(1.0, 1.0, 1.0, resolution)
+        mesh = _trimesh().Trimesh(vertices=unit.vertices * (radius, radius, height),
+                                  faces=unit.faces.copy(),
+                                  process=False)
         
         # Move to center position
-        mesh.apply_translation(center)
+        offset = np.asarray(center, dtype=_VERTEX_DTYPE)
+        _move_to_center(mesh, offset)
         
         super().__init__(mesh)
+        self._dense_vertices = True
+        self._cache['volume'] = _frustum_volume(radius, radius, height, resolution)
+        self._cache['section_profile'] = (offset[2] - height / 2, offset[2] + height / 2,
+                                          _polygon_area_factor(resolution), radius, radius)
         
         self.radius = radius
         self.height = height
@@ -180,6 +662,8 @@ class Cone(Geometry):
         Number of points around circumference
     """
     
+    __slots__ = ('radius_base', 'radius_top', 'height', 'center', 'resolution')
+    
     def __init__(self,
                  radius_base: float,
                  radius_top: float,
@@ -190,76 +674,29 @@ class Cone(Geometry):
         if not TRIMESH_AVAILABLE:
             raise ImportError("trimesh is required")
         
-        if radius_base <= 0:
-            raise ValueError("Base radius must be positive")
+        _check_positive(radius_base, "Base radius")
         
-        if radius_top < 0:
+        if not radius_top >= 0:
             raise ValueError("Top radius must be non-negative")
         
-        if height <= 0:
-            raise ValueError("Height must be positive")
+        _check_positive(height, "Height")
         
         if resolution < 3:
             raise ValueError("Resolution must be at least 3")
         
-        # Create cone manually
-        # Generate vertices
-        theta = np.linspace(0, 2 * np.pi, resolution, endpoint=False)
-        
-        # Base circle
-        base_x = radius_base * np.cos(theta)
-        base_y = radius_base * np.sin(theta)
-        base_z = np.zeros(resolution) - height / 2
-        
-        # Top circle (or point)
-        if radius_top > 0:
-            top_x = radius_top * np.cos(theta)
-            top_y = radius_top * np.sin(theta)
-        else:
-            top_x = np.zeros(resolution)
-            top_y = np.zeros(resolution)
-        top_z = np.zeros(resolution) + height / 2
-        
-        # Combine vertices
-        vertices = np.vstack([
-            np.column_stack([base_x, base_y, base_z]),
-            np.column_stack([top_x, top_y, top_z])
-        ])
-        
-        # Generate faces
-        faces = []
-        
-        # Side faces
-        for i in range(resolution):
-            next_i = (i + 1) % resolution
-            # Triangle 1
-            faces.append([i, next_i, resolution + i])
-            # Triangle 2 (if not pointed cone)
-            if radius_top > 0:
-                faces.append([next_i, resolution + next_i, resolution + i])
-        
-        # Base cap
-        base_center_idx = len(vertices)
-        vertices = np.vstack([vertices, [0, 0, -height/2]])
-        for i in range(resolution):
-            next_i = (i + 1) % resolution
-            faces.append([base_center_idx, next_i, i])
-        
-        # Top cap (if truncated)
-        if radius_top > 0:
-            top_center_idx = len(vertices)
-            vertices = np.vstack([vertices, [0, 0, height/2]])
-            for i in range(resolution):
-                next_i = (i + 1) % resolution
-                faces.append([top_center_idx, resolution + i, resolution + next_i])
-        
-        mesh = trimesh.Trimesh(vertices=vertices, faces=faces)
-        mesh.fix_normals()
+        mesh = _cone_template(radius_base, radius_top, height, resolution).copy()
         
         # Move to center
-        mesh.apply_translation(center)
+        offset = np.asarray(center, dtype=_VERTEX_DTYPE)
+        _move_to_center(mesh, offset)
         
         super().__init__(mesh)
+        self._dense_vertices = True
+        self._cache['volume'] = _frustum_volume(radius_base, radius_top, height,
+                                                resolution)
+        self._cache['section_profile'] = (offset[2] - height / 2, offset[2] + height / 2,
+                                          _polygon_area_factor(resolution),
+                                          radius_base, radius_top)
         
         self.radius_base = radius_base
         self.radius_top = radius_top
@@ -284,6 +721,8 @@ class Torus(Geometry):
         Tessellation resolution
     """
     
+    __slots__ = ('major_radius', 'minor_radius', 'center', 'resolution')
+    
     def __init__(self,
                  major_radius: float,
                  minor_radius: float,
@@ -293,48 +732,26 @@ class Torus(Geometry):
         if not TRIMESH_AVAILABLE:
             raise ImportError("trimesh is required")
         
-        if major_radius <= 0:
-            raise ValueError("Major radius must be positive")
-        
-        if minor_radius <= 0:
-            raise ValueError("Minor radius must be positive")
+        _check_positive(major_radius, "Major radius")
+        _check_positive(minor_radius, "Minor radius")
         
         if minor_radius >= major_radius:
             raise ValueError("Minor radius must be less than major radius")
         
-        # Generate torus vertices
-        u = np.linspace(0, 2 * np.pi, resolution)
-        v = np.linspace(0, 2 * np.pi, resolution)
-        
-        U, V = np.meshgrid(u, v)
-        
-        x = (major_radius + minor_radius * np.cos(V)) * np.cos(U)
-        y = (major_radius + minor_radius * np.cos(V)) * np.sin(U)
-        z = minor_radius * np.sin(V)
-        
-        # Flatten and create vertices
-        vertices = np.column_stack([
-            x.flatten(),
-            y.flatten(),
-            z.flatten()
-        ])
-        
-        # Generate faces
-        faces = []
-        for i in range(resolution - 1):
-            for j in range(resolution - 1):
-                idx = i * resolution + j
-                # Two triangles per quad
-                faces.append([idx, idx + 1, idx + resolution])
-                faces.append([idx + 1, idx + resolution + 1, idx + resolution])
-        
-        mesh = trimesh.Trimesh(vertices=vertices, faces=faces)
-        mesh.fix_normals()
+        mesh = _torus_template(major_radius, minor_radius, resolution).copy()
         
         # Move to center
-        mesh.apply_translation(center)
+        offset = np.asarray(center, dtype=_VERTEX_DTYPE)
+        _move_to_center(mesh, offset)
         
         super().__init__(mesh)
+        self._dense_vertices = True
+        
+        # Grid quads are planar, so each of the m wedges between meridians
+        # holds sin(2π/m) · (tube polygon area) · major_radius
+        m = resolution - 1
+        self._cache['volume'] = (m * m / 2 * major_radius * minor_radius ** 2
+                                 * math.sin(2 * math.pi / m) ** 2)
         
         self.major_radius = major_radius
         self.minor_radius = minor_radius
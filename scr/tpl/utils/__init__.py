@@ -0,0 +1,19 @@
+"""
+TPL Utilities Module
+====================
+
+Configuration loading and result export helpers.
+
+Author: Zeyad Mustafa
+Date: December 2024
+BTU Cottbus-Senftenberg
+"""
+
+from .config import load_config, save_results
+
+__all__ = [
+    'load_config',
+    'save_results',
+]
+
+__version__ = '1.0.0'
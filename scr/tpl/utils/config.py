@@ -0,0 +1,93 @@
+"""
+Configuration Module
+====================
+
+Load YAML system configurations and save fabrication results.
+
+Author: Zeyad Mustafa
+Date: December 2024
+BTU Cottbus-Senftenberg
+"""
+
+import copy
+import dataclasses
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict
+
+import numpy as np
+import yaml
+
+
+def load_config(filepath: str) -> Dict:
+    """
+    Load a YAML configuration file.
+    
+    Parsed files are memoized on (path, modification time), so repeated
+    calls only hit the YAML parser again after the file has changed.
+    Each call returns its own copy, which callers may modify freely.
+    
+    Parameters
+    ----------
+    filepath : str
+        Path to YAML configuration file
+    
+    Returns
+    -------
+    dict
+        Configuration dictionary
+    
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist
+    """
+    path = Path(filepath).resolve()
+    mtime = path.stat().st_mtime_ns
+    return copy.deepcopy(_load_config_cached(str(path), mtime))
+
+
+@lru_cache(maxsize=16)
+def _load_config_cached(path: str, mtime: int) -> Dict:
+    """Parse a configuration file; ``mtime`` is part of the cache key only."""
+    with open(path, 'r') as f:
+        return yaml.safe_load(f) or {}
+
+
+# Expose the cache controls on the public function (e.g. for tests)
+load_config.cache_clear = _load_config_cached.cache_clear
+load_config.cache_info = _load_config_cached.cache_info
+
+
+def _to_serializable(obj: Any) -> Any:
+    """Convert results objects and NumPy values for JSON encoding."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, Path):
+        return str(obj)
+    if hasattr(obj, '__dict__'):
+        return vars(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def save_results(results: Any, filepath: str):
+    """
+    Save fabrication results to a JSON file.
+    
+    Parameters
+    ----------
+    results : dict, dataclass or object
+        Results to save (e.g. a FabricationReport)
+    filepath : str
+        Output file path
+    """
+    filepath = Path(filepath)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    
+    with open(filepath, 'w') as f:
+        json.dump(results, f, indent=2, default=_to_serializable)
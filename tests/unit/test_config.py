@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Unit tests for configuration utilities
+======================================
+
+Tests for tpl.utils configuration loading and result export.
+
+Author: Zeyad Mustafa
+Date: December 2024
+BTU Cottbus-Senftenberg
+
+Run with: pytest tests/unit/test_config.py -v
+"""
+
+import json
+import os
+
+import pytest
+import numpy as np
+
+from tpl.utils import load_config, save_results
+
+
+class TestLoadConfig:
+    """Test cases for load_config."""
+    
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        load_config.cache_clear()
+        yield
+        load_config.cache_clear()
+    
+    def test_load_config(self, tmp_path):
+        """Test parsing a YAML configuration."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("laser:\n  power: 20\n")
+        
+        config = load_config(str(config_file))
+        assert config == {'laser': {'power': 20}}
+    
+    def test_load_config_is_memoized(self, tmp_path):
+        """Test that unchanged files are parsed only once."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("laser:\n  power: 20\n")
+        
+        first = load_config(str(config_file))
+        first['laser']['power'] = 99  # Callers get independent copies
+        second = load_config(str(config_file))
+        
+        assert second['laser']['power'] == 20
+        assert load_config.cache_info().hits == 1
+    
+    def test_load_config_reloads_modified_file(self, tmp_path):
+        """Test that a changed file is parsed again."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("laser:\n  power: 20\n")
+        load_config(str(config_file))
+        
+        config_file.write_text("laser:\n  power: 30\n")
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        
+        assert load_config(str(config_file))['laser']['power'] == 30
+    
+    def test_missing_file(self, tmp_path):
+        """Test error for nonexistent config file."""
+        with pytest.raises(FileNotFoundError):
+            load_config(str(tmp_path / "missing.yaml"))
+
+
+class TestSaveResults:
+    """Test cases for save_results."""
+    
+    def test_save_results(self, tmp_path):
+        """Test saving results containing NumPy values."""
+        output = tmp_path / "results" / "report.json"
+        save_results({'duration': np.float64(1.5), 'points': np.arange(3)},
+                     str(output))
+        
+        assert json.loads(output.read_text()) == {'duration': 1.5,
+                                                  'points': [0, 1, 2]}
+
+
+if __name__ == "__main__":
+    # Run tests with pytest
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -18,7 +18,7 @@ from pathlib import Path
 import tempfile
 
 # Import modules to test
-from tpl.design import Geometry, Cube, Sphere, Cylinder, Cone
+from tpl.design import Geometry, Cube, Sphere, Cylinder, Cone, Torus
 
 
 class TestCube:
@@ -49,6 +49,44 @@ class TestCube:
         expected = 10 ** 3  # 1000 μm³
         assert abs(volume - expected) < 0.1
         
+    def test_bounds_refresh_after_scale(self):
+        """Test cached bounds are recomputed after a transform."""
+        cube = Cube(size=10, center=(0, 0, 0))
+        assert cube.get_bounds()[0] == (-5, 5)
+        assert abs(cube.get_volume() - 1000) < 1e-6
+
+        cube.scale(2, 1, 1)
+        bounds = cube.get_bounds()
+
+        assert abs(bounds[0][0] - (-10)) < 1e-9
+        assert abs(bounds[0][1] - 10) < 1e-9
+        assert bounds[1] == (-5, 5)
+        assert abs(cube.get_volume() - 2000) < 1e-6
+
+    def test_scale_matches_trimesh(self):
+        """Test in-place scaling, including a mirrored axis."""
+        cone = Cone(radius_base=3, radius_top=1, height=6, center=(1, 2, 3))
+        cone.get_bounds()
+        reference = cone.mesh.copy()
+        reference.apply_transform(np.diag([2.0, -0.5, 1.5, 1.0]))
+
+        cone.scale(2, -0.5, 1.5)
+
+        np.testing.assert_array_equal(cone.mesh.vertices, reference.vertices)
+        np.testing.assert_array_equal(cone.mesh.faces, reference.faces)
+        np.testing.assert_array_equal(np.array(cone.get_bounds()),
+                                      reference.bounds.T)
+        assert cone.get_volume() == pytest.approx(reference.volume)
+
+    def test_bounds_follow_direct_mesh_edits(self):
+        """Test cached properties are dropped when the mesh is edited directly."""
+        cube = Cube(size=10, center=(0, 0, 0))
+        assert cube.get_bounds()[2] == (-5, 5)
+        
+        cube.mesh.apply_translation([0, 0, 5])
+        assert cube.get_bounds()[2] == (0, 10)
+        np.testing.assert_array_equal(cube.zs, cube.mesh.vertices[:, 2])
+
     def test_rectangular_cube(self):
         """Test non-uniform cube (rectangular box)."""
         cube = Cube(size=(10, 5, 3), center=(0, 0, 0))
@@ -58,6 +96,26 @@ class TestCube:
         assert bounds[1] == (-2.5, 2.5)
         assert bounds[2] == (-1.5, 1.5)
 
+    def test_cube_batch(self):
+        """Test batched boxes against individually built cubes."""
+        centers = [(0, 0, 0), (20, 0, 0), (0, 30, 5)]
+        sizes = [(2, 4, 6), (1, 1, 1), (3, 3, 3)]
+        batch = Cube.batch(sizes, centers)
+        reference = Geometry.from_primitives(
+            [Cube(size=s, center=c) for s, c in zip(sizes, centers)])
+        
+        assert batch.num_faces == 3 * 12
+        np.testing.assert_allclose(batch.mesh.vertices, reference.mesh.vertices)
+        np.testing.assert_array_equal(batch.mesh.faces, reference.mesh.faces)
+        assert abs(batch.get_volume() - (48 + 1 + 27)) < 1e-9
+        
+        # Scalar and per-box sizes broadcast to all axes
+        assert abs(Cube.batch(2, centers).get_volume() - 3 * 8) < 1e-9
+        assert abs(Cube.batch([1, 2, 3], centers).get_volume() - 36) < 1e-9
+        
+        with pytest.raises(ValueError):
+            Cube.batch([1, -1, 1], centers)
+
 
 class TestSphere:
     """Test cases for Sphere primitive."""
@@ -94,6 +152,49 @@ class TestSphere:
         # High resolution should have more vertices
         assert high_res.num_vertices > low_res.num_vertices
 
+    def test_sphere_mesh_size_table(self):
+        """Test that tabulated mesh sizes match the generated mesh."""
+        for resolution in [4, 8, 20, 64]:
+            sphere = Sphere(radius=1, resolution=resolution)
+            assert sphere.num_vertices == len(sphere.mesh.vertices)
+            assert sphere.num_faces == len(sphere.mesh.faces)
+
+        # Non-power-of-two resolutions use the next lower level
+        assert Sphere(radius=1, resolution=20).num_faces == 320
+
+        # Levels beyond the common range follow the same closed form
+        sphere = Sphere(radius=1, resolution=512)
+        assert sphere.num_vertices == 10 * 4 ** 7 + 2
+        assert len(sphere.mesh.vertices) == 10 * 4 ** 7 + 2
+
+    def test_sphere_mesh_closed(self):
+        """Test that the symmetric icosphere build is closed and round."""
+        for resolution in [4, 16, 128]:
+            sphere = Sphere(radius=2, center=(1, 0, 0), resolution=resolution)
+            assert sphere.mesh.is_watertight
+            assert sphere.mesh.is_winding_consistent
+            radii = np.linalg.norm(sphere.mesh.vertices - [1, 0, 0], axis=1)
+            np.testing.assert_allclose(radii, 2)
+
+    def test_sphere_seeded_bounds(self):
+        """Test that bounds derived from the template match the mesh."""
+        for resolution in [4, 32]:
+            sphere = Sphere(radius=3.3, center=(1.1, -2, 7), resolution=resolution)
+            np.testing.assert_array_equal(np.array(sphere.get_bounds()),
+                                          sphere.mesh.bounds.T)
+
+    def test_cached_mesh_not_shared(self):
+        """Test that identical spheres get independent meshes."""
+        a = Sphere(radius=5, center=(0, 0, 0))
+        b = Sphere(radius=5, center=(10, 0, 0))
+
+        assert a.mesh is not b.mesh
+        assert np.allclose(b.mesh.vertices - a.mesh.vertices, [10, 0, 0])
+
+        a.mesh.apply_translation([1, 0, 0])
+        c = Sphere(radius=5, center=(0, 0, 0))
+        assert np.allclose(c.mesh.centroid, 0, atol=1e-9)
+
 
 class TestCylinder:
     """Test cases for Cylinder primitive."""
@@ -124,6 +225,125 @@ class TestCylinder:
         expected = np.pi * (5 ** 2) * 10
         assert abs(volume - expected) / expected < 0.01
 
+    def test_cylinder_mesh(self):
+        """Test cylinder mesh size and closure."""
+        cylinder = Cylinder(radius=2, height=4, resolution=24)
+        
+        # Two side triangles and two cap triangles per section
+        assert cylinder.num_faces == 4 * 24
+        assert cylinder.num_vertices == 2 * 24 + 2
+        assert cylinder.mesh.is_watertight
+        assert cylinder.mesh.is_winding_consistent
+
+    def test_cylinders_share_unit_template(self):
+        """Test that cylinder sizes reuse one tessellation per resolution."""
+        from tpl.design import primitives
+
+        primitives._cone_template.cache_clear()
+        cylinders = [Cylinder(radius=r, height=h, resolution=20)
+                     for r, h in [(1, 10), (5, 20), (10, 5)]]
+
+        assert primitives._cone_template.cache_info().currsize == 1
+        assert cylinders[1].get_bounds()[0] == (-5, 5)
+        assert cylinders[2].get_bounds()[2] == (-2.5, 2.5)
+
+
+class TestCone:
+    """Test cases for Cone primitive."""
+    
+    def test_cone_mesh(self):
+        """Test pointed and truncated cone meshes."""
+        pointed = Cone(radius_base=3, radius_top=0, height=6, resolution=16)
+        truncated = Cone(radius_base=3, radius_top=1, height=6, resolution=16)
+        
+        # Pointed: side + base cap; truncated: two side triangles + two caps
+        assert pointed.num_faces == 2 * 16
+        assert truncated.num_faces == 4 * 16
+        assert pointed.mesh.is_watertight
+        assert truncated.mesh.is_watertight
+        
+    def test_cone_winding_outward(self):
+        """Test that generated cone faces are wound outward."""
+        for radius_top in [0, 1, 3]:
+            cone = Cone(radius_base=3, radius_top=radius_top, height=6,
+                        resolution=12)
+            mesh = cone.mesh
+            # Convex solid around the origin: normals point away from it
+            centers = mesh.triangles_center
+            assert np.all(np.einsum('ij,ij->i', mesh.face_normals, centers) > 0)
+            assert cone.get_volume() > 0
+        
+    def test_cone_volume(self):
+        """Test truncated cone volume against the frustum formula."""
+        cone = Cone(radius_base=3, radius_top=1, height=6, resolution=256)
+        
+        expected = np.pi * 6 / 3 * (3 ** 2 + 3 * 1 + 1 ** 2)
+        assert abs(cone.get_volume() - expected) / expected < 0.01
+
+
+class TestTorus:
+    """Test cases for Torus primitive."""
+    
+    def test_torus_mesh(self):
+        """Test torus mesh size, closure and volume."""
+        torus = Torus(major_radius=5, minor_radius=1, resolution=64)
+        
+        assert torus.num_faces == 2 * 63 ** 2
+        assert torus.mesh.is_watertight
+        
+        expected = 2 * np.pi ** 2 * 5 * 1 ** 2
+        assert abs(torus.get_volume() - expected) / expected < 0.01
+
+    def test_closed_form_volumes_match_mesh(self):
+        """Test that the seeded primitive volumes equal the mesh integral."""
+        for geometry in [Cube(size=(1, 2, 3), center=(1, 1, 1)),
+                         Sphere(radius=2, center=(0, 0, 3), resolution=16),
+                         Cylinder(radius=2, height=5, resolution=7),
+                         Cone(radius_base=3, radius_top=1, height=6, resolution=12),
+                         Cone(radius_base=3, radius_top=0, height=6, resolution=5),
+                         Torus(major_radius=5, minor_radius=1, resolution=17)]:
+            assert 'volume' in geometry._cache
+            assert geometry.get_volume() == pytest.approx(geometry.mesh.volume,
+                                                          rel=1e-12)
+
+    def test_disk_cache_roundtrip(self, tmp_path, monkeypatch):
+        """Test that primitive arrays are persisted and reloaded from disk."""
+        from tpl.design import primitives
+        
+        monkeypatch.setattr(primitives, "MESH_CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr(primitives, "MESH_CACHE_MIN_VERTICES", 0)
+        
+        built = primitives._torus_mesh_arrays(5.0, 1.0, 12)
+        files = list(tmp_path.glob("torus-*.npz"))
+        assert len(files) == 1
+        
+        loaded = primitives._torus_mesh_arrays(5.0, 1.0, 12)
+        for a, b in zip(built, loaded):
+            np.testing.assert_array_equal(a, b)
+        
+        # Corrupt and truncated files are rebuilt rather than raising
+        valid = files[0].read_bytes()
+        for damaged in [b"not an npz", valid[:len(valid) // 2]]:
+            files[0].write_bytes(damaged)
+            rebuilt = primitives._torus_mesh_arrays(5.0, 1.0, 12)
+            np.testing.assert_array_equal(rebuilt[1], built[1])
+            assert files[0].read_bytes() == valid
+
+    def test_compiled_builders_match_numpy(self):
+        """Test that the numba Cone/Torus builders match the NumPy path."""
+        pytest.importorskip("numba")
+        from tpl.design import primitives
+        from tpl.design._mesh_kernels import build_cone, build_torus
+
+        for args in [(3.0, 0.0, 6.0, 16), (3.0, 1.0, 6.0, 17)]:
+            compiled = build_cone(*args[:3], *primitives._ring_trig(args[3]))
+            for c, reference in zip(compiled, primitives._cone_arrays(*args)):
+                np.testing.assert_allclose(c, reference, atol=1e-12)
+
+        compiled = build_torus(5.0, 1.0, *primitives._ring_trig(23))
+        for c, reference in zip(compiled, primitives._torus_arrays(5.0, 1.0, 24)):
+            np.testing.assert_allclose(c, reference, atol=1e-12)
+
 
 class TestGeometry:
     """Test cases for general Geometry class."""
@@ -142,6 +362,96 @@ class TestGeometry:
         assert bounds[0][0] <= -5  # Cube left edge
         assert bounds[0][1] >= 20  # Sphere right edge
         
+    def test_from_primitives_matches_concatenate(self):
+        """Test the one-pass combination against trimesh's concatenate."""
+        import trimesh
+        
+        primitives = [Sphere(radius=1, center=(3 * i, 0, 0), resolution=8)
+                      for i in range(5)] + [Cone(2, 0, 3, center=(0, 5, 0))]
+        combined = Geometry.from_primitives(primitives)
+        reference = trimesh.util.concatenate([p.mesh for p in primitives])
+        
+        np.testing.assert_array_equal(combined.mesh.vertices, reference.vertices)
+        np.testing.assert_array_equal(combined.mesh.faces, reference.faces)
+        np.testing.assert_allclose(combined.get_bounds(), reference.bounds.T)
+
+    def test_union_all_disjoint(self):
+        """Test the cascaded union over spatially shuffled disjoint spheres."""
+        from tpl.design.geometry import _morton_order
+
+        order = _morton_order(np.array([[3, 0, 0], [0, 0, 0], [2, 0, 0], [1, 0, 0.]]))
+        assert order.tolist() == [1, 3, 2, 0]
+
+        spheres = [Sphere(radius=0.4, center=(i, 0, 10), resolution=8)
+                   for i in [7, 2, 9, 0, 4, 1, 8, 3, 6, 5, 10]]
+        union = Geometry.union_all(spheres)
+
+        assert union.num_faces == sum(s.num_faces for s in spheres)
+        assert union.get_volume() == pytest.approx(sum(s.get_volume() for s in spheres))
+        with pytest.raises(ValueError):
+            Geometry.union_all([])
+
+    def test_from_line_segments(self):
+        """Test woodpile-style rods follow their segment directions."""
+        segments = [
+            ((0, 0, 0), (10, 0, 0)),   # Along x
+            ((0, 0, 2), (0, 10, 2)),   # Along y
+            ((5, 5, 5), (5, 5, 5)),    # Degenerate, skipped
+        ]
+
+        geometry = Geometry.from_line_segments(segments, width=1.0)
+        bounds = geometry.get_bounds()
+
+        np.testing.assert_allclose(bounds[0], (-0.5, 10), atol=1e-9)
+        np.testing.assert_allclose(bounds[1], (-0.5, 10), atol=1e-9)
+        np.testing.assert_allclose(bounds[2], (-0.5, 2.5), atol=1e-9)
+        assert geometry.num_faces == 2 * 64  # Two 16-section cylinders
+
+    def test_from_line_segments_fast(self):
+        """Test the merged-lattice constructor on an endpoint array."""
+        endpoints = np.array([
+            [(0, 0, 0), (10, 0, 0)],
+            [(5, -5, 0.5), (5, 5, 0.5)],   # Crosses the first rod
+        ], dtype=float)
+
+        geometry = Geometry.from_line_segments_fast(endpoints, width=1.0)
+        bounds = geometry.get_bounds()
+
+        np.testing.assert_allclose(bounds[0], (0, 10), atol=1e-6)
+        np.testing.assert_allclose(bounds[1], (-5, 5), atol=1e-6)
+        np.testing.assert_allclose(bounds[2], (-0.5, 1.0), atol=1e-6)
+
+    def test_compiled_segments_match_numpy(self, monkeypatch):
+        """Test that the numba segment kernel matches the NumPy path."""
+        pytest.importorskip("numba")
+        from tpl.design import geometry as geometry_module
+
+        rng = np.random.default_rng(0)
+        segments = [((0, 0, 0), (0, 0, -5))] + [tuple(rng.random((2, 3)) * 20)
+                                                for _ in range(50)]
+        compiled = Geometry.from_line_segments(segments)
+
+        monkeypatch.setattr(geometry_module, "NUMBA_AVAILABLE", False)
+        reference = Geometry.from_line_segments(segments)
+
+        np.testing.assert_allclose(compiled.mesh.vertices,
+                                   reference.mesh.vertices, atol=1e-9)
+
+    def test_from_function_blocks(self):
+        """Test that block-wise meshing matches a single block."""
+        pytest.importorskip("skimage")
+
+        def sphere(x, y, z):
+            return x**2 + y**2 + z**2 - 16
+
+        bounds = ((-5, 5), (-5, 5), (-5, 5))
+        single = Geometry.from_function(sphere, bounds, resolution=0.5)
+        tiled = Geometry.from_function(sphere, bounds, resolution=0.5, block_size=7)
+
+        assert tiled.num_faces == single.num_faces
+        assert tiled.get_volume() == pytest.approx(single.get_volume(), rel=1e-6)
+        assert abs(single.get_volume() - (4/3) * np.pi * 64) / (4/3 * np.pi * 64) < 0.05
+
     def test_save_load_stl(self):
         """Test saving and loading STL files."""
         cube = Cube(size=10, center=(0, 0, 10))
@@ -163,7 +473,64 @@ class TestGeometry:
             for i in range(3):
                 assert abs(original_bounds[i][0] - loaded_bounds[i][0]) < 0.1
                 assert abs(original_bounds[i][1] - loaded_bounds[i][1]) < 0.1
-    
+
+    def test_save_stl_is_binary(self):
+        """Test that STL export uses the 50-byte binary triangle layout."""
+        cube = Cube(size=10, center=(0, 0, 10))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = Path(tmpdir) / "test_cube.stl"
+            cube.save(str(filepath))
+
+            data = filepath.read_bytes()
+            n_faces = int(np.frombuffer(data[80:84], dtype='<u4')[0])
+            assert n_faces == 12
+            assert len(data) == 84 + 50 * n_faces
+
+    def test_load_stl_matches_trimesh(self):
+        """Test the direct binary reader and the ASCII fallback."""
+        import trimesh
+
+        sphere = Sphere(radius=5, resolution=16)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            binary = Path(tmpdir) / "sphere.stl"
+            sphere.save(str(binary))
+            loaded = Geometry.from_stl(str(binary)).mesh
+            reference = trimesh.load(str(binary))
+            np.testing.assert_array_equal(loaded.vertices, reference.vertices)
+            np.testing.assert_array_equal(loaded.faces, reference.faces)
+
+            ascii_file = Path(tmpdir) / "sphere_ascii.stl"
+            sphere.mesh.export(str(ascii_file), file_type='stl_ascii')
+            assert Geometry._load_stl_binary(ascii_file.read_bytes()) is None
+            assert Geometry.from_stl(str(ascii_file)).num_faces == sphere.num_faces
+
+    def test_load_stl_disk_cache(self, tmp_path, monkeypatch):
+        """Test that reloading an STL file is served from the disk cache."""
+        from tpl.design import geometry
+
+        monkeypatch.setattr(geometry, "STL_CACHE_DIR", str(tmp_path / "cache"))
+        monkeypatch.setattr(geometry, "STL_CACHE_MIN_FACES", 0)
+
+        filepath = tmp_path / "sphere.stl"
+        Sphere(radius=5, resolution=16).save(str(filepath))
+        first = Geometry.from_stl(str(filepath)).mesh
+        assert len(list((tmp_path / "cache").glob("*.npz"))) == 1
+
+        second = Geometry.from_stl(str(filepath)).mesh
+        np.testing.assert_array_equal(second.vertices, first.vertices)
+        np.testing.assert_array_equal(second.faces, first.faces)
+        np.testing.assert_array_equal(second.face_normals, first.face_normals)
+
+        # A truncated cache entry is reparsed and rewritten
+        entry = next((tmp_path / "cache").glob("*.npz"))
+        valid = entry.read_bytes()
+        entry.write_bytes(valid[:len(valid) // 2])
+        third = Geometry.from_stl(str(filepath)).mesh
+        np.testing.assert_array_equal(third.faces, first.faces)
+        assert entry.read_bytes() == valid
+
     def test_transform_translation(self):
         """Test translating geometry."""
         cube = Cube(size=10, center=(0, 0, 0))
@@ -188,6 +555,67 @@ class TestGeometry:
         assert abs(center_y - 5) < 0.1
         assert abs(center_z - 5) < 0.1
         
+    def test_transform_matches_trimesh(self):
+        """Test the affine fast path against trimesh, including reflection."""
+        rng = np.random.default_rng(1)
+        q, _ = np.linalg.qr(rng.normal(size=(3, 3)))
+        for linear in [q * 2.5, np.diag([-1.0, 1.0, 1.0]), np.diag([2.0, 0.5, 3.0]),
+                       np.eye(3)]:
+            matrix = np.eye(4)
+            matrix[:3, :3] = linear
+            matrix[:3, 3] = [1, -2, 3]
+            
+            geometry = Cylinder(radius=2, height=5, resolution=16)
+            reference = geometry.mesh.copy()
+            reference.apply_transform(matrix)
+            geometry.transform(matrix)
+            
+            np.testing.assert_allclose(geometry.mesh.vertices, reference.vertices,
+                                       atol=1e-12)
+            np.testing.assert_array_equal(geometry.mesh.faces, reference.faces)
+            assert geometry.get_volume() > 0
+
+    def test_transform_carries_bounds(self):
+        """Test that bounds mapped through axis-aligned transforms are exact."""
+        matrix = np.array([[0, -2.0, 0, 1],
+                           [0.5, 0, 0, -2],
+                           [0, 0, 3.0, 3],
+                           [0, 0, 0, 1]])
+        sphere = Sphere(radius=2, center=(1, 2, 3), resolution=16)
+        sphere.get_bounds()
+        sphere.transform(matrix)
+
+        assert 'bounds' in sphere._cache
+        np.testing.assert_array_equal(np.array(sphere.get_bounds()),
+                                      sphere.mesh.bounds.T)
+
+    def test_vertex_columns(self):
+        """Test contiguous per-axis vertex columns and their refresh."""
+        cube = Cube(size=2, center=(1, 2, 3))
+        
+        for axis, column in enumerate([cube.xs, cube.ys, cube.zs]):
+            assert column.flags['C_CONTIGUOUS']
+            np.testing.assert_array_equal(column, cube.mesh.vertices[:, axis])
+        
+        cube.scale(1, 1, 2)
+        np.testing.assert_array_equal(cube.zs, cube.mesh.vertices[:, 2])
+        
+    def test_column_bounds_match_mesh(self):
+        """Test primitive bounds from vertex columns against trimesh."""
+        rotation = np.eye(4)
+        rotation[:2, :2] = [[0.6, -0.8], [0.8, 0.6]]
+        for geometry in [Sphere(radius=3, center=(1, 2, 3)),
+                         Cone(radius_base=2, radius_top=0, height=4),
+                         Torus(major_radius=4, minor_radius=1, resolution=20)]:
+            geometry.transform(rotation)
+            np.testing.assert_allclose(geometry.get_bounds(),
+                                       geometry.mesh.bounds.T)
+        
+        # A reassigned mesh may carry unreferenced vertices
+        sphere = Sphere(radius=1)
+        sphere.mesh = sphere.mesh.copy()
+        assert not sphere._dense_vertices
+        
     def test_transform_scaling(self):
         """Test scaling geometry."""
         cube = Cube(size=10, center=(0, 0, 0))
@@ -236,6 +664,72 @@ class TestGeometry:
         assert slices[1].get_area() > slices[0].get_area()
         assert slices[1].get_area() > slices[2].get_area()
 
+    def test_sweep_sections_match_multiplane(self):
+        """Test that the sweep slicer matches trimesh for unsorted heights."""
+        sphere = Sphere(radius=10, center=(0, 0, 0))
+        heights = np.array([4.0, -9.5, 0.0, 7.25, -3.0, 12.0])
+        
+        expected = sphere.mesh.section_multiplane(
+            plane_origin=[0, 0, 0], plane_normal=[0, 0, 1], heights=heights
+        )
+        sections = sphere._sweep_sections(heights)
+        
+        assert len(sections) == len(heights)
+        for ref, section in zip(expected, sections):
+            if ref is None:
+                assert section is None
+                continue
+            np.testing.assert_allclose(section.vertices, ref.vertices)
+            np.testing.assert_array_equal(section.metadata['face_index'],
+                                          ref.metadata['face_index'])
+
+    def test_plane_segments_on_vertices_and_edges(self):
+        """Test planes through mesh vertices and coplanar faces."""
+        cube = Cube(size=10, center=(0, 0, 10))
+        heights = np.array([15.0, 5.0, 10.0, 20.0])
+
+        expected = cube.mesh.section_multiplane(
+            plane_origin=[0, 0, 0], plane_normal=[0, 0, 1], heights=heights
+        )
+        lines, face_index, counts = cube._plane_segments(heights)
+
+        assert counts.tolist() == [0 if ref is None else len(ref.metadata['face_index'])
+                                   for ref in expected]
+        np.testing.assert_array_equal(
+            face_index, np.concatenate([ref.metadata['face_index']
+                                        for ref in expected if ref is not None]))
+
+    def test_compiled_plane_segments_match_numpy(self, monkeypatch):
+        """Test that the numba slice kernel matches the NumPy path."""
+        pytest.importorskip("numba")
+        from tpl.design import geometry
+
+        torus = Torus(major_radius=10, minor_radius=3, center=(0, 0, 5))
+        heights = np.array([5.0, 2.0, 8.0, 7.5, 0.0])
+
+        compiled = torus._plane_segments(heights)
+        monkeypatch.setattr(geometry, 'NUMBA_AVAILABLE', False)
+        for c, reference in zip(compiled, torus._plane_segments(heights)):
+            np.testing.assert_array_equal(c, reference)
+
+    def test_closed_form_slice_area(self):
+        """Test analytic section areas of boxes and cones."""
+        cube = Cube(size=(2, 3, 4), center=(0, 0, 2))
+        assert [s.get_area() for s in cube.slice([0.5, 3.5])] == [6.0, 6.0]
+
+        cone = Cone(radius_base=3, radius_top=1, height=6, center=(0, 0, 3),
+                    resolution=12)
+        section = cone.slice([1.5])[0]
+        # Regular 12-gon of circumradius 2.5 at a quarter of the height
+        expected = 6 * np.sin(2 * np.pi / 12) * 2.5 ** 2
+        assert section.get_area() == pytest.approx(expected)
+
+        # Editing the mesh invalidates the closed form
+        cube.scale(2, 1, 1)
+        assert cube.slice([1.0])[0]._area is None
+        with pytest.raises(ValueError):
+            cube.get_area()
+
 
 class TestGeometryOperations:
     """Test geometry boolean and combination operations."""
@@ -273,6 +767,26 @@ class TestGeometryOperations:
         
         # Result should be smaller than original cube
         assert result.get_volume() < cube.get_volume()
+        
+    def test_disjoint_booleans_skip_engine(self):
+        """Test boolean results for solids with separated bounding boxes."""
+        cube1 = Cube(size=10, center=(0, 0, 10))
+        cube2 = Cube(size=4, center=(20, 0, 10))
+        
+        union = cube1.union(cube2)
+        assert abs(union.get_volume() - (1000 + 64)) < 1e-9
+        assert union.num_faces == 24
+        
+        intersection = cube1.intersection(cube2)
+        assert intersection.num_faces == 0
+        assert intersection.num_vertices == 0
+        assert intersection.get_volume() == 0
+        assert intersection.get_bounds() == ((0, 0), (0, 0), (0, 0))
+        assert "faces=0" in repr(intersection)
+        
+        difference = cube1.difference(cube2)
+        assert abs(difference.get_volume() - 1000) < 1e-9
+        assert difference.mesh is not cube1.mesh
 
 
 class TestValidation:
@@ -287,7 +801,17 @@ class TestValidation:
         """Test that negative radius raises error."""
         with pytest.raises(ValueError):
             Sphere(radius=-5, center=(0, 0, 0))
-            
+
+    def test_nan_dimensions_rejected(self):
+        """Test that NaN sizes fail the positivity checks."""
+        nan = float('nan')
+        for build in [lambda: Cube(size=(1, nan, 1)),
+                      lambda: Cylinder(radius=nan, height=1),
+                      lambda: Cone(radius_base=1, radius_top=nan, height=1),
+                      lambda: Torus(major_radius=5, minor_radius=nan)]:
+            with pytest.raises(ValueError):
+                build()
+
     def test_invalid_file_format(self):
         """Test loading unsupported file format."""
         with pytest.raises(ValueError):
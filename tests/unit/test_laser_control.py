@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Unit tests for laser control
+============================
+
+Tests for tpl.core.laser_control power calibration, ramps and status
+caching, using mock mode or an in-memory serial port.
+
+Author: Zeyad Mustafa
+Date: December 2024
+BTU Cottbus-Senftenberg
+
+Run with: pytest tests/unit/test_laser_control.py -v
+"""
+
+import pytest
+
+from tpl.core import laser_control
+from tpl.core.laser_control import LaserControl, LaserError
+
+
+class FakeSerial:
+    """In-memory serial port that answers each line from a reply list."""
+
+    def __init__(self, replies=None):
+        self.replies = list(replies or [])
+        self.written = b""
+        self.is_open = True
+
+    def write(self, data):
+        self.written += data
+        return len(data)
+
+    def readline(self):
+        if not self.replies:
+            return b""  # Read timed out
+        return (self.replies.pop(0) + "\r\n").encode()
+
+    def close(self):
+        self.is_open = False
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(laser_control.time, "sleep", lambda seconds: None)
+
+
+@pytest.fixture
+def laser():
+    """Laser wired to a fake serial port."""
+    laser = LaserControl(mock=False)
+    laser._serial = FakeSerial()
+    laser._connected = True
+    return laser
+
+
+@pytest.fixture
+def calibrated(no_sleep):
+    """Mock laser calibrated at 1, 5, 10 and 20 mW."""
+    laser = LaserControl(mock=True)
+    laser.connect()
+    laser.calibrate_power([1, 5, 10, 20])
+    return laser
+
+
+class TestCalibration:
+    """Test cases for calibrated power setpoints."""
+
+    def test_uncalibrated_setpoint(self, laser):
+        """Without calibration the request is sent as is."""
+        assert laser._setpoint_for(12.5) == 12.5
+
+    def test_interpolates_table(self, calibrated):
+        """Measured table points map back to their set powers."""
+        set_powers, measured_powers = calibrated._calibration
+        for set_power, measured in zip(set_powers, measured_powers):
+            assert calibrated._setpoint_for(round(measured, 2)) == pytest.approx(set_power, abs=0.01)
+
+    def test_zero_power_is_zero(self, calibrated):
+        """Low requests interpolate towards zero instead of clamping."""
+        assert calibrated._setpoint_for(0) == 0.0
+        assert 0 < calibrated._setpoint_for(0.5) < 1
+
+    def test_above_range_raises(self, calibrated):
+        """Requests above the measured range are rejected."""
+        with pytest.raises(LaserError, match="calibrated range"):
+            calibrated.set_power(25)
+
+    def test_setpoints_memoized(self, calibrated):
+        """Setpoints are cached per 0.01 mW and cleared on demand."""
+        calibrated.set_power(7.5)
+        assert 750 in calibrated._calibration_cache
+
+        calibrated.clear_calibration_cache()
+        assert calibrated._calibration_cache == {}
+
+    def test_recalibration_uses_raw_setpoints(self, calibrated):
+        """A new calibration measures against uncalibrated setpoints."""
+        data = calibrated.calibrate_power([2, 4])
+        assert data['set_powers'] == [2, 4]
+        assert calibrated._calibration[0][0] == 0.0
+
+
+class TestRamp:
+    """Test cases for ramp_power."""
+
+    def test_ramp_single_transfer(self, laser):
+        """All setpoints go out in one write and are acknowledged together."""
+        laser._serial.replies = ["OK", "OK", "OK"]
+        laser.ramp_power([1, 2, 3])
+
+        assert laser._serial.written == b"POWER 1.00\r\nPOWER 2.00\r\nPOWER 3.00\r\n"
+        assert laser._current_power == 3
+
+    def test_ramp_rejected_step(self, laser):
+        """A step that is not acknowledged raises."""
+        laser._serial.replies = ["OK", "ERR", "OK"]
+        with pytest.raises(LaserError, match="2.00"):
+            laser.ramp_power([1, 2, 3])
+        assert laser._current_power == 1
+
+    def test_ramp_missing_replies(self, laser):
+        """A timeout before all replies arrive raises."""
+        laser._serial.replies = ["OK"]
+        with pytest.raises(LaserError, match="Expected 2 responses"):
+            laser.ramp_power([1, 2])
+
+    def test_ramp_validates_before_sending(self, laser):
+        """An out-of-range step fails before anything is written."""
+        with pytest.raises(LaserError):
+            laser.ramp_power([1, 500])
+        assert laser._serial.written == b""
+
+
+class TestStatusCache:
+    """Test cases for get_status caching."""
+
+    def test_status_reused_within_ttl(self, laser):
+        """Polling within the TTL does not query the laser again."""
+        laser._serial.replies = ["10.0", "24.5", "ON"]
+        first = laser.get_status()
+        second = laser.get_status()
+
+        assert first == second
+        assert first['temperature'] == 24.5
+        assert laser._serial.written.count(b"TEMP?") == 1
+
+    def test_fresh_status(self, laser):
+        """fresh=True always queries the laser."""
+        laser._serial.replies = ["10.0", "24.5", "ON", "10.0", "26.0", "OFF"]
+        laser.get_status()
+        status = laser.get_status(fresh=True)
+
+        assert status['temperature'] == 26.0
+        assert status['mode_lock'] is False
+
+    def test_set_power_invalidates_status(self, laser):
+        """Changing the power discards the cached reply."""
+        laser._serial.replies = ["10.0", "24.5", "ON", "OK", "5.0", "24.5", "ON"]
+        laser.get_status()
+        laser.set_power(5)
+
+        assert laser.get_status()['power'] == 5.0
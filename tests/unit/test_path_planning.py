@@ -18,7 +18,7 @@ from pathlib import Path
 import tempfile
 
 # Import modules to test
-from tpl.design import PathPlanner, Toolpath, Cube, Sphere
+from tpl.design import PathPlanner, Toolpath, Geometry, Cube, Sphere
 from tpl.design.path_planning import (
     RectilinearFill,
     ConcentricFill, 
@@ -125,7 +125,32 @@ class TestToolpath:
         
         # Time should be positive
         assert stats["time_estimate"] > 0
-        
+
+    def test_statistics_cache_invalidation(self, sample_toolpath):
+        """Test that cached statistics follow replaced arrays."""
+        stats = sample_toolpath.get_statistics()
+        assert sample_toolpath.get_statistics() == stats
+
+        sample_toolpath.speeds = sample_toolpath.speeds * 2
+        updated = sample_toolpath.get_statistics()
+        assert updated["time_estimate"] == pytest.approx(stats["time_estimate"] / 2)
+        assert updated["total_length"] == stats["total_length"]
+
+    def test_compiled_statistics_match_numpy(self, sample_toolpath, monkeypatch):
+        """Test that the fused numba statistics match the NumPy reductions."""
+        pytest.importorskip("numba")
+        from tpl.design import path_planning
+
+        sample_toolpath.speeds = np.linspace(1000.0, 2000.0, sample_toolpath.num_points)
+        compiled = sample_toolpath._compute_statistics()
+
+        monkeypatch.setattr(path_planning, "NUMBA_AVAILABLE", False)
+        reference = sample_toolpath._compute_statistics()
+
+        assert compiled.keys() == reference.keys()
+        for key, value in reference.items():
+            assert compiled[key] == pytest.approx(value, rel=1e-5)
+
     def test_save_load_gcode(self, sample_toolpath):
         """Test saving and loading G-code."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -142,6 +167,105 @@ class TestToolpath:
             assert loaded.num_points == sample_toolpath.num_points
             assert abs(loaded.total_length - sample_toolpath.total_length) < 0.1
             
+    def test_compiled_gcode_text_matches_format(self):
+        """Test that the compiled G-code writer matches %-formatting."""
+        pytest.importorskip("numba")
+        rows = np.array([
+            [-0.0, 0.00005, -0.00005, 0.5, 0.005],
+            [1.5, -2.25, 123.456789, 2.5, 0.015],
+            [-1e6, 3e-7, 9.99995, 50000.0, 12.345],
+        ], dtype=np.float32)
+
+        layout = Toolpath._fixed_layout(Toolpath.GCODE_LINE)
+        text = Toolpath._format_fixed(rows, layout)
+
+        expected = "".join(Toolpath.GCODE_LINE % tuple(row) for row in rows.tolist())
+        assert text == expected
+
+    def test_threaded_export_matches_serial(self, sample_toolpath, monkeypatch):
+        """Test that block formatting on worker threads writes the same file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            serial = Path(tmpdir) / "serial.gcode"
+            threaded = Path(tmpdir) / "threaded.gcode"
+
+            sample_toolpath.save(str(serial))
+            monkeypatch.setattr(Toolpath, "GCODE_CHUNK_ROWS", 7)
+            monkeypatch.setattr(Toolpath, "THREADED_WRITE_MIN_POINTS", 1)
+            sample_toolpath.save(str(threaded))
+
+            assert threaded.read_text() == serial.read_text()
+
+    def test_load_gcode_reordered_words(self):
+        """Test loading G-code whose moves are not in the saved layout."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = Path(tmpdir) / "hand_written.gcode"
+            filepath.write_text(
+                "; Layers: 3\n"
+                "G1 Y2 X1.5 P10 ; comment\n"
+                "G1 Z3 F100\n"
+                "G0 X9\n"
+            )
+
+            loaded = Toolpath.load(str(filepath))
+
+            assert loaded.num_layers == 3
+            np.testing.assert_array_equal(loaded.get_coordinates(),
+                                          [[1.5, 2, 0], [0, 0, 3]])
+            np.testing.assert_array_equal(loaded.powers, [10, 0])
+            np.testing.assert_array_equal(loaded.speeds, [0, 100])
+
+    def test_save_load_binary(self, sample_toolpath):
+        """Test binary toolpath round trip."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = Path(tmpdir) / "test_toolpath.tpb"
+
+            sample_toolpath.save(str(filepath))
+            loaded = Toolpath.load(str(filepath))
+
+            assert loaded.num_points == sample_toolpath.num_points
+            assert loaded.num_layers == sample_toolpath.num_layers
+            np.testing.assert_array_equal(loaded.get_coordinates(),
+                                          sample_toolpath.get_coordinates())
+            np.testing.assert_allclose(loaded.powers, sample_toolpath.powers)
+            np.testing.assert_allclose(loaded.speeds, sample_toolpath.speeds)
+
+    def test_save_load_json(self, sample_toolpath):
+        """Test JSON toolpath round trip."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = Path(tmpdir) / "test_toolpath.json"
+
+            sample_toolpath.save(str(filepath))
+            loaded = Toolpath.load(str(filepath))
+
+            assert loaded.num_layers == sample_toolpath.num_layers
+            np.testing.assert_array_equal(loaded.get_coordinates(),
+                                          sample_toolpath.get_coordinates())
+            np.testing.assert_allclose(loaded.powers, sample_toolpath.powers)
+            np.testing.assert_allclose(loaded.speeds, sample_toolpath.speeds)
+
+    def test_load_binary_rejects_other_files(self):
+        """Test that non-toolpath files are rejected."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = Path(tmpdir) / "bogus.tpb"
+            filepath.write_bytes(b"not a toolpath file at all")
+
+            with pytest.raises(ValueError):
+                Toolpath.load_binary(str(filepath))
+
+    def test_lod_permutation(self, sample_toolpath):
+        """Test level-of-detail ordering is a coarse-to-fine permutation."""
+        perm = sample_toolpath.lod_permutation()
+
+        assert sorted(perm) == list(range(sample_toolpath.num_points))
+        assert sample_toolpath.lod_permutation() is perm  # cached
+
+        # A short prefix should already span most of the structure
+        coords = sample_toolpath.get_coordinates()
+        prefix = coords[perm[:64]]
+        full_extent = coords.max(axis=0) - coords.min(axis=0)
+        prefix_extent = prefix.max(axis=0) - prefix.min(axis=0)
+        assert np.all(prefix_extent > 0.5 * full_extent)
+
     def test_export_to_csv(self, sample_toolpath):
         """Test CSV export."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -166,6 +290,87 @@ class TestToolpath:
         # Z should be reasonable (above substrate)
         assert np.all(coords[:, 2] >= 0)
 
+    def test_coordinate_dtypes(self, sample_toolpath):
+        """Test float32 storage with optional upcast and nm integers."""
+        assert sample_toolpath.get_coordinates().dtype == np.float32
+        assert sample_toolpath.get_coordinates(np.float64).dtype == np.float64
+
+        coords_nm = sample_toolpath.get_coordinates_nm()
+        assert coords_nm.dtype == np.int32
+        np.testing.assert_allclose(coords_nm / 1000,
+                                   sample_toolpath.get_coordinates(), atol=1e-3)
+
+    def test_points_view_matches_axes(self):
+        """Test that points is a view over the per-axis arrays."""
+        points = np.array([[0.0, 0.0, 0.0], [3.0, 4.0, 0.0], [3.0, 4.0, 12.0]])
+        toolpath = Toolpath(points, np.full(3, 20.0), np.full(3, 1000.0), 1)
+
+        np.testing.assert_array_equal(toolpath.points, points)
+        assert np.shares_memory(toolpath.points, toolpath._x)
+        assert toolpath._x.flags['C_CONTIGUOUS']
+        assert toolpath.total_length == pytest.approx(17.0)
+
+    def test_from_axes(self):
+        """Test building a toolpath from separate axis arrays."""
+        x = np.array([0.0, 3.0, 3.0])
+        y = np.array([0.0, 4.0, 4.0])
+        z = np.array([0.0, 0.0, 12.0])
+        toolpath = Toolpath.from_axes(x, y, z, np.full(3, 20.0), np.full(3, 1000.0), 1)
+
+        np.testing.assert_array_equal(toolpath.points, np.column_stack([x, y, z]))
+        assert toolpath.total_length == pytest.approx(17.0)
+
+    def test_plot_segments_lod(self):
+        """Test that plotted segments are real consecutive path segments."""
+        points = np.arange(30, dtype=float).reshape(10, 3)
+        toolpath = Toolpath(points, np.ones(10), np.ones(10), 1)
+
+        segments = toolpath._plot_segments(None)
+        np.testing.assert_array_equal(segments[:, 0], points[:-1])
+        np.testing.assert_array_equal(segments[:, 1], points[1:])
+        assert toolpath._plot_segments(None) is segments
+
+        # Decimation keeps the segments starting at the first LOD points
+        perm = toolpath.lod_permutation()
+        starts = np.sort(perm[perm < 9][:3])
+        segments = toolpath._plot_segments(3)
+        np.testing.assert_array_equal(segments[:, 0], points[starts])
+        np.testing.assert_array_equal(segments[:, 1], points[starts + 1])
+
+        toolpath.points = points * 2
+        np.testing.assert_array_equal(toolpath._plot_segments(3)[:, 0], points[starts] * 2)
+
+    def test_records_follow_updates(self):
+        """Test the cached per-point records and their invalidation."""
+        points = np.array([[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]])
+        toolpath = Toolpath(points, np.array([10.0, 20.0]), np.array([100.0, 200.0]), 1)
+
+        records = toolpath._as_records()
+        assert records.dtype.names == ('x', 'y', 'z', 'power', 'speed')
+        np.testing.assert_array_equal(records['y'], [1.0, 4.0])
+        np.testing.assert_array_equal(records['speed'], [100.0, 200.0])
+        assert toolpath._as_records() is records
+
+        toolpath.powers = np.array([30.0, 40.0])
+        np.testing.assert_array_equal(toolpath._as_records()['power'], [30.0, 40.0])
+
+    def test_storage_dtype(self):
+        """Test float32 storage by default and the float64 option."""
+        points = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+        toolpath = Toolpath(points, np.full(2, 20.0), np.full(2, 1000.0), 1)
+        assert toolpath.points.dtype == np.float32
+        assert toolpath.powers.dtype == np.float32
+        assert toolpath.speeds.dtype == np.float32
+
+        far = points + 2e7
+        with pytest.raises(ValueError):
+            Toolpath(far, np.full(2, 20.0), np.full(2, 1000.0), 1)
+
+        toolpath = Toolpath(far, np.full(2, 20.0), np.full(2, 1000.0), 1,
+                            dtype=np.float64)
+        assert toolpath.points.dtype == np.float64
+        assert toolpath.total_length == pytest.approx(1.0)
+
 
 class TestFillPatterns:
     """Test different fill pattern strategies."""
@@ -188,7 +393,115 @@ class TestFillPatterns:
         # Should have alternating scan directions
         coords = toolpath.get_coordinates()
         assert len(coords) > 0
+
+    def test_rectilinear_serpentine_order(self, test_geometry):
+        """Test that bidirectional hatch lines alternate direction."""
+        planner = PathPlanner(
+            layer_height=0.5,
+            hatch_distance=0.5,
+            fill_pattern="rectilinear",
+            optimize_travel=False
+        )
+
+        toolpath = planner.generate(test_geometry)
+        coords = toolpath.get_coordinates()
+
+        # First layer scans along X: line 0 forward, line 1 backward
+        assert coords[0, 0] < coords[1, 0]
+        assert coords[2, 0] > coords[3, 0]
+        assert coords[0, 1] == coords[1, 1]
+        assert coords[2, 1] > coords[0, 1]
+
+    def test_compiled_rectilinear_matches_numpy(self, test_geometry, monkeypatch):
+        """Test that the numba fill kernel matches the NumPy fill."""
+        pytest.importorskip("numba")
+        from tpl.design import path_planning
+
+        # Plain Geometry so the Cube fast path is not taken
+        geometry = Geometry(test_geometry.mesh.copy())
+        planner = PathPlanner(layer_height=0.5, optimize_travel=False)
+        compiled = planner.generate(geometry)
+
+        monkeypatch.setattr(path_planning, "NUMBA_AVAILABLE", False)
+        reference = planner.generate(geometry)
+
+        np.testing.assert_allclose(compiled.get_coordinates(),
+                                   reference.get_coordinates())
+        np.testing.assert_array_equal(compiled.powers, reference.powers)
+
+    def test_parallel_layer_fill_matches_serial(self, test_geometry, monkeypatch):
+        """Test that filling layers in worker processes gives the same path."""
+        from tpl.design import path_planning
+
+        # Worker processes are only used for the uncompiled fills
+        monkeypatch.setattr(path_planning, "NUMBA_AVAILABLE", False)
+        monkeypatch.setattr(PathPlanner, "PARALLEL_MIN_LAYERS", 1)
+        serial = PathPlanner(layer_height=1.0, fill_pattern="spiral")
+        parallel = PathPlanner(layer_height=1.0, fill_pattern="spiral", n_jobs=2)
+
+        expected = serial.generate(test_geometry)
+        toolpath = parallel.generate(test_geometry)
+
+        np.testing.assert_array_equal(toolpath.get_coordinates(),
+                                      expected.get_coordinates())
+
+    def test_compiled_contour_fill_matches_per_layer(self, test_geometry):
+        """Test that the compiled concentric and spiral fills match the per-layer fills."""
+        pytest.importorskip("numba")
+        z_positions = np.arange(5.0, 15.0, 1.0)
+        slices = Geometry(test_geometry.mesh.copy()).slice(z_positions)
+
+        for pattern in ("concentric", "spiral"):
+            planner = PathPlanner(hatch_distance=0.3, fill_pattern=pattern)
+            points, counts = planner._compiled_contour_fill(slices, z_positions)
+            layers = [planner._generate_layer_fill(s, z, i)
+                      for i, (s, z) in enumerate(zip(slices, z_positions))]
+
+            np.testing.assert_array_equal(counts, [len(layer) for layer in layers])
+            np.testing.assert_array_equal(points,
+                                          np.concatenate(layers).astype(np.float32))
+
+    def test_axis_lines_exact_multiple(self):
+        """Test that a span that is a multiple of the step gets no extra line."""
+        # np.arange(1.0, 1.3, 0.1) yields four values due to rounding
+        lines = PathPlanner._axis_lines(1.0, 1.3, 0.1)
+        np.testing.assert_allclose(lines, [1.0, 1.1, 1.2])
+        
+        reverse = PathPlanner._axis_lines(1.3, 1.0, -0.1)
+        np.testing.assert_allclose(reverse, [1.3, 1.2, 1.1])
+        
+    def test_vectorized_rectilinear_matches_per_layer(self, test_geometry):
+        """Test that the all-layer NumPy fill matches filling layer by layer."""
+        planner = PathPlanner(layer_height=0.5, optimize_travel=False)
+        z_positions = np.linspace(0.25, 9.75, 20)
+        slices = Geometry(test_geometry.mesh.copy()).slice(z_positions)
+
+        points, counts = planner._vectorized_rectilinear_fill(slices, z_positions)
+        layers = [planner._generate_layer_fill(s, z, i)
+                  for i, (z, s) in enumerate(zip(z_positions, slices))]
+
+        np.testing.assert_array_equal(points, np.concatenate(layers))
+        np.testing.assert_array_equal(counts, [len(layer) for layer in layers])
+
+    def test_cube_fast_path_matches_sliced(self, test_geometry):
+        """Test that the axis-aligned Cube fill matches slicing the mesh."""
+        planner = PathPlanner(layer_height=0.5, optimize_travel=False)
+        fast = planner.generate(test_geometry)
+        sliced = planner.generate(Geometry(test_geometry.mesh.copy()))
+
+        np.testing.assert_allclose(fast.get_coordinates(),
+                                   sliced.get_coordinates())
+        np.testing.assert_array_equal(fast.speeds, sliced.speeds)
+        assert fast.num_layers == sliced.num_layers
+
+    def test_box_layer_count_excludes_top_face(self):
+        """Test that layers at the top face are not filled, even alone."""
+        bounds = ((0, 10), (0, 10), (0, 5))
         
+        assert PathPlanner._box_layer_count(bounds, np.array([0.0, 2.5, 5.0])) == 2
+        assert PathPlanner._box_layer_count(bounds, np.array([5.0])) == 0
+        assert PathPlanner._box_layer_count(bounds, np.array([0.0])) == 1
+
     def test_concentric_fill(self, test_geometry):
         """Test concentric fill pattern."""
         planner = PathPlanner(
@@ -248,6 +561,17 @@ class TestLayering:
         
         assert last_z > first_z
         
+    def test_layer_spacing_matches_layer_height(self):
+        """Test that consecutive layers are exactly layer_height apart."""
+        cube = Cube(size=10, center=(0, 0, 10))
+        planner = PathPlanner(layer_height=0.3)
+
+        toolpath = planner.generate(cube)
+        layer_z = np.unique(toolpath.get_coordinates(np.float64)[:, 2])
+
+        assert layer_z[0] == pytest.approx(5.0)
+        np.testing.assert_allclose(np.diff(layer_z), 0.3, atol=1e-5)
+
     def test_adaptive_layer_height(self):
         """Test varying layer height for different regions."""
         planner = PathPlanner(layer_height=0.3)
@@ -286,6 +610,93 @@ class TestOptimization:
         # (fewer travel moves)
         assert toolpath_opt.total_length <= toolpath_no_opt.total_length
         
+    def test_optimize_reorders_strokes(self):
+        """Test nearest-neighbour stroke ordering on a shuffled layer."""
+        rng = np.random.default_rng(0)
+        y = rng.permutation(20) * 0.5
+        points = np.zeros((40, 3))
+        points[0::2, 0], points[1::2, 0] = 0, 10
+        points[0::2, 1] = points[1::2, 1] = y
+        toolpath = Toolpath(points, np.ones(40), np.ones(40), num_layers=1)
+        before = toolpath.total_length
+        
+        toolpath.optimize()
+        coords = toolpath.get_coordinates()
+        
+        assert toolpath.total_length < before
+        # Strokes stay intact: each pair still spans one hatch line
+        np.testing.assert_array_equal(coords[0::2, 1], coords[1::2, 1])
+        np.testing.assert_array_equal(np.abs(coords[0::2, 0] - coords[1::2, 0]), 10)
+        
+    def test_optimize_kdtree_matches_compiled(self):
+        """Test that the KD-tree stroke order matches the compiled kernel."""
+        pytest.importorskip("numba")
+        pytest.importorskip("scipy")
+        from tpl.design._fill_kernels import order_strokes
+        
+        rng = np.random.default_rng(1)
+        starts, ends = rng.random((2, 150, 2)) * 100
+        offsets = np.array([0, 60, 150])
+        
+        for allow_reverse in (True, False):
+            order, flipped = np.empty(150, dtype=np.int64), np.empty(150, dtype=bool)
+            order_strokes(starts, ends, offsets, allow_reverse, order, flipped)
+            
+            tree_order, tree_flipped = np.empty_like(order), np.empty_like(flipped)
+            for lo, hi in zip(offsets[:-1], offsets[1:]):
+                Toolpath._order_strokes_kdtree(starts, ends, lo, hi, allow_reverse,
+                                               tree_order, tree_flipped)
+            
+            np.testing.assert_array_equal(order, tree_order)
+            np.testing.assert_array_equal(flipped, tree_flipped)
+        
+    def test_optimize_hilbert(self):
+        """Test Hilbert-curve ordering with 2-opt refinement."""
+        rng = np.random.default_rng(2)
+        n_strokes = 400
+        starts = rng.random((n_strokes, 2)) * 100
+        ends = starts + rng.normal(0, 1, (n_strokes, 2))
+        points = np.zeros((2 * n_strokes, 3))
+        points[0::2, :2] = starts
+        points[1::2, :2] = ends
+        
+        toolpath = Toolpath(points, np.ones(2 * n_strokes), np.ones(2 * n_strokes), 1)
+        original = toolpath.total_length
+        toolpath.optimize(2, method="hilbert")
+        
+        assert toolpath.total_length < original / 5
+        # Same points, and every stroke still joins its original partner
+        np.testing.assert_array_equal(np.sort(toolpath.points, axis=0),
+                                      np.sort(points.astype(np.float32), axis=0))
+        def stroke_lengths(p):
+            pairs = p.reshape(-1, 2, 3)
+            return np.sort(np.linalg.norm(pairs[:, 1] - pairs[:, 0], axis=1))
+        
+        np.testing.assert_allclose(stroke_lengths(toolpath.points),
+                                   stroke_lengths(points.astype(np.float32)))
+        
+        with pytest.raises(ValueError):
+            toolpath.optimize(2, method="random")
+        
+    def test_optimize_leaves_partial_strokes(self):
+        """Test that a path not made of whole strokes is left unchanged."""
+        points = np.array([[0.0, 0.0, 0.0], [10.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+        toolpath = Toolpath(points, np.ones(3), np.ones(3), num_layers=1)
+        
+        with pytest.warns(UserWarning, match="strokes of 2"):
+            toolpath.optimize()
+        np.testing.assert_array_equal(toolpath.get_coordinates(), points)
+        
+    def test_hilbert_index_is_continuous(self):
+        """Test that consecutive Hilbert indices are neighbouring cells."""
+        x, y = np.meshgrid(np.arange(8), np.arange(8))
+        d = Toolpath._hilbert_index(x.ravel(), y.ravel(), 3)
+        order = np.argsort(d)
+        
+        np.testing.assert_array_equal(np.sort(d), np.arange(64))
+        steps = np.abs(np.diff(x.ravel()[order])) + np.abs(np.diff(y.ravel()[order]))
+        assert np.all(steps == 1)
+        
     def test_bidirectional_scanning(self):
         """Test bidirectional vs unidirectional scanning."""
         cube = Cube(size=10, center=(0, 0, 10))
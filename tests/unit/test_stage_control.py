@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Unit tests for stage control
+============================
+
+Tests for tpl.core.stage_control commands, replies and the cached
+position, against an in-memory serial port that answers like the
+controller.
+
+Author: Zeyad Mustafa
+Date: December 2024
+BTU Cottbus-Senftenberg
+
+Run with: pytest tests/unit/test_stage_control.py -v
+"""
+
+import numpy as np
+import pytest
+
+from tpl.core.stage_control import StageControl, StageError, StageState
+
+
+class FakeSerial:
+    """
+    In-memory serial port that queues one scripted reply per command.
+
+    Replies become readable as soon as their command is written. Reads
+    return at most ``chunk`` bytes, to exercise partial lines.
+    """
+
+    def __init__(self, replies=None, chunk=None):
+        self.replies = list(replies or [])
+        self.chunk = chunk
+        self.written = b""
+        self.rx = b""
+        self.reads = 0
+        self.is_open = True
+
+    def write(self, data):
+        self.written += data
+        for _ in range(data.count(b"\n")):
+            if self.replies:
+                self.rx += self.replies.pop(0).encode() + b"\r\n"
+        return len(data)
+
+    @property
+    def in_waiting(self):
+        return len(self.rx)
+
+    def read(self, size=1):
+        self.reads += 1
+        if self.chunk is not None:
+            size = min(size, self.chunk)
+        data, self.rx = self.rx[:size], self.rx[size:]
+        return data
+
+    def close(self):
+        self.is_open = False
+
+
+def _wired_stage(replies=None, chunk=None, timeout=1.0):
+    """Connected stage at (100, 100, 100) on a fake serial port."""
+    stage = StageControl(timeout=timeout)
+    stage._serial = FakeSerial(replies, chunk)
+    stage._connected = True
+    stage._state = StageState.IDLE
+    stage._position[:] = (100, 100, 100)
+    stage._position_dirty = False
+    return stage
+
+
+class TestMoves:
+    """Test cases for single and batched moves."""
+
+    def test_move_waits_on_reply(self):
+        """Test that a move and its WAIT go out in one write."""
+        stage = _wired_stage(["OK", "DONE"])
+        stage.move_absolute(1, 2, 3, speed=1000)
+
+        assert stage._serial.written == b"MOVE ABS X1.0000 Y2.0000 Z3.0000 F1000\nWAIT\n"
+        assert stage.get_position() == (1, 2, 3)
+        assert stage._state == StageState.IDLE
+
+    def test_batch_pipelined(self):
+        """Test that a batch is written at once and closed by SYNC?."""
+        stage = _wired_stage(["OK", "OK", "DONE"])
+        stage.move_absolute_batch(np.array([[1, 2, 3], [4.5, 5, 6]]), speed=1000)
+
+        assert stage._serial.written == (b"MOVE ABS X1.0000 Y2.0000 Z3.0000 F1000\n"
+                                         b"MOVE ABS X4.5000 Y5.0000 Z6.0000 F1000\n"
+                                         b"SYNC?\n")
+        assert tuple(stage._position) == (4.5, 5, 6)
+        assert not stage._position_dirty
+
+    def test_batch_validated_before_sending(self):
+        """Test that an out-of-range point fails before any write."""
+        stage = _wired_stage()
+        with pytest.raises(StageError, match=r"Position 1 .* out of range"):
+            stage.move_absolute_batch([[1, 2, 3], [1, 2, 300]])
+        assert stage._serial.written == b""
+
+    def test_batch_rejected_move(self):
+        """Test that a rejected move in a batch leaves the stage in ERROR."""
+        stage = _wired_stage(["OK", "ERR", "DONE"])
+        with pytest.raises(StageError, match="Move 1"):
+            stage.move_absolute_batch([[1, 2, 3], [4, 5, 6]])
+
+        assert stage._state == StageState.ERROR
+        assert stage._position_dirty
+
+    def test_missing_replies_time_out(self):
+        """Test that partial replies raise once the timeout expires."""
+        stage = _wired_stage(["OK"], timeout=0.01)
+        with pytest.raises(StageError, match="Expected 3 responses, received 1"):
+            stage.move_absolute_batch([[100, 100, 100], [100, 100, 100]])
+
+        assert stage._state == StageState.ERROR
+        assert stage._position_dirty
+
+
+class TestPosition:
+    """Test cases for the cached position."""
+
+    def test_cached_position_skips_query(self):
+        """Test that a known position is returned without a POS? query."""
+        stage = _wired_stage()
+        assert stage.get_position() == (100, 100, 100)
+        assert stage._serial.written == b""
+
+    def test_stale_position_is_queried(self):
+        """Test that stop() forces the next read to query the stage."""
+        stage = _wired_stage(["OK", "X1.5000 Y2.0000 Z3.0000"])
+        stage.stop()
+
+        assert stage.get_position() == (1.5, 2.0, 3.0)
+        assert stage._serial.written == b"STOP\nPOS?\n"
+        assert not stage._position_dirty
+
+    def test_refresh_position(self):
+        """Test that refresh_position always reads the hardware."""
+        stage = _wired_stage(["X1.0 Y2.0 Z3.0"])
+        assert stage.refresh_position() == (1.0, 2.0, 3.0)
+
+    def test_invalid_position_reply(self):
+        """Test that a malformed position reply raises."""
+        stage = _wired_stage(["garbage"])
+        with pytest.raises(StageError, match="Invalid position response"):
+            stage.refresh_position()
+
+
+class TestReadline:
+    """Test cases for the buffered line reader."""
+
+    def test_lines_split_from_one_read(self):
+        """Test that several buffered replies are drained in one read."""
+        stage = _wired_stage(["OK", "OK", "DONE"])
+        stage._serial.write(b"A\nB\nC\n")
+
+        assert [stage._readline() for _ in range(3)] == [b"OK\r\n", b"OK\r\n", b"DONE\r\n"]
+        assert stage._serial.reads == 1
+
+    def test_partial_lines_joined(self):
+        """Test that a reply split across reads is returned whole."""
+        stage = _wired_stage(["X1.0000 Y2.0000 Z3.0000"], chunk=4)
+        assert stage.refresh_position() == (1.0, 2.0, 3.0)
+
+    def test_timeout_returns_empty(self):
+        """Test that a read timeout yields an empty line."""
+        stage = _wired_stage()
+        assert stage._readline() == b""
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Unit tests for asynchronous stage control
+=========================================
+
+Tests for tpl.core.stage_control_async in mock mode and against an
+in-memory stream that answers like the controller.
+
+Author: Zeyad Mustafa
+Date: December 2024
+BTU Cottbus-Senftenberg
+
+Run with: pytest tests/unit/test_stage_control_async.py -v
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from tpl.core.stage_control import StageControl, StageError, StageState
+from tpl.core.stage_control_async import StageControlAsync
+
+
+class FakeTransport:
+    """Transport stub reporting an empty write buffer."""
+
+    def get_write_buffer_size(self):
+        return 0
+
+
+class FakeWriter:
+    """Stream writer that feeds one scripted reply per written command."""
+
+    def __init__(self, reader, replies):
+        self.reader = reader
+        self.replies = list(replies)
+        self.written = b""
+        self.transport = FakeTransport()
+        self._closing = False
+
+    def write(self, data):
+        self.written += data
+        for _ in range(data.count(b"\n")):
+            if self.replies:
+                self.reader.feed_data(self.replies.pop(0).encode() + b"\n")
+
+    def is_closing(self):
+        return self._closing
+
+    def close(self):
+        self._closing = True
+        self.reader.feed_eof()
+
+    async def wait_closed(self):
+        pass
+
+
+async def _wired_stage(replies, timeout=1.0):
+    """Connected stage whose serial stream answers with ``replies``."""
+    stage = StageControlAsync(timeout=timeout)
+    stage._reader = asyncio.StreamReader()
+    stage._writer = FakeWriter(stage._reader, replies)
+    stage._reader_task = asyncio.get_running_loop().create_task(stage._read_replies())
+    stage._connected = True
+    stage._state = StageState.IDLE
+    stage._position[:] = (100, 100, 100)
+    stage._position_dirty = False
+    return stage
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    async def sleep(seconds):
+        pass
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+
+
+class TestMockMode:
+    """Test cases for StageControlAsync in mock mode."""
+
+    def test_connect_and_move(self):
+        """Test connecting, moving and reading the position."""
+        async def run():
+            async with StageControlAsync(mock=True) as stage:
+                assert stage.is_connected
+                await stage.move_absolute(10, 20, 30)
+                await stage.move_relative(1, 1, 1)
+                return await stage.get_position()
+
+        assert asyncio.run(run()) == (11, 21, 31)
+
+    def test_batch_move(self):
+        """Test that a batch ends at its last point."""
+        async def run():
+            stage = StageControlAsync(mock=True)
+            await stage.connect()
+            await stage.move_absolute_batch(np.array([[1, 2, 3], [4, 5, 6]]))
+            return stage
+
+        stage = asyncio.run(run())
+        assert tuple(stage._position) == (4, 5, 6)
+        assert stage._state == StageState.IDLE
+
+    def test_limits_match_sync_stage(self):
+        """Test that range and speed errors match StageControl."""
+        points = [[1, 2, 3], [300, 0, 0]]
+
+        sync_stage = StageControl(mock=True)
+        sync_stage.connect()
+        with pytest.raises(StageError) as sync_error:
+            sync_stage.move_absolute_batch(points)
+
+        async def run():
+            stage = StageControlAsync(mock=True)
+            await stage.connect()
+            with pytest.raises(StageError) as async_error:
+                await stage.move_absolute_batch(points)
+            with pytest.raises(StageError, match="exceeds maximum"):
+                await stage.move_absolute(1, 1, 1, speed=1e9)
+            return async_error
+
+        assert str(asyncio.run(run()).value) == str(sync_error.value)
+
+    def test_not_connected(self):
+        """Test that moves require a connection."""
+        with pytest.raises(StageError, match="not connected"):
+            asyncio.run(StageControlAsync(mock=True).move_absolute(1, 1, 1))
+
+    def test_calibrate(self, no_sleep):
+        """Test the calibration report in mock mode."""
+        async def run():
+            stage = StageControlAsync(mock=True)
+            await stage.connect()
+            return await stage.calibrate()
+
+        results = asyncio.run(run())
+        assert len(results['measured_positions']) == len(StageControl._CALIBRATION_POSITIONS)
+        assert results['maximum_error'] == 0
+
+    def test_repr(self):
+        """Test that the representation names the async class."""
+        assert repr(StageControlAsync(mock=True)).startswith("StageControlAsync(")
+
+
+class TestProtocol:
+    """Test cases for the reply matching over a stream."""
+
+    def test_batch_pipelined(self):
+        """Test that a batch is written at once and closed by SYNC?."""
+        async def run():
+            stage = await _wired_stage(["OK", "OK", "DONE"])
+            await stage.move_absolute_batch([[1, 2, 3], [4, 5, 6]], speed=1000)
+            return stage
+
+        stage = asyncio.run(run())
+        assert stage._writer.written == (b"MOVE ABS X1.0000 Y2.0000 Z3.0000 F1000\n"
+                                         b"MOVE ABS X4.0000 Y5.0000 Z6.0000 F1000\n"
+                                         b"SYNC?\n")
+        assert tuple(stage._position) == (4, 5, 6)
+        assert not stage._position_dirty
+
+    def test_failed_move_marks_position_stale(self):
+        """Test that a rejected move leaves the stage in ERROR."""
+        async def run():
+            stage = await _wired_stage(["ERR", "DONE", "X1.0 Y2.0 Z3.0"])
+            with pytest.raises(StageError, match="Move failed"):
+                await stage.move_absolute(10, 10, 10)
+            assert stage._state == StageState.ERROR
+            return await stage.get_position()
+
+        assert asyncio.run(run()) == (1.0, 2.0, 3.0)
+
+    def test_missing_replies_time_out(self):
+        """Test that a timeout reports how many replies arrived."""
+        async def run():
+            stage = await _wired_stage(["OK"], timeout=0.05)
+            with pytest.raises(StageError, match="Expected 2 responses, received 1"):
+                await stage.move_absolute(100, 100, 100)
+            return stage
+
+        stage = asyncio.run(run())
+        assert stage._state == StageState.ERROR
+        assert stage._position_dirty
+
+    def test_stop_awaits_reply(self):
+        """Test that stop consumes its own reply."""
+        async def run():
+            stage = await _wired_stage(["OK"])
+            await stage.stop()
+            pending = list(stage._pending)
+            await stage.disconnect()
+            return stage, pending
+
+        stage, pending = asyncio.run(run())
+        assert stage._writer is None
+        assert pending == []